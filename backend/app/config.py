@@ -0,0 +1,140 @@
+# backend/app/config.py
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+"""
+Application Configuration
+
+- Reads tunable settings for the analysis pipeline from environment variables.
+- Every setting has a sensible default so a plain `.env` with DATABASE_URL is enough.
+
+Example .env entries:
+SOUNDBIRD_SPOOL_DIR=/var/lib/soundbird/spool
+SOUNDBIRD_JOB_WORKERS=4
+SOUNDBIRD_INFERENCE_WORKERS=8
+
+"""
+
+
+# Load .env from project root
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+
+# Directory where uploaded audio waits until a background worker analyzes it
+SPOOL_DIR = Path(os.getenv("SOUNDBIRD_SPOOL_DIR", PROJECT_ROOT / "data" / "spool"))
+
+# Number of background threads draining the analysis job queue
+JOB_WORKERS = int(os.getenv("SOUNDBIRD_JOB_WORKERS", "2"))
+
+# Seconds an idle worker sleeps before polling the queue again
+JOB_POLL_INTERVAL = float(os.getenv("SOUNDBIRD_JOB_POLL_INTERVAL", "5"))
+
+# Seconds a worker's claim on a queued recording lasts without renewal before it is requeued
+JOB_LEASE_TIMEOUT = float(os.getenv("SOUNDBIRD_JOB_LEASE_SECONDS", "300"))
+
+# Worker processes for parallel BirdNET inference on ZIP uploads (0 disables the pool)
+INFERENCE_WORKERS = int(os.getenv("SOUNDBIRD_INFERENCE_WORKERS", "0"))
+
+# TFLite threads per inference worker; defaults to an even share of the CPU cores
+INFERENCE_THREADS_PER_WORKER = int(os.getenv("SOUNDBIRD_INFERENCE_THREADS", "0")) or max(
+    1, (os.cpu_count() or 1) // max(1, INFERENCE_WORKERS)
+)
+
+# Largest accepted upload (.wav or .zip), in megabytes
+MAX_UPLOAD_BYTES = int(os.getenv("SOUNDBIRD_MAX_UPLOAD_MB", "8192")) * 1024 * 1024
+
+# Size of the blocks uploads are copied to disk in; bounds per-request memory
+UPLOAD_CHUNK_SIZE = int(os.getenv("SOUNDBIRD_UPLOAD_CHUNK_KB", "1024")) * 1024
+
+# Largest uncompressed size accepted for a single WAV inside a ZIP upload, in megabytes
+MAX_ZIP_MEMBER_BYTES = int(os.getenv("SOUNDBIRD_MAX_ZIP_MEMBER_MB", "4096")) * 1024 * 1024
+
+# Largest total uncompressed size of the WAV files in a ZIP upload, in megabytes (zip bomb guard)
+MAX_ZIP_TOTAL_BYTES = int(os.getenv("SOUNDBIRD_MAX_ZIP_TOTAL_MB", "16384")) * 1024 * 1024
+
+# Most WAV files accepted in a single ZIP upload
+MAX_ZIP_MEMBERS = int(os.getenv("SOUNDBIRD_MAX_ZIP_MEMBERS", "10000"))
+
+# Highest uncompressed/compressed size ratio accepted for a large ZIP member (0 disables the check)
+MAX_ZIP_COMPRESSION_RATIO = float(os.getenv("SOUNDBIRD_MAX_ZIP_COMPRESSION_RATIO", "100"))
+
+# Members smaller than this (in megabytes) skip the ratio check; long silent WAVs compress far past 100:1
+ZIP_RATIO_MIN_BYTES = int(os.getenv("SOUNDBIRD_ZIP_RATIO_MIN_MB", "1024")) * 1024 * 1024
+
+# Extracted WAV files allowed to wait for analysis while the next one is unzipped
+ZIP_PIPELINE_DEPTH = int(os.getenv("SOUNDBIRD_ZIP_PIPELINE_DEPTH", "2"))
+
+# WAV files at least this large (in megabytes) are analyzed in bounded-memory streaming mode
+STREAMING_THRESHOLD_BYTES = int(os.getenv("SOUNDBIRD_STREAMING_THRESHOLD_MB", "64")) * 1024 * 1024
+
+# Number of 3-second windows scored per model invocation in streaming mode
+ANALYSIS_BATCH_SIZE = int(os.getenv("SOUNDBIRD_ANALYSIS_BATCH_SIZE", "8"))
+
+# Seconds of overlap between consecutive 3-second analysis windows (0 to < 3)
+ANALYSIS_OVERLAP = float(os.getenv("SOUNDBIRD_ANALYSIS_OVERLAP", "0"))
+if not 0 <= ANALYSIS_OVERLAP < 3:
+    # Windows are 3 seconds long: a larger overlap would never advance, a negative one skips audio
+    raise ValueError(f"SOUNDBIRD_ANALYSIS_OVERLAP must be at least 0 and below 3 seconds, got {ANALYSIS_OVERLAP}")
+
+# Skip BirdNET on windows with no energy above the recording's noise floor in the bird band
+SILENCE_FILTER = os.getenv("SOUNDBIRD_SILENCE_FILTER", "false").lower() in ("1", "true", "yes")
+
+# Decibels above the noise floor a window's loudest moment must reach to be analyzed
+SILENCE_MARGIN_DB = float(os.getenv("SOUNDBIRD_SILENCE_MARGIN_DB", "8"))
+
+# Keep every window's full species-score vector (float16) so detections can be re-thresholded later
+STORE_SCORES = os.getenv("SOUNDBIRD_STORE_SCORES", "true").lower() in ("1", "true", "yes")
+
+# Directory holding the per-recording score matrices
+SCORES_DIR = Path(os.getenv("SOUNDBIRD_SCORES_DIR", PROJECT_ROOT / "data" / "scores"))
+
+# Location/week species lists kept in memory (least recently used are evicted)
+SPECIES_CACHE_SIZE = int(os.getenv("SOUNDBIRD_SPECIES_CACHE_SIZE", "256"))
+
+# Decimal places lat/lon are rounded to for the species list cache (2 is about 1 km)
+SPECIES_CACHE_PRECISION = int(os.getenv("SOUNDBIRD_SPECIES_CACHE_PRECISION", "2"))
+
+# Synchronous analyses allowed to run at once (each in its own executor thread)
+ANALYSIS_CONCURRENCY = int(os.getenv("SOUNDBIRD_ANALYSIS_CONCURRENCY", "2"))
+
+# Synchronous analyses allowed to wait for a free slot before new ones get 429
+ANALYSIS_QUEUE_SIZE = int(os.getenv("SOUNDBIRD_ANALYSIS_QUEUE_SIZE", "4"))
+
+# Seconds clients are told to wait (Retry-After) when the analysis queue is full
+ANALYSIS_RETRY_AFTER = int(os.getenv("SOUNDBIRD_ANALYSIS_RETRY_AFTER", "30"))
+
+# Upcoming monthly detection partitions kept created ahead of time (PostgreSQL only)
+PARTITION_MONTHS_AHEAD = int(os.getenv("SOUNDBIRD_PARTITION_MONTHS_AHEAD", "3"))
+
+# Months of detections kept; older monthly partitions are detached and dropped (0 keeps everything)
+RETENTION_MONTHS = int(os.getenv("SOUNDBIRD_RETENTION_MONTHS", "0"))
+
+# Hours between partition maintenance runs (creating upcoming months, applying retention)
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("SOUNDBIRD_PARTITION_MAINTENANCE_HOURS", "12")) * 3600
+
+# Detections fetched from the database cursor per chunk of a streaming export
+EXPORT_BATCH_SIZE = int(os.getenv("SOUNDBIRD_EXPORT_BATCH_SIZE", "5000"))
+
+# Map grid tiles (per zoom, tile and filters) kept in memory before the least recently used is evicted
+GRID_CACHE_SIZE = int(os.getenv("SOUNDBIRD_GRID_CACHE_SIZE", "4096"))
+
+# Seconds a cached map grid tile is served; bounds how stale counts changed by other API processes get
+GRID_CACHE_TTL = float(os.getenv("SOUNDBIRD_GRID_CACHE_TTL", "60"))
+
+# Most cache tiles one grid request may span; a bbox far larger than the zoom's view is rejected
+GRID_MAX_TILES = int(os.getenv("SOUNDBIRD_GRID_MAX_TILES", "64"))
+
+# Detection query results kept in memory before the least recently used is evicted
+QUERY_CACHE_SIZE = int(os.getenv("SOUNDBIRD_QUERY_CACHE_SIZE", "1024"))
+
+# Seconds a cached detection query result is served (0 disables the query cache)
+QUERY_CACHE_TTL = float(os.getenv("SOUNDBIRD_QUERY_CACHE_TTL", "30"))
+
+# Optional Redis URL (e.g. redis://localhost:6379/0) to share the query cache between API workers
+QUERY_CACHE_REDIS_URL = os.getenv("SOUNDBIRD_QUERY_CACHE_REDIS_URL", "")
+
+# Responses at least this many bytes are gzip-compressed for clients that accept it
+GZIP_MINIMUM_SIZE = int(os.getenv("SOUNDBIRD_GZIP_MINIMUM_SIZE", "1024"))
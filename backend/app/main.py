@@ -7,12 +7,22 @@ from contextlib import asynccontextmanager
 
 # Third-party
 from fastapi import FastAPI
-from birdnetlib.analyzer import Analyzer
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Internal
-from database.config import DATABASE_URL
+from database.config import DATABASE_URL, SessionLocal, async_engine
+from backend.app.config import GZIP_MINIMUM_SIZE, INFERENCE_WORKERS
 from backend.app.routes.analyze import router as analyze_router
+from backend.app.routes.cache import router as cache_router
 from backend.app.routes.detections import router as detections_router
+from backend.app.routes.jobs import router as jobs_router
+from backend.app.routes.recordings import router as recordings_router
+from backend.app.routes.species import router as species_router
+from backend.app.routes.stats import router as stats_router
+from backend.services.analysis_executor import AnalysisExecutor
+from backend.services.job_queue import AnalysisWorkerPool
+from backend.services.inference_pool import InferencePool
+from backend.services.partitions import PartitionMaintainer
 from contextlib import asynccontextmanager
 import logging
 
@@ -27,14 +37,32 @@ logging.basicConfig(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logging.info("Loading BirdNET analyzer...")
-    app.state.analyzer = Analyzer()
+    # Background workers drain recordings queued by job-mode uploads
+    app.state.worker_pool = AnalysisWorkerPool(SessionLocal)
+    app.state.worker_pool.start()
+    # Optional process pool for parallel inference across ZIP members
+    app.state.inference_pool = InferencePool() if INFERENCE_WORKERS > 0 else None
+    # Bounded threads for synchronous analyses, so they never block the event loop;
+    # each loads its own BirdNET analyzer on first use
+    app.state.analysis_executor = AnalysisExecutor()
+    # Keeps upcoming monthly detection partitions created and applies retention (PostgreSQL)
+    app.state.partition_maintainer = PartitionMaintainer(SessionLocal)
+    app.state.partition_maintainer.start()
     yield
     logging.info("Shutting down...")
+    app.state.partition_maintainer.stop()
+    app.state.worker_pool.stop()
+    app.state.analysis_executor.shutdown()
+    if app.state.inference_pool is not None:
+        app.state.inference_pool.shutdown()
+    await async_engine.dispose()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(lifespan=lifespan)
 
+# Detection lists and exports are large and compress well
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -56,4 +84,9 @@ def health_check():
 
 # Register routers
 app.include_router(analyze_router, prefix="/api")
+app.include_router(cache_router, prefix="/api")
 app.include_router(detections_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(recordings_router, prefix="/api")
+app.include_router(species_router, prefix="/api")
+app.include_router(stats_router, prefix="/api")
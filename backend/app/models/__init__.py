@@ -1,2 +1,8 @@
 from .detection import Detection
-from .recording import Recording
\ No newline at end of file
+from .recording import Recording
+from .job import Job
+from .species import Species
+from .species_daily import SpeciesDaily
+from .data_version import DataVersion
+from .tombstone import Tombstone
+from .change_seq import CHANGE_SEQUENCE
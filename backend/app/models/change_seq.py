@@ -0,0 +1,8 @@
+# backend/app/models/change_seq.py
+
+from sqlalchemy import Sequence
+from database.config import Base
+
+# Change sequence numbers handed out to write transactions on PostgreSQL
+# (SQLite has no sequences and counts them in data_versions instead)
+CHANGE_SEQUENCE = Sequence("change_seq", metadata=Base.metadata)
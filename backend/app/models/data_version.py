@@ -0,0 +1,21 @@
+# backend/app/models/data_version.py
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from database.config import Base
+
+
+class DataVersion(Base):
+    """
+    Change counter of a dataset, bumped by every transaction that changes it.
+
+    Read endpoints derive their ETags from it, so a conditional request costs
+    one primary-key lookup instead of the query behind the response.
+    """
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DataVersion name='{self.name}', version={self.version}>"
@@ -2,17 +2,26 @@
 
 from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, Integer, ForeignKey
+from sqlalchemy import BigInteger, String, Float, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from database.config import Base
 
 
 class Detection(Base):
+    # On PostgreSQL the table is partitioned by month on detection_time (see
+    # backend/services/partitions.py), so its primary key there is (id, detection_time)
     __tablename__ = "detections"
+    __table_args__ = (
+        # Keyset pagination: (sort column, id) matches the ORDER BY and cursor comparison
+        Index("ix_detections_detection_time_id", "detection_time", "id"),
+        Index("ix_detections_confidence_id", "confidence", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    recording_id: Mapped[int] = mapped_column(ForeignKey("recordings.id"), nullable=False)
+    recording_id: Mapped[int] = mapped_column(ForeignKey("recordings.id"), nullable=False, index=True)
+    # Normalized species row; the names below are kept denormalized for display
+    species_id: Mapped[int] = mapped_column(ForeignKey("species.id"), nullable=False, index=True)
 
     detection_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     species: Mapped[str] = mapped_column(String, nullable=False, index=True)
@@ -21,6 +30,8 @@ class Detection(Base):
     start_sec: Mapped[float] = mapped_column(Float, nullable=False)
     end_sec: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Detections version of the transaction that inserted the row; the change feed scans it
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
 
     # Many-to-one relationship: each detection is linked to one recording
     # Allows access to the parent Recording object via detection.recording
@@ -29,6 +40,12 @@ class Detection(Base):
         back_populates="detections" # Must match field in Recording
     )
 
+    # Many-to-one relationship: the species dimension row (named to leave `species` for the common name)
+    species_ref = relationship(
+        "Species",                  # Related model (the parent)
+        back_populates="detections" # Must match field in Species
+    )
+
     def __repr__(self) -> str:
         return (
             f"<Detections id={self.id}, "
@@ -0,0 +1,40 @@
+# backend/app/models/job.py
+
+from datetime import datetime
+import enum
+
+from sqlalchemy import Boolean, DateTime, false
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+from database.config import Base
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    file_name: Mapped[str] = mapped_column(nullable=False)
+    # Run BirdNET even if an identical file was analyzed before
+    force_reanalysis: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # One-to-many relationship: an upload can queue many recordings (one per WAV)
+    # The job's status is derived from the statuses of its recordings
+    recordings = relationship(
+        "Recording",               # Related model (the child)
+        back_populates="job"       # Must match the field name in Recording
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<Job id={self.id}, "
+            f"file_name='{self.file_name}', "
+            f"created_at={self.created_at}>"
+        )
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, Float, Text, Integer, String, Enum as SAEnum
+from sqlalchemy import BigInteger, DateTime, Float, Text, Integer, String, ForeignKey, Enum as SAEnum
 from sqlalchemy.sql import func
 from database.config import Base
+from backend.app.utils.geo import GEOHASH_PRECISION, encode_geohash
 from datetime import datetime
 import enum
 
@@ -11,6 +12,11 @@ class RecordingStatus(str, enum.Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+def _location_geohash(context) -> str:
+    # Column default computed from the lat/lon of the row being inserted
+    params = context.get_current_parameters()
+    return encode_geohash(params["lat"], params["lon"])
+
 class Recording(Base):
     __tablename__ = "recordings"
 
@@ -19,11 +25,37 @@ class Recording(Base):
     status: Mapped[RecordingStatus] = mapped_column(SAEnum(RecordingStatus), default=RecordingStatus.PENDING, nullable=False)
     lat: Mapped[float] = mapped_column(nullable=False)
     lon: Mapped[float] = mapped_column(nullable=False)
+    # Geohash of lat/lon, filled in on insert; its B-tree index answers bbox and radius filters
+    geohash: Mapped[str] = mapped_column(
+        String(GEOHASH_PRECISION),
+        default=_location_geohash,
+        nullable=False,
+        index=True,
+    )
     recording_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(nullable=True)
     error_message: Mapped[str | None] = mapped_column(nullable=True)
-    
+    # Detections version of the transaction that last inserted or changed the row (change feed)
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+
+    # Set when the recording was queued by an asynchronous upload job
+    job_id: Mapped[int | None] = mapped_column(ForeignKey("jobs.id"), nullable=True, index=True)
+    # Location of the spooled audio file while it waits for a background worker
+    file_path: Mapped[str | None] = mapped_column(nullable=True)
+    # When a worker claimed the recording or last renewed its claim; stale claims are requeued
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # SHA-256 of the WAV content plus the analyzer parameters it was analyzed with
+    # (lat/lon above complete the key); identical uploads reuse these detections
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    min_conf: Mapped[float | None] = mapped_column(nullable=True)
+    week_48: Mapped[int | None] = mapped_column(nullable=True)
+    # Recording whose detections were copied instead of running BirdNET (cache hit)
+    reused_from_id: Mapped[int | None] = mapped_column(ForeignKey("recordings.id"), nullable=True)
+    # Quiet windows the silence pre-filter kept from BirdNET (NULL when the filter was off)
+    skipped_windows: Mapped[int | None] = mapped_column(nullable=True)
+
     # One-to-many relationship: a recording can have many detections
     # Allows access to child Detections via recording.detections
     # Cascade ensures detections are deleted if the parent recording is deleted
@@ -33,6 +65,12 @@ class Recording(Base):
         cascade="all, delete-orphan"   # Important for cleanup
     )
 
+    # Many-to-one relationship: the upload job that queued this recording (if any)
+    job = relationship(
+        "Job",                         # Related model (the parent)
+        back_populates="recordings"    # Must match field in Job
+    )
+
     def __repr__(self):
         return (
             f"<Recording id={self.id}, "
@@ -43,5 +81,7 @@ class Recording(Base):
             f"lon={self.lon}, "
             f"created_at={self.created_at}, "
             f"completed_at={self.completed_at}, "
+            f"job_id={self.job_id}, "
+            f"content_hash='{self.content_hash}', "
             f"error_message='{self.error_message}'>"
         )
@@ -0,0 +1,36 @@
+# backend/app/models/species.py
+
+from sqlalchemy import String, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from database.config import Base
+
+
+class Species(Base):
+    __tablename__ = "species"
+    __table_args__ = (
+        UniqueConstraint("scientific_name", "common_name", name="uq_species_scientific_common"),
+        # Trigram index so ILIKE '%term%' searches are indexed on PostgreSQL (needs pg_trgm)
+        Index(
+            "ix_species_common_name_trgm",
+            "common_name",
+            postgresql_using="gin",
+            postgresql_ops={"common_name": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    common_name: Mapped[str] = mapped_column(String, nullable=False)
+    scientific_name: Mapped[str] = mapped_column(String, nullable=False)
+
+    # One-to-many relationship: every detection of this species
+    detections = relationship(
+        "Detection",                # Related model (the child)
+        back_populates="species_ref" # Must match the field name in Detection
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<Species id={self.id}, "
+            f"common_name='{self.common_name}', "
+            f"scientific_name='{self.scientific_name}'>"
+        )
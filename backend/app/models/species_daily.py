@@ -0,0 +1,44 @@
+# backend/app/models/species_daily.py
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from database.config import Base
+
+
+class SpeciesDaily(Base):
+    """
+    Rollup of detections per day, species and site (recording lat/lon).
+
+    Kept up to date by DetectionRepository in the same transaction as the
+    detections it summarizes, so stats never need to read raw detections.
+    """
+    __tablename__ = "species_daily"
+    __table_args__ = (
+        # Per-species time series without scanning every species of each day
+        Index("ix_species_daily_species_id_day", "species_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    species_id: Mapped[int] = mapped_column(ForeignKey("species.id"), primary_key=True)
+    lat: Mapped[float] = mapped_column(Float, primary_key=True)
+    lon: Mapped[float] = mapped_column(Float, primary_key=True)
+
+    detection_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Sum rather than mean so rows can be combined and updated incrementally
+    confidence_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    max_confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    first_detection: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_detection: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    species = relationship("Species")
+
+    def __repr__(self) -> str:
+        return (
+            f"<SpeciesDaily day={self.day}, "
+            f"species_id={self.species_id}, "
+            f"lat={self.lat}, "
+            f"lon={self.lon}, "
+            f"detection_count={self.detection_count}>"
+        )
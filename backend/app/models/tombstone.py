@@ -0,0 +1,30 @@
+# backend/app/models/tombstone.py
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from database.config import Base
+
+
+class Tombstone(Base):
+    """
+    Record of a deleted detection or recording, so the change feed can report it.
+    """
+    __tablename__ = "tombstones"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # 'detections' or 'recordings'
+    table_name: Mapped[str] = mapped_column(String(32), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Detections version of the deleting transaction
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return (
+            f"<Tombstone table_name='{self.table_name}', "
+            f"row_id={self.row_id}, "
+            f"change_seq={self.change_seq}>"
+        )
@@ -0,0 +1,149 @@
+# backend/app/repositories/changes.py
+
+import asyncio
+import logging
+from itertools import chain
+
+from sqlalchemy import Insert, event, insert, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.app.models.change_seq import CHANGE_SEQUENCE
+from backend.app.models.detection import Detection
+from backend.app.models.recording import Recording
+from backend.app.models.tombstone import Tombstone
+from backend.app.repositories.data_version import DataVersionRepository, data_version_query
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the change_seq allocated to the current transaction
+CHANGE_SEQ_KEY = "change_seq"
+
+# data_versions row counting the change_seqs handed out so far (SQLite only)
+CHANGE_SEQ = "change_seq"
+
+# Rows stamped with a change_seq and reported by the change feed
+TRACKED_MODELS = (Detection, Recording)
+
+# First key of the PostgreSQL advisory locks running writers hold; the second key
+# is their change_seq (an int4, so seqs must stay below 2**31), or ALLOCATING for
+# the lock taken before drawing one
+CHANGE_SEQ_LOCK_SPACE = 0x53420001
+ALLOCATING = 0
+
+# How long the change feed waits for a writer between drawing its change_seq and locking it
+ALLOCATION_WAIT = 1.0
+
+# Advisory locks on change_seqs held in this database, with the backend holding them
+CHANGE_SEQ_LOCKS = text(
+  "SELECT pid, objid FROM pg_locks "
+  "WHERE locktype = 'advisory' AND classid = :space AND objsubid = 2 "
+  "AND database = (SELECT oid FROM pg_database WHERE datname = current_database())"
+)
+
+def change_seq(db: Session) -> int:
+  """
+  Return the change_seq of the session's current transaction.
+
+  The first call in a transaction allocates one; later calls return the
+  same value, so every row a transaction touches shares one change_seq.
+
+  On PostgreSQL it is drawn from the change_seq sequence on the session's
+  own connection, so writers do not wait on each other, and the transaction
+  holds an advisory lock on it until it ends. The change feed never reads
+  past the lowest locked change_seq, so a seq committed after a higher one
+  is not skipped. SQLite lets one transaction write at a time, so there the
+  counter is simply bumped in the transaction.
+  """
+  seq = db.info.get(CHANGE_SEQ_KEY)
+  if seq is None:
+    if db.get_bind().dialect.name == "postgresql":
+      # The shared lock is taken before drawing the seq, so a reader that sees
+      # this backend holding it without a seq lock knows to wait
+      seq = db.scalar(
+        text(f"SELECT nextval('{CHANGE_SEQUENCE.name}') FROM pg_advisory_xact_lock_shared(:space, :allocating)"),
+        {"space": CHANGE_SEQ_LOCK_SPACE, "allocating": ALLOCATING},
+      )
+      db.execute(text("SELECT pg_advisory_xact_lock(:space, :seq)"), {"space": CHANGE_SEQ_LOCK_SPACE, "seq": seq})
+    else:
+      seq = DataVersionRepository(db).bump(CHANGE_SEQ)
+    db.info[CHANGE_SEQ_KEY] = seq
+  return seq
+
+async def committed_change_seq(db: AsyncSession) -> int:
+  """
+  Return the highest change_seq below which every write transaction has ended.
+
+  On PostgreSQL this is the last seq drawn, capped below the lowest seq
+  still locked by a running transaction. Advisory locks are released when a
+  transaction commits, rolls back or loses its connection, so no crashed or
+  slow writer is ever given up on; the feed waits for it instead.
+
+  Returns:
+      The change_seq, or 0 if a writer stays between drawing its seq and
+      locking it for longer than ALLOCATION_WAIT.
+  """
+  if db.get_bind().dialect.name != "postgresql":
+    return (await db.scalar(data_version_query(CHANGE_SEQ))) or 0
+
+  loop = asyncio.get_running_loop()
+  deadline = loop.time() + ALLOCATION_WAIT
+  while True:
+    # The sequence is read before the locks: every seq drawn by then is
+    # either locked, drawn by a backend still holding ALLOCATING, or done
+    allocated = (await db.scalar(text(f"SELECT pg_sequence_last_value('{CHANGE_SEQUENCE.name}')"))) or 0
+    held = {}
+    for pid, key in (await db.execute(CHANGE_SEQ_LOCKS, {"space": CHANGE_SEQ_LOCK_SPACE})).all():
+      held.setdefault(pid, set()).add(key)
+    if not any(keys == {ALLOCATING} for keys in held.values()):
+      locked = [key for keys in held.values() for key in keys if key != ALLOCATING]
+      return min([allocated, *(key - 1 for key in locked)])
+    if loop.time() >= deadline:
+      logger.warning("A writer has not locked its change_seq; the change feed holds back for now")
+      return 0
+    await asyncio.sleep(0.01)
+
+def detection_tombstones(db: Session, condition) -> Insert:
+  """
+  Build an INSERT recording tombstones for the detections matching a condition.
+
+  Run it before deleting the detections with a bulk DELETE, which skips the
+  ORM flush that records tombstones for single-object deletes.
+  """
+  return insert(Tombstone).from_select(
+    ["table_name", "row_id", "change_seq"],
+    select(literal(Detection.__tablename__), Detection.id, literal(change_seq(db))).where(condition),
+  )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session: Session, flush_context, instances) -> None:
+  # ORM inserts and updates get the transaction's change_seq; ORM deletes, including
+  # detections cascading from a deleted recording, leave a tombstone
+  changed = [
+    obj for obj in chain(session.new, session.dirty)
+    if isinstance(obj, TRACKED_MODELS) and (obj in session.new or session.is_modified(obj))
+  ]
+  deleted = [obj for obj in session.deleted if isinstance(obj, TRACKED_MODELS)]
+  if not changed and not deleted:
+    return
+  seq = change_seq(session)
+  for obj in changed:
+    obj.change_seq = seq
+  for obj in deleted:
+    session.add(Tombstone(table_name=obj.__tablename__, row_id=obj.id, change_seq=seq))
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_before_commit(session: Session) -> None:
+  # Rows still pending would otherwise take their change_seq after the commit hooks
+  # that rely on it (the data version bump) have run
+  if session.new or session.dirty or session.deleted:
+    session.flush()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _end_change_seq(session: Session) -> None:
+  # Advisory locks on the seq go away with the transaction itself
+  session.info.pop(CHANGE_SEQ_KEY, None)
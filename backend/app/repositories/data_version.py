@@ -0,0 +1,70 @@
+# backend/app/repositories/data_version.py
+
+from sqlalchemy import Select, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.app.models.data_version import DataVersion
+
+# Counter covering detections and the recording metadata joined into detection responses
+DETECTIONS = "detections"
+
+def data_version_query(name: str) -> Select:
+  return select(DataVersion.version).where(DataVersion.name == name)
+
+
+class DataVersionRepository:
+  def __init__(self, db: Session):
+    """
+    Initialize the repository with a SQLAlchemy session.
+    """
+    self.db = db
+
+  def get(self, name: str) -> int:
+    """
+    Return the current version of a dataset, 0 if it has never changed.
+    """
+    return self.db.scalar(data_version_query(name)) or 0
+
+  def bump(self, name: str) -> int:
+    """
+    Increment the version of a dataset in the current transaction. Does not commit.
+
+    The counter row stays locked until the transaction ends, so concurrent
+    writers get their versions in commit order.
+
+    Returns:
+        The new version.
+    """
+    dialect = self.db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+      insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+      stmt = insert(DataVersion).values(name=name, version=1)
+      stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": DataVersion.__table__.c.version + 1},
+      )
+      return self.db.execute(stmt.returning(DataVersion.version)).scalar_one()
+    result = self.db.execute(
+      update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+      self.db.add(DataVersion(name=name, version=1))
+      self.db.flush()
+    return self.get(name)
+
+
+class AsyncDataVersionRepository:
+  def __init__(self, db: AsyncSession):
+    """
+    Initialize the repository with an async SQLAlchemy session.
+    """
+    self.db = db
+
+  async def get(self, name: str) -> int:
+    """
+    Return the current version of a dataset, 0 if it has never changed.
+    """
+    return (await self.db.scalar(data_version_query(name))) or 0
+
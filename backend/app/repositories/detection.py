@@ -1,12 +1,234 @@
 # backend/app/repositories/detection.py
 
+import math
+
+from sqlalchemy import Select, and_, delete, func, insert, or_, select, tuple_, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Literal
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Literal, Sequence, Tuple
 from datetime import datetime
 
 from backend.app.models.detection import Detection
-from backend.app.schemas.detection import DetectionCreate, DetectionResponse
+from backend.app.schemas.detection import DetectionChange, DetectionChanges, DetectionCreate, DetectionResponse, TombstoneEntry
+from backend.app.schemas.recording import RecordingChange
 from backend.app.models.recording import Recording
+from backend.app.models.tombstone import Tombstone
+from backend.app.repositories.changes import change_seq, committed_change_seq, detection_tombstones
+from backend.app.repositories.species import SpeciesRepository
+from backend.app.repositories.stats import StatsRepository
+from backend.app.config import EXPORT_BATCH_SIZE
+from backend.app.utils.geo import GEOHASH_PRECISION, KM_PER_DEGREE_LAT, KM_PER_DEGREE_LON, GeoArea
+from backend.app.utils.pagination import decode_cursor, encode_cursor
+from backend.services.grid_cache import mark_dirty
+from backend.services.query_cache import mark_stale
+
+# Statement builders shared by DetectionRepository and AsyncDetectionRepository
+
+def detection_query(detection_id: int) -> Select:
+  return select(Detection).where(Detection.id == detection_id)
+
+def recording_detections_query(recording_id: int) -> Select:
+  return (
+    select(Detection)
+    .where(Detection.recording_id == recording_id)
+    .order_by(Detection.start_sec, Detection.id)
+  )
+
+def geohash_prefix_condition(cells: Iterable[str]):
+  """
+  Build a condition matching recordings whose geohash starts with one of the cells.
+  """
+  return or_(*(
+    # Every geohash starting with the cell's prefix sorts between these bounds
+    Recording.geohash.between(cell, cell + "z" * (GEOHASH_PRECISION - len(cell)))
+    for cell in cells
+  ))
+
+def location_condition(area: GeoArea):
+  """
+  Build a condition matching recordings inside a search area.
+
+  The geohash ranges of the cells covering the area are answered from the
+  index on recordings.geohash; the exact lat/lon (and distance) checks then
+  drop the points of those cells that fall outside the area.
+  """
+  conditions = [
+    geohash_prefix_condition(area.covering_cells()),
+    Recording.lat.between(area.min_lat, area.max_lat),
+    Recording.lon.between(area.min_lon, area.max_lon),
+  ]
+  if area.center is not None:
+    # Equirectangular distance around the center; accurate for radii up to a few hundred km
+    lat, lon = area.center
+    dy = (Recording.lat - lat) * KM_PER_DEGREE_LAT
+    dx = (Recording.lon - lon) * (KM_PER_DEGREE_LON * math.cos(math.radians(lat)))
+    conditions.append(dx * dx + dy * dy <= area.radius_km ** 2)
+  return and_(*conditions)
+
+def apply_detection_filters(
+  stmt: Select,
+  species: Optional[str],
+  start_date: Optional[datetime],
+  end_date: Optional[datetime],
+  area: Optional[GeoArea] = None,
+) -> Select:
+  """
+  Add the species, date and location filters to a SELECT joining detections and recordings.
+  """
+  if species:
+    # Match names in the small species table, then use the indexed species_id on detections
+    stmt = stmt.where(Detection.species_id.in_(SpeciesRepository.matching_ids_query(species)))
+  if start_date and end_date:
+    stmt = stmt.where(Detection.detection_time.between(start_date, end_date))
+  elif start_date:
+    stmt = stmt.where(Detection.detection_time >= start_date)
+  elif end_date:
+    stmt = stmt.where(Detection.detection_time <= end_date)
+  if area is not None:
+    stmt = stmt.where(location_condition(area))
+  return stmt
+
+def filtered_detections_query(
+  species: Optional[str],
+  start_date: Optional[datetime],
+  end_date: Optional[datetime],
+  area: Optional[GeoArea] = None,
+) -> Select:
+  """
+  Build an unordered SELECT of enriched detections matching the species, date and location filters.
+  """
+  stmt = (
+    select(
+      Detection.id,
+      Detection.detection_time,
+      Detection.species,
+      Detection.scientific_name,
+      Detection.confidence,
+      Detection.start_sec,
+      Detection.end_sec,
+      Recording.file_name,
+      Recording.recording_datetime,
+      Recording.lat,
+      Recording.lon,
+    )
+    .join(Recording, Detection.recording_id == Recording.id)
+  )
+  return apply_detection_filters(stmt, species, start_date, end_date, area)
+
+def grid_query(
+  tiles: List[str],
+  precision: int,
+  species: Optional[str],
+  start_date: Optional[datetime],
+  end_date: Optional[datetime],
+) -> Select:
+  """
+  Build a SELECT binning the detections of some geohash tiles into cells of `precision` characters.
+
+  Each result row is one non-empty cell with its detection count, distinct
+  species count and the mean location of its detections.
+  """
+  cell = func.substr(Recording.geohash, 1, precision)
+  stmt = (
+    select(
+      cell.label("geohash"),
+      func.count(Detection.id).label("detection_count"),
+      func.count(func.distinct(Detection.species_id)).label("species_count"),
+      func.avg(Recording.lat).label("lat"),
+      func.avg(Recording.lon).label("lon"),
+    )
+    .join(Recording, Detection.recording_id == Recording.id)
+    .where(geohash_prefix_condition(tiles))
+    .group_by(cell)
+  )
+  return apply_detection_filters(stmt, species, start_date, end_date)
+
+def change_window_end_query(since: int, limit: int) -> Select:
+  """
+  Build a SELECT of the change_seq of the `limit`-th change after `since`.
+
+  Each table contributes at most `limit` entries from its change_seq index,
+  so finding the end of a change feed page never scans more than that.
+  """
+  tables = [
+    select(model.change_seq.label("change_seq"))
+    .where(model.change_seq > since)
+    .order_by(model.change_seq)
+    .limit(limit)
+    .subquery()
+    for model in (Detection, Recording, Tombstone)
+  ]
+  seqs = union_all(*(select(t.c.change_seq) for t in tables)).subquery()
+  return select(seqs.c.change_seq).order_by(seqs.c.change_seq).offset(limit - 1).limit(1)
+
+def detection_changes_query(since: int, until: int) -> Select:
+  """
+  Build a SELECT of the enriched detections inserted by the transactions in (since, until].
+  """
+  return (
+    filtered_detections_query(None, None, None)
+    .add_columns(Detection.recording_id, Detection.change_seq)
+    .where(Detection.change_seq > since, Detection.change_seq <= until)
+    .order_by(Detection.change_seq, Detection.id)
+  )
+
+def detections_page_query(
+  limit: int,
+  species: Optional[str],
+  start_date: Optional[datetime],
+  end_date: Optional[datetime],
+  sort_by: Optional[str],
+  sort_order: Literal["asc", "desc"],
+  cursor: Optional[str],
+  skip: int,
+  area: Optional[GeoArea] = None,
+) -> Tuple[Select, Optional[str]]:
+  """
+  Build the SELECT behind `get_detections_page`.
+
+  Returns:
+      The statement (fetching one row more than `limit`) and the effective
+      sort column name, None when ordering by ID.
+
+  Raises:
+      InvalidCursorError: If the cursor is malformed or was made for another sort order.
+  """
+  sort_column = getattr(Detection, sort_by) if sort_by and hasattr(Detection, sort_by) else None
+  if sort_column is None:
+    sort_by = None
+
+  stmt = filtered_detections_query(species, start_date, end_date, area)
+
+  # Row-value comparison lets the database seek straight into the (sort column, id) index
+  key = tuple_(sort_column, Detection.id) if sort_column is not None else Detection.id
+  if cursor:
+    value, last_id = decode_cursor(cursor, sort_by, sort_order)
+    last_key = tuple_(value, last_id) if sort_column is not None else last_id
+    stmt = stmt.where(key > last_key if sort_order == "asc" else key < last_key)
+
+  order_columns = [sort_column, Detection.id] if sort_column is not None else [Detection.id]
+  stmt = stmt.order_by(*(c.asc() if sort_order == "asc" else c.desc() for c in order_columns))
+
+  # Fetch one extra row to learn whether another page follows
+  return stmt.offset(skip).limit(limit + 1), sort_by
+
+def detections_page(
+  rows: Sequence[Row],
+  limit: int,
+  sort_by: Optional[str],
+  sort_order: Literal["asc", "desc"],
+) -> Tuple[Sequence[Row], Optional[str]]:
+  """
+  Trim the rows of a `detections_page_query` to a page and build the next page's cursor.
+  """
+  next_cursor = None
+  if limit > 0 and len(rows) > limit:
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by) if sort_by else None, last.id)
+  return rows, next_cursor
+
 
 class DetectionRepository:
   def __init__(self, db: Session):
@@ -25,9 +247,16 @@ class DetectionRepository:
     Returns:
         List of newly created Detections with populated ID and timestamps.
     """
-    db_detections = [Detection(**d.model_dump()) for d in detections]
     try:
+        species_ids = self._species_ids(detections)
+        db_detections = [
+            Detection(**d.model_dump(), species_id=species_ids[(d.scientific_name, d.species)])
+            for d in detections
+        ]
         self.db.add_all(db_detections)
+        self.db.flush()
+        StatsRepository(self.db).add_detections([det.id for det in db_detections])
+        self._mark_changed(d.recording_id for d in detections)
         self.db.commit()
         for det in db_detections:
             self.db.refresh(det)
@@ -36,6 +265,59 @@ class DetectionRepository:
         self.db.rollback()
         raise
   
+  def bulk_save_detections(self, detections: List[DetectionCreate], commit: bool = True) -> List[int]:
+    """
+    Save many detection records with batched multi-row INSERT ... RETURNING statements.
+
+    Unlike `save_detections`, no ORM objects are built and rows are not
+    refreshed one by one: the generated IDs come back from the INSERT itself,
+    so thousands of detections take a handful of round trips.
+
+    Args:
+        detections: A list of validated DetectionCreate schema objects.
+        commit: Commit right away; pass False to leave it to the caller's transaction.
+
+    Returns:
+        The IDs of the new detections, in the order they were given.
+    """
+    if not detections:
+        return []
+    try:
+        species_ids = self._species_ids(detections)
+        seq = change_seq(self.db)
+        rows = [
+            {**d.model_dump(), "species_id": species_ids[(d.scientific_name, d.species)], "change_seq": seq}
+            for d in detections
+        ]
+        ids = self.db.scalars(
+            insert(Detection).returning(Detection.id, sort_by_parameter_order=True), rows
+        ).all()
+        # Keep the daily rollup in the same transaction as the detections
+        StatsRepository(self.db).add_detections(list(ids))
+        self._mark_changed(d.recording_id for d in detections)
+        if commit:
+            self.db.commit()
+        return list(ids)
+    except Exception:
+        # With commit=False the transaction is the caller's to roll back
+        if commit:
+            self.db.rollback()
+        raise
+
+  def _species_ids(self, detections: List[DetectionCreate]) -> Dict[Tuple[str, str], int]:
+    # New species are added in the same transaction as their first detections
+    return SpeciesRepository(self.db).get_or_create_ids(
+        ((d.scientific_name, d.species) for d in detections), commit=False
+    )
+
+  def _mark_changed(self, recording_ids: Iterable[int]) -> None:
+    # Cached query results and the map tiles covering these recordings are dropped when the transaction commits
+    mark_stale(self.db)
+    geohashes = self.db.scalars(
+      select(Recording.geohash).where(Recording.id.in_(set(recording_ids))).distinct()
+    ).all()
+    mark_dirty(self.db, geohashes)
+
   def get_detection(self, detection_id: int) -> Optional[Detection]:
     """
     Retrieve a single detection by its ID.
@@ -46,8 +328,69 @@ class DetectionRepository:
     Returns:
         The Detection object if found, otherwise None.
     """
-    return self.db.query(Detection).filter(Detection.id == detection_id).first()
+    return self.db.scalars(detection_query(detection_id)).first()
   
+  def get_recording_detections(self, recording_id: int) -> List[Detection]:
+    """
+    Retrieve all detections of a recording in the order they occur in the file.
+
+    Args:
+        recording_id: Primary key of the recording.
+
+    Returns:
+        A list of Detection objects.
+    """
+    return list(self.db.scalars(recording_detections_query(recording_id)).all())
+
+  def delete_recording_detections(self, recording_id: int, commit: bool = True) -> int:
+    """
+    Delete all detections of a recording.
+
+    Args:
+        recording_id: Primary key of the recording.
+        commit: Commit right away; pass False to leave it to the caller's transaction.
+
+    Returns:
+        The number of detections deleted.
+    """
+    stats = StatsRepository(self.db)
+    groups = stats.remove_detections(Detection.recording_id == recording_id)
+    self._mark_changed([recording_id])
+    self.db.execute(detection_tombstones(self.db, Detection.recording_id == recording_id))
+    deleted_rows = self.db.query(Detection).filter(Detection.recording_id == recording_id).delete()
+    stats.refresh_extremes(groups)
+    if commit:
+      self.db.commit()
+    return deleted_rows
+
+  def delete_detections_before(self, cutoff: datetime, commit: bool = True) -> int:
+    """
+    Delete all detections made before a point in time.
+
+    On a partitioned PostgreSQL table the condition on detection_time lets the
+    planner prune every partition that cannot hold such rows. Expired
+    detections leave tombstones, so the change feed reports them as deleted.
+
+    Args:
+        cutoff: Detections strictly older than this are deleted.
+        commit: Commit right away; pass False to leave it to the caller's transaction.
+
+    Returns:
+        The number of detections deleted.
+    """
+    condition = Detection.detection_time < cutoff
+    stats = StatsRepository(self.db)
+    groups = stats.remove_detections(condition)
+    # Retention touches every area; drop all cached map tiles
+    mark_stale(self.db)
+    mark_dirty(self.db, [""])
+    self.db.execute(detection_tombstones(self.db, condition))
+    deleted_rows = self.db.execute(delete(Detection).where(condition)).rowcount
+    stats.refresh_extremes(groups)
+    if commit:
+      self.db.commit()
+    return deleted_rows
+
   def get_detections(
     self,
     skip: int = 0,
@@ -57,43 +400,63 @@ class DetectionRepository:
     end_date: Optional[datetime] = None,
     sort_by: Optional[str] = None,
     sort_order: Literal["asc", "desc"] = "desc",
+    area: Optional[GeoArea] = None,
 ) -> List[DetectionResponse]:
     """
     Return enriched detection results joined with recording metadata.
     """
-    query = (
-        self.db.query(
-            Detection.detection_time,
-            Detection.species,
-            Detection.scientific_name,
-            Detection.confidence,
-            Detection.start_sec,
-            Detection.end_sec,
-            Recording.file_name,
-            Recording.recording_datetime,
-            Recording.lat,
-            Recording.lon,
-        )
-        .join(Recording, Detection.recording_id == Recording.id)
+    detections, _ = self.get_detections_page(
+        limit=limit,
+        species=species,
+        start_date=start_date,
+        end_date=end_date,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        skip=skip,
+        area=area,
     )
+    return detections
+
+  def get_detections_page(
+    self,
+    limit: int = 100,
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Literal["asc", "desc"] = "desc",
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    area: Optional[GeoArea] = None,
+) -> Tuple[List[DetectionResponse], Optional[str]]:
+    """
+    Return one page of enriched detections and a cursor for the next page.
 
-    if species:
-        query = query.filter(Detection.species.ilike(f"%{species}%"))
-    if start_date and end_date:
-        query = query.filter(Detection.detection_time.between(start_date, end_date))
-    elif start_date:
-        query = query.filter(Detection.detection_time >= start_date)
-    elif end_date:
-        query = query.filter(Detection.detection_time <= end_date)
+    Pages are ordered by the sort column with the detection ID as tie-breaker,
+    and a cursor resumes right after the last row of the previous page
+    (keyset pagination), so a deep page costs the same as the first one.
 
-    if sort_by and hasattr(Detection, sort_by):
-        sort_column = getattr(Detection, sort_by)
-        query = query.order_by(sort_column.asc() if sort_order == "asc" else sort_column.desc())
+    Args:
+        limit: Maximum number of detections to return.
+        species: Optional case-insensitive substring of the common name.
+        start_date: Optional earliest detection time.
+        end_date: Optional latest detection time.
+        sort_by: 'detection_time', 'confidence', or None to order by ID.
+        sort_order: 'asc' or 'desc'.
+        cursor: Cursor returned with the previous page, if any.
+        skip: Rows to skip with OFFSET (kept for older clients; slow on deep pages).
+        area: Optional bounding box or radius the recording location must fall in.
 
-    results = query.offset(skip).limit(limit).all()
+    Returns:
+        The detections and the cursor of the next page (None on the last page).
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was made for another sort order.
+    """
+    stmt, sort_by = detections_page_query(limit, species, start_date, end_date, sort_by, sort_order, cursor, skip, area)
+    rows, next_cursor = detections_page(self.db.execute(stmt).all(), limit, sort_by, sort_order)
+    return [DetectionResponse(**row._asdict()) for row in rows], next_cursor
 
-    return [DetectionResponse(**row._asdict()) for row in results]
-  
   def delete_detection(self, detection_id: int) -> bool:
     """
     Delete a detection by its ID.
@@ -107,6 +470,193 @@ class DetectionRepository:
     detection = self.db.query(Detection).filter(Detection.id == detection_id).first()
     if detection is None:
       return False
+    stats = StatsRepository(self.db)
+    groups = stats.remove_detections(Detection.id == detection_id)
+    self._mark_changed([detection.recording_id])
     self.db.delete(detection)
+    self.db.flush()
+    stats.refresh_extremes(groups)
     self.db.commit()
-    return True
\ No newline at end of file
+    return True
+
+class AsyncDetectionRepository:
+  """
+  Read-only counterpart of DetectionRepository for an AsyncSession.
+
+  It runs the same statements, so results and cursors are interchangeable
+  with the synchronous repository; writes stay on DetectionRepository.
+  """
+
+  def __init__(self, db: AsyncSession):
+    """
+    Initialize the repository with an async SQLAlchemy session.
+    """
+    self.db = db
+
+  async def get_detection(self, detection_id: int) -> Optional[Detection]:
+    """
+    Retrieve a single detection by its ID.
+
+    Args:
+        detection_id: Primary key of the detection to fetch.
+
+    Returns:
+        The Detection object if found, otherwise None.
+    """
+    return (await self.db.scalars(detection_query(detection_id))).first()
+
+  async def get_recording_detections(self, recording_id: int) -> List[Detection]:
+    """
+    Retrieve all detections of a recording in the order they occur in the file.
+
+    Args:
+        recording_id: Primary key of the recording.
+
+    Returns:
+        A list of Detection objects.
+    """
+    return list((await self.db.scalars(recording_detections_query(recording_id))).all())
+
+  async def get_detections_page(
+    self,
+    limit: int = 100,
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Literal["asc", "desc"] = "desc",
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    area: Optional[GeoArea] = None,
+) -> Tuple[List[DetectionResponse], Optional[str]]:
+    """
+    Return one page of enriched detections and a cursor for the next page.
+
+    See `DetectionRepository.get_detections_page` for the arguments.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was made for another sort order.
+    """
+    rows, next_cursor = await self.get_detection_rows_page(
+      limit, species, start_date, end_date, sort_by, sort_order, cursor, skip, area
+    )
+    return [DetectionResponse(**row._asdict()) for row in rows], next_cursor
+
+  async def get_detection_rows_page(
+    self,
+    limit: int = 100,
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Literal["asc", "desc"] = "desc",
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    area: Optional[GeoArea] = None,
+) -> Tuple[Sequence[Row], Optional[str]]:
+    """
+    Like `get_detections_page`, but return the raw result rows instead of
+    DetectionResponse models, for callers that serialize rows themselves.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was made for another sort order.
+    """
+    stmt, sort_by = detections_page_query(limit, species, start_date, end_date, sort_by, sort_order, cursor, skip, area)
+    return detections_page((await self.db.execute(stmt)).all(), limit, sort_by, sort_order)
+
+  async def stream_detections(
+    self,
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    area: Optional[GeoArea] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+  ) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream every matching enriched detection in ID order, one batch at a time.
+
+    Rows come from a server-side cursor (`yield_per`), so only one batch is
+    held in memory however many detections match.
+
+    Args:
+        species: Optional case-insensitive substring of the common name.
+        start_date: Optional earliest detection time.
+        end_date: Optional latest detection time.
+        area: Optional bounding box or radius the recording location must fall in.
+        batch_size: Rows fetched from the cursor per batch.
+
+    Yields:
+        Lists of rows with the DetectionResponse fields.
+    """
+    stmt = filtered_detections_query(species, start_date, end_date, area).order_by(Detection.id)
+    result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+      yield batch
+
+  async def grid_counts(
+    self,
+    tiles: List[str],
+    precision: int,
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+  ) -> List[Row]:
+    """
+    Count the detections of some geohash tiles per cell of `precision` characters.
+
+    Args:
+        tiles: Geohash prefixes of the tiles to bin; their bins are returned together.
+        precision: Geohash length of a bin (at least the length of every tile).
+        species: Optional case-insensitive substring of the common name.
+        start_date: Optional earliest detection time.
+        end_date: Optional latest detection time.
+
+    Returns:
+        Rows of (geohash, detection_count, species_count, lat, lon), one per non-empty bin.
+    """
+    if not tiles:
+      return []
+    return list((await self.db.execute(grid_query(tiles, precision, species, start_date, end_date))).all())
+
+  async def get_changes(self, since: int = 0, limit: int = 1000) -> DetectionChanges:
+    """
+    Return the detections and recordings inserted, changed or deleted after a change_seq.
+
+    The page ends on a transaction boundary at roughly `limit` changes; a
+    single transaction is never split, so a page can hold more. Only
+    committed transactions are read: the page stops below the lowest
+    change_seq still held by a running transaction, so a seq committed
+    after a higher one is never skipped, only delivered once it commits.
+
+    Args:
+        since: change_seq of the last change already seen (0 for everything).
+        limit: Approximate number of changes per page.
+
+    Returns:
+        The changes, the cursor to pass as `since` next, and whether more are waiting.
+    """
+    version = await committed_change_seq(self.db)
+    if since >= version:
+      return DetectionChanges(detections=[], recordings=[], deleted=[], cursor=since, has_more=False)
+
+    window_end = await self.db.scalar(change_window_end_query(since, limit))
+    until = min(window_end, version) if window_end is not None else version
+
+    detections = (await self.db.execute(detection_changes_query(since, until))).all()
+    recordings = await self.db.scalars(
+      select(Recording)
+      .where(Recording.change_seq > since, Recording.change_seq <= until)
+      .order_by(Recording.change_seq, Recording.id)
+    )
+    tombstones = await self.db.scalars(
+      select(Tombstone)
+      .where(Tombstone.change_seq > since, Tombstone.change_seq <= until)
+      .order_by(Tombstone.change_seq, Tombstone.id)
+    )
+    return DetectionChanges(
+      detections=[DetectionChange(**row._asdict()) for row in detections],
+      recordings=[RecordingChange.model_validate(r) for r in recordings],
+      deleted=[TombstoneEntry.model_validate(t) for t in tombstones],
+      cursor=until,
+      has_more=until < version,
+    )
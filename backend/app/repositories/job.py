@@ -0,0 +1,114 @@
+# backend/app/repositories/job.py
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+from backend.app.models.job import Job, JobStatus
+from backend.app.models.recording import Recording, RecordingStatus
+
+class JobRepository:
+  def __init__(self, db: Session):
+    """
+    Initialize the repository with a SQLAlchemy session.
+    """
+    self.db = db
+
+  def create(self, file_name: str, force_reanalysis: bool = False) -> Job:
+    """
+    Create a new analysis job for an uploaded file.
+
+    Args:
+        file_name: Name of the uploaded .wav or .zip file.
+        force_reanalysis: Run BirdNET even for files analyzed before.
+
+    Returns:
+        The created Job object with populated ID and timestamps.
+    """
+    db_job = Job(file_name=file_name, force_reanalysis=force_reanalysis)
+    self.db.add(db_job)
+    self.db.commit()
+    self.db.refresh(db_job)
+    return db_job
+
+  def get(self, job_id: int) -> Optional[Job]:
+    """
+    Retrieve a single job by its ID.
+
+    Args:
+        job_id: Primary key of the job to fetch.
+
+    Returns:
+        The Job object if found, otherwise None.
+    """
+    return self.db.query(Job).filter(Job.id == job_id).first()
+
+  def get_recording_ids(self, job_id: int) -> List[int]:
+    """
+    Return the IDs of all recordings queued by a job, in upload order.
+
+    Args:
+        job_id: Primary key of the job.
+
+    Returns:
+        A list of recording IDs.
+    """
+    rows = self.db.query(Recording.id).filter(Recording.job_id == job_id).order_by(Recording.id).all()
+    return [row.id for row in rows]
+
+  def count_cache_hits(self, job_id: int) -> int:
+    """
+    Count the job's recordings that reused detections of an identical upload.
+
+    Args:
+        job_id: Primary key of the job.
+
+    Returns:
+        The number of cache hits.
+    """
+    return (
+        self.db.query(func.count(Recording.id))
+        .filter(Recording.job_id == job_id, Recording.reused_from_id.isnot(None))
+        .scalar()
+    )
+
+  def get_status_counts(self, job_id: int) -> Dict[RecordingStatus, int]:
+    """
+    Count the job's recordings per processing status.
+
+    Args:
+        job_id: Primary key of the job.
+
+    Returns:
+        A mapping with an entry for every RecordingStatus (zero if absent).
+    """
+    rows = (
+        self.db.query(Recording.status, func.count(Recording.id))
+        .filter(Recording.job_id == job_id)
+        .group_by(Recording.status)
+        .all()
+    )
+    counts = {status: 0 for status in RecordingStatus}
+    for status, count in rows:
+      counts[RecordingStatus(status)] = count
+    return counts
+
+  @staticmethod
+  def derive_status(counts: Dict[RecordingStatus, int]) -> JobStatus:
+    """
+    Derive the overall job status from per-recording status counts.
+
+    A job is pending until a worker picks up its first recording, processing
+    while any recording is unfinished, failed only if every recording failed,
+    and completed otherwise (including uploads that contained no WAV files).
+    """
+    total = sum(counts.values())
+    unfinished = counts[RecordingStatus.PENDING] + counts[RecordingStatus.PROCESSING]
+
+    if total and counts[RecordingStatus.PENDING] == total:
+      return JobStatus.PENDING
+    if unfinished:
+      return JobStatus.PROCESSING
+    if total and counts[RecordingStatus.FAILED] == total:
+      return JobStatus.FAILED
+    return JobStatus.COMPLETED
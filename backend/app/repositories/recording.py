@@ -1,11 +1,19 @@
 # backend/app/repositories/recording.py
 
+from sqlalchemy import Select, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from backend.app.models.recording import Recording
 from backend.app.schemas.recording import RecordingStatus
+from backend.app.repositories.changes import change_seq
+from backend.services.query_cache import mark_stale
+
+def recordings_query(skip: int, limit: int) -> Select:
+  # Shared by RecordingRepository and AsyncRecordingRepository
+  return select(Recording).order_by(Recording.id).offset(skip).limit(limit)
 
 class RecordingRepository:
   def __init__(self, db: Session):
@@ -14,15 +22,27 @@ class RecordingRepository:
     """
     self.db = db
   
-  def create(self, file_name: str, lat: float, lon: float, recording_datetime: datetime) -> Recording:
+  def create(
+    self,
+    file_name: str,
+    lat: float,
+    lon: float,
+    recording_datetime: datetime,
+    job_id: Optional[int] = None,
+    file_path: Optional[str] = None,
+    status: RecordingStatus = RecordingStatus.PENDING,
+  ) -> Recording:
     """
-    Create a new recording with status 'PENDING'.
+    Create a new recording, by default with status 'PENDING'.
 
     Args:
         file_name: Name of the uploaded audio file.
         lat: Latitude of the recording location.
         lon: Longitude of the recording location.
         recording_datetime: Datetime the recording was made.
+        job_id: Optional ID of the upload job queuing this recording.
+        file_path: Optional path of the spooled audio for a background worker.
+        status: Initial status; recordings analyzed right away start as 'PROCESSING'.
 
     Returns:
         The created Recording object with populated ID and timestamps.
@@ -32,7 +52,9 @@ class RecordingRepository:
       lat=lat,
       lon=lon,
       recording_datetime=recording_datetime,
-      status=RecordingStatus.PENDING
+      status=status,
+      job_id=job_id,
+      file_path=file_path,
     )
     self.db.add(db_recording)
     self.db.commit()
@@ -43,14 +65,16 @@ class RecordingRepository:
     """
     Retrieve a single recording by its ID.
 
+    A recording already loaded in this session (e.g. just created or claimed)
+    is returned from the identity map without querying the database.
+
     Args:
         recording_id: Primary key of the recording to fetch.
 
     Returns:
         The Recording object if found, otherwise None.
     """
-    
-    return self.db.query(Recording).filter(Recording.id == recording_id).first()
+    return self.db.get(Recording, recording_id)
   
   def list(self, skip: int = 0, limit: int = 100) -> List[Recording]:
     """
@@ -63,22 +87,249 @@ class RecordingRepository:
     Returns:
         A list of Recording objects.
     """
-    return self.db.query(Recording).offset(skip).limit(limit).all()
+    return list(self.db.scalars(recordings_query(skip, limit)).all())
   
-  def update_status(self, recording_id: int, status: RecordingStatus, error_message: Optional[str] = None) -> bool:
+  def update_status(
+    self,
+    recording_id: int,
+    status: RecordingStatus,
+    error_message: Optional[str] = None,
+    commit: bool = True,
+  ) -> bool:
     """
     Update the status and optional error message for a recording.
 
+    `completed_at` is set when the recording reaches 'COMPLETED' and cleared otherwise.
+
     Args:
         recording_id: Primary key of the recording to update.
         status: New status value ('PROCESSING', 'COMPLETED', or 'FAILED').
         error_message: Optional error message if status is 'FAILED'.
+        commit: Commit right away; pass False to leave it to the caller's transaction.
 
     Returns:
         True if a row was updated, False if no matching recording was found.
     """
     updated_rows = self.db.query(Recording).filter(Recording.id == recording_id).update(
-      {"status": status, "error_message": error_message}
+      {
+        "status": status,
+        "error_message": error_message,
+        "completed_at": func.now() if status == RecordingStatus.COMPLETED else None,
+        "change_seq": change_seq(self.db),
+      }
     )
+    if updated_rows:
+      mark_stale(self.db)
+    if commit:
+      self.db.commit()
+    return updated_rows > 0
+
+  def claim_next_pending(self) -> Optional[Recording]:
+    """
+    Atomically claim the oldest queued recording and mark it 'PROCESSING'.
+
+    Only recordings queued by an upload job are considered. On PostgreSQL the
+    row is locked with SKIP LOCKED so concurrent workers skip each other's
+    candidates. SQLite has no row locks, so the claim itself is a conditional
+    UPDATE that only succeeds while the recording is still 'PENDING'; a worker
+    that loses the race moves on to the next recording.
+
+    Returns:
+        The claimed Recording object, or None if the queue is empty.
+    """
+    while True:
+      recording_id = self.db.scalar(
+        select(Recording.id)
+        .where(Recording.status == RecordingStatus.PENDING, Recording.job_id.isnot(None))
+        .order_by(Recording.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+      )
+      if recording_id is None:
+        self.db.commit()
+        return None
+
+      claimed = self.db.execute(
+        update(Recording)
+        .where(Recording.id == recording_id, Recording.status == RecordingStatus.PENDING)
+        .values(
+          status=RecordingStatus.PROCESSING,
+          claimed_at=datetime.now(timezone.utc),
+          change_seq=change_seq(self.db),
+        )
+      ).rowcount
+      if not claimed:
+        self.db.rollback()
+        continue
+
+      mark_stale(self.db)
+      self.db.commit()
+      recording = self.db.get(Recording, recording_id)
+      self.db.refresh(recording)
+      return recording
+
+  def renew_claims(self, recording_ids: List[int]) -> int:
+    """
+    Extend the claims of recordings a worker is still analyzing.
+
+    Args:
+        recording_ids: Recordings claimed by this process and not finished yet.
+
+    Returns:
+        The number of claims renewed.
+    """
+    if not recording_ids:
+      return 0
+    updated_rows = self.db.execute(
+      update(Recording)
+      .where(Recording.id.in_(recording_ids), Recording.status == RecordingStatus.PROCESSING)
+      .values(claimed_at=datetime.now(timezone.utc))
+    ).rowcount
     self.db.commit()
-    return updated_rows > 0
\ No newline at end of file
+    return updated_rows
+
+  def requeue_interrupted(self, lease_timeout: float) -> int:
+    """
+    Return queued recordings whose claim has expired to 'PENDING'.
+
+    A claim expires when its worker has not renewed it for `lease_timeout`
+    seconds, e.g. because the process was stopped or crashed. Recordings other
+    live workers are still analyzing keep renewing their claims and are left alone.
+
+    Args:
+        lease_timeout: Seconds after which an unrenewed claim is considered abandoned.
+
+    Returns:
+        The number of recordings put back on the queue.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lease_timeout)
+    updated_rows = self.db.execute(
+      update(Recording)
+      .where(
+        Recording.status == RecordingStatus.PROCESSING,
+        Recording.job_id.isnot(None),
+        # Claims made before claimed_at existed have none and count as expired
+        or_(Recording.claimed_at.is_(None), Recording.claimed_at < cutoff),
+      )
+      .values(status=RecordingStatus.PENDING, claimed_at=None, change_seq=change_seq(self.db))
+    ).rowcount
+    if updated_rows:
+      mark_stale(self.db)
+    self.db.commit()
+    return updated_rows
+
+  def find_analyzed(
+    self,
+    content_hash: str,
+    min_conf: float,
+    lat: float,
+    lon: float,
+    week_48: int,
+    exclude_id: Optional[int] = None,
+    silence_filtered: bool = False,
+  ) -> Optional[Recording]:
+    """
+    Find a completed recording with identical content and analyzer parameters.
+
+    Args:
+        content_hash: SHA-256 of the WAV content.
+        min_conf: Minimum confidence the analysis used.
+        lat: Latitude used for the species filter.
+        lon: Longitude used for the species filter.
+        week_48: Week of the year (1-48) used for the species filter.
+        exclude_id: Optional recording to leave out (usually the one being analyzed).
+        silence_filtered: Whether the analysis must have used the silence pre-filter.
+
+    Returns:
+        The most recent matching Recording, or None if there is no match.
+    """
+    query = self.db.query(Recording).filter(
+      Recording.content_hash == content_hash,
+      Recording.min_conf == min_conf,
+      Recording.lat == lat,
+      Recording.lon == lon,
+      Recording.week_48 == week_48,
+      Recording.status == RecordingStatus.COMPLETED,
+    )
+    if exclude_id is not None:
+      query = query.filter(Recording.id != exclude_id)
+    if silence_filtered:
+      query = query.filter(Recording.skipped_windows.isnot(None))
+    else:
+      query = query.filter(Recording.skipped_windows.is_(None))
+    return query.order_by(Recording.id.desc()).first()
+
+  def set_analysis_params(
+    self,
+    recording_id: int,
+    content_hash: Optional[str],
+    min_conf: float,
+    week_48: Optional[int],
+    reused_from_id: Optional[int] = None,
+    skipped_windows: Optional[int] = None,
+    commit: bool = True,
+  ) -> bool:
+    """
+    Record the content hash and analyzer parameters a recording was analyzed with.
+
+    Args:
+        recording_id: Primary key of the recording to update.
+        content_hash: SHA-256 of the WAV content (None if it was not computed).
+        min_conf: Minimum confidence the analysis used.
+        week_48: Week of the year (1-48) used for the species filter (None if it was off).
+        reused_from_id: Recording whose detections were reused, for cache hits.
+        skipped_windows: Windows the silence pre-filter skipped (None if it was off).
+        commit: Commit right away; pass False to leave it to the caller's transaction.
+
+    Returns:
+        True if a row was updated, False if no matching recording was found.
+    """
+    updated_rows = self.db.query(Recording).filter(Recording.id == recording_id).update(
+      {
+        "content_hash": content_hash,
+        "min_conf": min_conf,
+        "week_48": week_48,
+        "reused_from_id": reused_from_id,
+        "skipped_windows": skipped_windows,
+      }
+    )
+    if commit:
+      self.db.commit()
+    return updated_rows > 0
+
+
+class AsyncRecordingRepository:
+  """
+  Read-only counterpart of RecordingRepository for an AsyncSession.
+  """
+
+  def __init__(self, db: AsyncSession):
+    """
+    Initialize the repository with an async SQLAlchemy session.
+    """
+    self.db = db
+
+  async def get(self, recording_id: int) -> Optional[Recording]:
+    """
+    Retrieve a single recording by its ID.
+
+    Args:
+        recording_id: Primary key of the recording to fetch.
+
+    Returns:
+        The Recording object if found, otherwise None.
+    """
+    return await self.db.get(Recording, recording_id)
+
+  async def list(self, skip: int = 0, limit: int = 100) -> List[Recording]:
+    """
+    Retrieve multiple recordings (for admin or debug purposes).
+
+    Args:
+        skip: Number of records to skip (for pagination).
+        limit: Maximum number of records to return.
+
+    Returns:
+        A list of Recording objects.
+    """
+    return list((await self.db.scalars(recordings_query(skip, limit))).all())
@@ -0,0 +1,85 @@
+# backend/app/repositories/species.py
+
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.app.models.species import Species
+
+SpeciesKey = Tuple[str, str]
+
+class SpeciesRepository:
+  def __init__(self, db: Session):
+    """
+    Initialize the repository with a SQLAlchemy session.
+    """
+    self.db = db
+
+  def get_or_create_ids(self, names: Iterable[SpeciesKey], commit: bool = True) -> Dict[SpeciesKey, int]:
+    """
+    Look up the IDs of species, adding the ones not seen before.
+
+    Args:
+        names: (scientific_name, common_name) pairs; duplicates are fine.
+        commit: Commit right away; pass False to leave it to the caller's transaction.
+
+    Returns:
+        A mapping from each (scientific_name, common_name) pair to its species ID.
+    """
+    keys = set(names)
+    if not keys:
+      return {}
+
+    ids = self._find_ids(keys)
+    missing = keys - ids.keys()
+    if missing:
+      rows = [{"scientific_name": sci, "common_name": common} for sci, common in sorted(missing)]
+      # Concurrent workers may add the same species; let the unique constraint sort it out
+      dialect = self.db.get_bind().dialect.name
+      if dialect == "postgresql":
+        self.db.execute(postgresql.insert(Species).on_conflict_do_nothing(), rows)
+      elif dialect == "sqlite":
+        self.db.execute(sqlite.insert(Species).on_conflict_do_nothing(), rows)
+      else:
+        self.db.execute(Species.__table__.insert(), rows)
+      if commit:
+        self.db.commit()
+      ids.update(self._find_ids(missing))
+    return ids
+
+  def _find_ids(self, keys: Iterable[SpeciesKey]) -> Dict[SpeciesKey, int]:
+    rows = self.db.execute(
+      select(Species.scientific_name, Species.common_name, Species.id)
+      .where(tuple_(Species.scientific_name, Species.common_name).in_(list(keys)))
+    ).all()
+    return {(row.scientific_name, row.common_name): row.id for row in rows}
+
+  def search(self, term: Optional[str] = None, limit: int = 20) -> List[Species]:
+    """
+    Find species whose common or scientific name contains a search term.
+
+    On PostgreSQL the common-name match uses the trigram index, so the lookup
+    stays fast without scanning detections.
+
+    Args:
+        term: Case-insensitive substring to look for; all species when omitted.
+        limit: Maximum number of species to return.
+
+    Returns:
+        Matching Species objects, ordered by common name.
+    """
+    query = self.db.query(Species)
+    if term:
+      query = query.filter(or_(Species.common_name.ilike(f"%{term}%"), Species.scientific_name.ilike(f"%{term}%")))
+    return query.order_by(Species.common_name).limit(limit).all()
+
+  @staticmethod
+  def matching_ids_query(term: str):
+    """
+    Build a subquery selecting the IDs of species whose common name contains a term.
+
+    Used to filter detections by species through the indexed `species_id`
+    column instead of pattern-matching every detection row.
+    """
+    return select(Species.id).where(Species.common_name.ilike(f"%{term}%"))
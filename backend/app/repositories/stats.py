@@ -0,0 +1,287 @@
+# backend/app/repositories/stats.py
+
+from sqlalchemy import Date, bindparam, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from datetime import date
+
+from backend.app.models.detection import Detection
+from backend.app.models.recording import Recording
+from backend.app.models.species import Species
+from backend.app.models.species_daily import SpeciesDaily
+
+# Detection IDs per statement when rolling up freshly inserted detections
+ROLLUP_CHUNK_SIZE = 1000
+
+GROUP_KEY = ("day", "species_id", "lat", "lon")
+
+class StatsRepository:
+  def __init__(self, db: Session):
+    """
+    Initialize the repository with a SQLAlchemy session.
+    """
+    self.db = db
+
+  def _daily_aggregates(self, condition: Any):
+    """
+    Build a SELECT of species_daily-shaped aggregates for the detections matching a condition.
+    """
+    day = func.date(Detection.detection_time, type_=Date)
+    return (
+      select(
+        day.label("day"),
+        Detection.species_id,
+        Recording.lat,
+        Recording.lon,
+        func.count(Detection.id).label("detection_count"),
+        func.sum(Detection.confidence).label("confidence_sum"),
+        func.max(Detection.confidence).label("max_confidence"),
+        func.min(Detection.detection_time).label("first_detection"),
+        func.max(Detection.detection_time).label("last_detection"),
+      )
+      .join(Recording, Detection.recording_id == Recording.id)
+      .where(condition)
+      .group_by(day, Detection.species_id, Recording.lat, Recording.lon)
+    )
+
+  def add_detections(self, detection_ids: List[int]) -> None:
+    """
+    Fold newly inserted detections into the daily rollup.
+
+    Counts and sums are added and extremes widened with an upsert, so
+    concurrent ingests touching the same day/species/site never overwrite
+    each other. Does not commit; call it before the detections' own commit.
+
+    Args:
+        detection_ids: IDs of detections inserted in the current transaction.
+    """
+    dialect = self.db.get_bind().dialect.name
+    if dialect == "postgresql":
+      insert, greatest, least = postgresql.insert, func.greatest, func.least
+    else:
+      # SQLite's scalar max()/min() take several arguments like GREATEST/LEAST
+      insert, greatest, least = sqlite.insert, func.max, func.min
+
+    table = SpeciesDaily.__table__
+    for start in range(0, len(detection_ids), ROLLUP_CHUNK_SIZE):
+      chunk = detection_ids[start:start + ROLLUP_CHUNK_SIZE]
+      aggregates = self._daily_aggregates(Detection.id.in_(chunk))
+      stmt = insert(SpeciesDaily).from_select(
+        [c.name for c in aggregates.selected_columns], aggregates
+      )
+      stmt = stmt.on_conflict_do_update(
+        index_elements=list(GROUP_KEY),
+        set_={
+          "detection_count": table.c.detection_count + stmt.excluded.detection_count,
+          "confidence_sum": table.c.confidence_sum + stmt.excluded.confidence_sum,
+          "max_confidence": greatest(table.c.max_confidence, stmt.excluded.max_confidence),
+          "first_detection": least(table.c.first_detection, stmt.excluded.first_detection),
+          "last_detection": greatest(table.c.last_detection, stmt.excluded.last_detection),
+        },
+      )
+      self.db.execute(stmt)
+
+  def remove_detections(self, condition: Any) -> List[dict]:
+    """
+    Subtract detections that are about to be deleted from the daily rollup.
+
+    Call it before deleting the detections, then pass the returned groups to
+    `refresh_extremes` once they are gone. Does not commit.
+
+    Args:
+        condition: SQL condition selecting the detections to be deleted.
+
+    Returns:
+        The rollup groups (day, species_id, lat, lon) that were touched.
+    """
+    rows = self.db.execute(self._daily_aggregates(condition)).all()
+    if not rows:
+      return []
+
+    groups = [{f"k_{k}": getattr(row, k) for k in GROUP_KEY} for row in rows]
+    self.db.execute(
+      update(SpeciesDaily.__table__)
+      .where(*self._group_match())
+      .values(
+        detection_count=SpeciesDaily.detection_count - bindparam("count"),
+        confidence_sum=SpeciesDaily.confidence_sum - bindparam("conf_sum"),
+      ),
+      [{**group, "count": row.detection_count, "conf_sum": row.confidence_sum} for group, row in zip(groups, rows)],
+    )
+    return groups
+
+  def refresh_extremes(self, groups: List[dict]) -> None:
+    """
+    Recompute max confidence and first/last detection of groups that lost detections,
+    and drop groups left empty. Does not commit.
+
+    Args:
+        groups: Groups returned by `remove_detections`.
+    """
+    if not groups:
+      return
+    self.db.execute(
+      delete(SpeciesDaily.__table__)
+      .where(*self._group_match(), SpeciesDaily.detection_count <= 0),
+      groups,
+    )
+
+    def remaining(aggregate):
+      # Correlated to the species_daily row being updated
+      return (
+        select(aggregate)
+        .join(Recording, Detection.recording_id == Recording.id)
+        .where(
+          func.date(Detection.detection_time, type_=Date) == SpeciesDaily.day,
+          Detection.species_id == SpeciesDaily.species_id,
+          Recording.lat == SpeciesDaily.lat,
+          Recording.lon == SpeciesDaily.lon,
+        )
+        .scalar_subquery()
+      )
+
+    self.db.execute(
+      update(SpeciesDaily.__table__)
+      .where(*self._group_match())
+      .values(
+        max_confidence=remaining(func.max(Detection.confidence)),
+        first_detection=remaining(func.min(Detection.detection_time)),
+        last_detection=remaining(func.max(Detection.detection_time)),
+      ),
+      groups,
+    )
+
+  @staticmethod
+  def _group_match():
+    # Matches one species_daily row per executemany parameter set
+    return [getattr(SpeciesDaily, k) == bindparam(f"k_{k}") for k in GROUP_KEY]
+
+  def _filtered(
+    self,
+    query,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    lat: Optional[float],
+    lon: Optional[float],
+    species: Optional[str],
+  ):
+    if start_date:
+      query = query.where(SpeciesDaily.day >= start_date)
+    if end_date:
+      query = query.where(SpeciesDaily.day <= end_date)
+    if lat is not None and lon is not None:
+      query = query.where(SpeciesDaily.lat == lat, SpeciesDaily.lon == lon)
+    if species:
+      query = query.where(Species.common_name.ilike(f"%{species}%"))
+    return query
+
+  def species_totals(
+    self,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    species: Optional[str] = None,
+    limit: int = 100,
+  ) -> List[dict]:
+    """
+    Summarize detections per species, most detected first.
+
+    Args:
+        start_date: Optional first day to include.
+        end_date: Optional last day to include.
+        lat: Optional site latitude (used together with lon).
+        lon: Optional site longitude (used together with lat).
+        species: Optional case-insensitive substring of the common name.
+        limit: Maximum number of species to return.
+
+    Returns:
+        One dict per species with counts, confidence and first/last detection.
+    """
+    detection_count = func.sum(SpeciesDaily.detection_count)
+    query = (
+      select(
+        Species.common_name.label("species"),
+        Species.scientific_name,
+        detection_count.label("detection_count"),
+        func.count(func.distinct(SpeciesDaily.day)).label("days_detected"),
+        func.max(SpeciesDaily.max_confidence).label("max_confidence"),
+        (func.sum(SpeciesDaily.confidence_sum) / detection_count).label("mean_confidence"),
+        func.min(SpeciesDaily.first_detection).label("first_detection"),
+        func.max(SpeciesDaily.last_detection).label("last_detection"),
+      )
+      .join(Species, SpeciesDaily.species_id == Species.id)
+      .group_by(Species.id, Species.common_name, Species.scientific_name)
+    )
+    query = self._filtered(query, start_date, end_date, lat, lon, species)
+    query = query.order_by(detection_count.desc(), Species.common_name).limit(limit)
+    return [row._asdict() for row in self.db.execute(query).all()]
+
+  def daily_counts(
+    self,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    species: Optional[str] = None,
+    limit: int = 1000,
+  ) -> List[dict]:
+    """
+    Return the rollup rows (one per day, species and site), oldest day first.
+
+    Args:
+        start_date: Optional first day to include.
+        end_date: Optional last day to include.
+        lat: Optional site latitude (used together with lon).
+        lon: Optional site longitude (used together with lat).
+        species: Optional case-insensitive substring of the common name.
+        limit: Maximum number of rows to return.
+
+    Returns:
+        One dict per day, species and site.
+    """
+    query = (
+      select(
+        SpeciesDaily.day,
+        Species.common_name.label("species"),
+        Species.scientific_name,
+        SpeciesDaily.lat,
+        SpeciesDaily.lon,
+        SpeciesDaily.detection_count,
+        SpeciesDaily.max_confidence,
+        (SpeciesDaily.confidence_sum / SpeciesDaily.detection_count).label("mean_confidence"),
+        SpeciesDaily.first_detection,
+        SpeciesDaily.last_detection,
+      )
+      .join(Species, SpeciesDaily.species_id == Species.id)
+    )
+    query = self._filtered(query, start_date, end_date, lat, lon, species)
+    query = query.order_by(SpeciesDaily.day, Species.common_name, SpeciesDaily.lat, SpeciesDaily.lon).limit(limit)
+    return [row._asdict() for row in self.db.execute(query).all()]
+
+  def site_totals(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[dict]:
+    """
+    Summarize detections per site (recording latitude/longitude).
+
+    Args:
+        start_date: Optional first day to include.
+        end_date: Optional last day to include.
+
+    Returns:
+        One dict per site with its detection and species counts and active days.
+    """
+    query = (
+      select(
+        SpeciesDaily.lat,
+        SpeciesDaily.lon,
+        func.sum(SpeciesDaily.detection_count).label("detection_count"),
+        func.count(func.distinct(SpeciesDaily.species_id)).label("species_count"),
+        func.min(SpeciesDaily.day).label("first_day"),
+        func.max(SpeciesDaily.day).label("last_day"),
+      )
+      .group_by(SpeciesDaily.lat, SpeciesDaily.lon)
+    )
+    query = self._filtered(query, start_date, end_date, None, None, None)
+    query = query.order_by(SpeciesDaily.lat, SpeciesDaily.lon)
+    return [row._asdict() for row in self.db.execute(query).all()]
@@ -1,15 +1,35 @@
 import logging
+import shutil
 import zipfile
+from collections import deque
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from tempfile import TemporaryDirectory, mkdtemp
+from typing import Iterable, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from birdnetlib.analyzer import Analyzer
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from backend.services.audio_analyzer import analyze_audio_file
-from backend.app.utils.file_utils import get_recording_datetime, validate_upload
+from backend.services.audio_analyzer import (
+    analyze_or_reuse,
+    find_cached_analysis,
+    reuse_cached_detections,
+    save_birdnet_detections,
+)
+from backend.services.inference_pool import InferencePool
+from backend.services.zip_pipeline import (
+    UnsafeArchiveError,
+    extract_wav_member,
+    iter_extracted_wavs,
+    list_wav_members,
+)
+from backend.app.config import ANALYSIS_RETRY_AFTER, SPOOL_DIR, STORE_SCORES
+from backend.app.utils.file_utils import file_sha256, get_recording_datetime, save_upload, validate_upload
+from backend.app.repositories.job import JobRepository
 from backend.app.repositories.recording import RecordingRepository
 from backend.app.models.recording import RecordingStatus
+from backend.app.schemas.detection import DetectionResponse
 from database.config import get_db
 
 router = APIRouter(tags=["analyze"])
@@ -19,91 +39,398 @@ logger = logging.getLogger(__name__)
 @router.post("/analyze")
 async def analyze_audio(
     request: Request,
+    response: Response,
     file: UploadFile = File(...),
     lat: float = Form(...),
     lon: float = Form(...),
+    mode: Literal["sync", "job"] = Form("sync"),
+    force: bool = Form(False),
     db: Session = Depends(get_db)
 ):
-    # Get shared BirdNET analyzer instance from app state
-    analyzer = request.app.state.analyzer
     filename = validate_upload(file)
+
+    # In job mode the upload is only queued; background workers run BirdNET
+    if mode == "job":
+        response.status_code = 202
+        return await enqueue_analysis_job(request, file, filename, lat, lon, force, db)
+
+    # Refuse work up front rather than queueing it without bound
+    analysis_executor = request.app.state.analysis_executor
+    if not analysis_executor.try_admit():
+        raise HTTPException(
+            status_code=429,
+            detail="Too many analyses in progress. Try again later or use mode=job.",
+            headers={"Retry-After": str(ANALYSIS_RETRY_AFTER)},
+        )
+
+    inference_pool = getattr(request.app.state, "inference_pool", None)
+
+    try:
+        with TemporaryDirectory() as tmpdir:
+            # Keep the original name; the recording datetime is parsed from it
+            upload_path = Path(tmpdir) / Path(file.filename).name
+            size, checksum = await save_upload(file, upload_path)
+            logger.info(f"Received {upload_path.name} ({size} bytes, sha256 {checksum})")
+
+            # BirdNET and the database calls block, so they run in the analysis executor,
+            # each thread with its own BirdNET analyzer
+            skipped_duplicates = []
+            if filename.endswith(".zip"):
+                detections, recording_ids, cache_hits, skipped_duplicates = await analysis_executor.run_with_analyzer(
+                    analyze_zip_upload, upload_path,
+                    inference_pool=inference_pool, lat=lat, lon=lon, force=force, db=db,
+                )
+            else:
+                detections, recording_ids, cache_hits = await analysis_executor.run_with_analyzer(
+                    analyze_wav_upload, upload_path, checksum, lat=lat, lon=lon, force=force, db=db
+                )
+    finally:
+        analysis_executor.release()
+
+    return {
+        "recording_ids": recording_ids,
+        "status": "completed",
+        "cache_hits": cache_hits,
+        "skipped_duplicates": skipped_duplicates,
+        "detections": detections,
+    }
+
+
+def analyze_zip_upload(
+    zip_path: Path,
+    analyzer: Analyzer,
+    inference_pool: Optional[InferencePool],
+    lat: float,
+    lon: float,
+    force: bool,
+    db: Session,
+) -> Tuple[List[DetectionResponse], List[int], List[str], List[str]]:
+    """
+    Analyze every WAV file in an uploaded ZIP archive.
+
+    Members are unzipped one at a time next to the archive while earlier ones
+    are analyzed, serially or fanned out across the inference pool.
+
+    Returns:
+        The detections created, the IDs of the recordings that completed, the
+        names of the files that were cache hits and the names of the members
+        skipped because another member had the same file name.
+    """
     recording_repo = RecordingRepository(db)
     detections = []
-    wav_files = []
     recording_ids = []
-    
-    if filename.endswith(".zip"):
-        with TemporaryDirectory() as tmpdir:
-            zip_path = Path(tmpdir) / filename
-            with open(zip_path, "wb") as out:
-                out.write(await file.read())
+    # Files whose detections were copied from an identical earlier upload
+    cache_hits = []
+
+    try:
+        zip_ref = zipfile.ZipFile(zip_path, "r")
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid ZIP file")
+
+    with zip_ref:
+        try:
+            wav_members, skipped_duplicates = list_wav_members(zip_ref)
+        except UnsafeArchiveError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+        logger.info(f"Found {len(wav_members)} wav files in ZIP archive")
+
+        extract_dir = zip_path.parent / "extracted"
+        extract_dir.mkdir()
+        wav_files = iter_extracted_wavs(zip_ref, wav_members, extract_dir)
+
+        # Fan members out across the inference processes when a pool is configured
+        if inference_pool is not None:
+            return (*analyze_wav_files_in_pool(inference_pool, wav_files, lat, lon, db, force), skipped_duplicates)
+
+        for wav_file in wav_files:
+            recording = None
+            recording_id = None
 
             try:
-                with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                    zip_ref.extractall(tmpdir)
+                recording_datetime = get_recording_datetime(wav_file.name)
+                recording = recording_repo.create(
+                    wav_file.name, lat, lon, recording_datetime, status=RecordingStatus.PROCESSING
+                )
+                recording_id = recording.id
+
+                # Stores the detections and marks the recording COMPLETED in one commit
+                results, reused = analyze_or_reuse(
+                    wav_file, analyzer, recording_id, db, file_sha256(wav_file), force
+                )
+                detections.extend(results)
+                if reused:
+                    cache_hits.append(wav_file.name)
+                recording_ids.append(recording_id)
+
+            except Exception as e:
+                logger.exception(f"Failed to process {wav_file.name}")
+                db.rollback()
+                if recording_id is not None:
+                    recording_repo.update_status(recording_id, RecordingStatus.FAILED, error_message=str(e))
+            finally:
+                # Free the disk space as soon as the file is analyzed
+                wav_file.unlink(missing_ok=True)
+
+    return detections, recording_ids, cache_hits, skipped_duplicates
+
+
+def analyze_wav_upload(
+    wav_path: Path,
+    checksum: str,
+    analyzer: Analyzer,
+    lat: float,
+    lon: float,
+    force: bool,
+    db: Session,
+) -> Tuple[List[DetectionResponse], List[int], List[str]]:
+    """
+    Analyze a single uploaded WAV file.
+
+    Returns:
+        The detections created, the ID of the recording if it completed and
+        the file name if it was a cache hit.
+    """
+    recording_repo = RecordingRepository(db)
+    detections = []
+    recording_ids = []
+    cache_hits = []
+    recording = None
+    recording_id = None
+
+    try:
+        recording_datetime = get_recording_datetime(wav_path.name)
+        recording = recording_repo.create(
+            wav_path.name, lat, lon, recording_datetime, status=RecordingStatus.PROCESSING
+        )
+        recording_id = recording.id
+
+        # Stores the detections and marks the recording COMPLETED in one commit
+        results, reused = analyze_or_reuse(wav_path, analyzer, recording_id, db, checksum, force)
+        detections.extend(results)
+        if reused:
+            cache_hits.append(wav_path.name)
+        recording_ids.append(recording_id)
+
+    except Exception as e:
+        logger.exception(f"Failed to process {wav_path.name}")
+        db.rollback()
+        if recording_id is not None:
+            recording_repo.update_status(recording_id, RecordingStatus.FAILED, error_message=str(e))
+
+    return detections, recording_ids, cache_hits
+
+
+async def enqueue_analysis_job(
+    request: Request,
+    file: UploadFile,
+    filename: str,
+    lat: float,
+    lon: float,
+    force: bool,
+    db: Session,
+) -> dict:
+    """
+    Spool an upload to disk and queue one PENDING recording per WAV file.
+
+    The WAV files are written to a fresh directory under SPOOL_DIR using their
+    original names (needed to derive the recording datetime). The job and its
+    recordings are only created once every file is on disk, so a rejected upload
+    leaves nothing behind; then the worker pool is woken up. Workers reuse the
+    detections of identical earlier uploads unless `force` is set.
+    """
+    SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    job_dir = Path(mkdtemp(prefix="upload-", dir=SPOOL_DIR))
+    spooled_files = []
+    skipped_duplicates = []
+
+    try:
+        if filename.endswith(".zip"):
+            zip_path = job_dir / filename
+            size, checksum = await save_upload(file, zip_path)
+            logger.info(f"Received {filename} ({size} bytes, sha256 {checksum})")
+
+            try:
+                spooled_files, skipped_duplicates = await run_in_threadpool(spool_zip_members, zip_path, job_dir)
             except zipfile.BadZipFile:
                 raise HTTPException(status_code=400, detail="Invalid ZIP file")
+            except UnsafeArchiveError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            finally:
+                zip_path.unlink(missing_ok=True)
+
+            logger.info(f"Spooled {len(spooled_files)} wav files from ZIP archive")
+
+        else:
+            wav_path = job_dir / Path(file.filename).name
+            size, checksum = await save_upload(file, wav_path)
+            logger.info(f"Received {wav_path.name} ({size} bytes, sha256 {checksum})")
+            spooled_files.append(wav_path)
+    except BaseException:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
 
-            wav_files = [
-                f for f in Path(tmpdir).rglob("*.[wW][aA][vV]")
-                if not f.name.startswith(("._", "."))
-            ]
+    job_id, recording_ids = await run_in_threadpool(
+        queue_job_recordings, filename, spooled_files, lat, lon, force, db
+    )
 
-            logger.info(f"Found {len(wav_files)} wav files in ZIP archive")
+    if not recording_ids:
+        shutil.rmtree(job_dir, ignore_errors=True)
 
-            for wav_file in wav_files:
-                recording = None
-                recording_id = None
+    # Wake idle workers; they also poll, so a missing pool only delays processing
+    worker_pool = getattr(request.app.state, "worker_pool", None)
+    if worker_pool is not None:
+        worker_pool.notify()
+
+    return {
+        "job_id": job_id,
+        "recording_ids": recording_ids,
+        "status": RecordingStatus.PENDING.value,
+        "skipped_duplicates": skipped_duplicates,
+    }
 
-                try:
-                    recording_datetime = get_recording_datetime(wav_file.name)
-                    recording = recording_repo.create(wav_file.name, lat, lon, recording_datetime)
-                    recording_id = recording.id
 
-                    recording_repo.update_status(recording_id, RecordingStatus.PROCESSING)
+def spool_zip_members(zip_path: Path, job_dir: Path) -> Tuple[List[Path], List[str]]:
+    """
+    Extract the WAV members of an uploaded ZIP archive into a job's spool directory.
 
-                    results = analyze_audio_file(wav_file, analyzer, recording_id, db)
-                    detections.extend(results)
+    Returns:
+        The spooled files and the names of the members skipped because another
+        member had the same file name.
 
-                    recording_repo.update_status(recording_id, RecordingStatus.COMPLETED)
-                    recording_ids.append(recording_id)
+    Raises:
+        zipfile.BadZipFile: If the upload is not a valid ZIP archive.
+        UnsafeArchiveError: If the archive or a member is too large or too highly compressed.
+    """
+    spooled_files = []
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        members, skipped_duplicates = list_wav_members(zip_ref)
+        for member in members:
+            wav_path = extract_wav_member(zip_ref, member, job_dir)
+            if wav_path is not None:
+                spooled_files.append(wav_path)
+    return spooled_files, skipped_duplicates
 
-                except Exception as e:
-                    logger.exception(f"Failed to process {wav_file.name}")
-                    if recording_id is not None:
-                        recording_repo.update_status(recording_id, RecordingStatus.FAILED, error_message=str(e))
 
-    elif filename.endswith(".wav"):
-        with NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(await file.read())
-            tmp.flush()
-            tmp_path = Path(tmp.name)
-            
-        recording = None
+def queue_job_recordings(
+    filename: str,
+    spooled_files: List[Path],
+    lat: float,
+    lon: float,
+    force: bool,
+    db: Session,
+) -> Tuple[int, List[int]]:
+    """
+    Create a job and one PENDING recording per spooled WAV file.
 
+    Files whose names do not carry a recording datetime are deleted and skipped.
+
+    Returns:
+        The job ID and the IDs of the queued recordings.
+    """
+    job = JobRepository(db).create(filename, force_reanalysis=force)
+    recording_repo = RecordingRepository(db)
+    recording_ids = []
+
+    for wav_path in spooled_files:
         try:
-            recording_datetime = get_recording_datetime(tmp_path.name)
-            recording = recording_repo.create(tmp_path.name, lat, lon, recording_datetime)
-            recording_repo.update_status(recording.id, RecordingStatus.PROCESSING)
+            recording_datetime = get_recording_datetime(wav_path.name)
+        except ValueError:
+            logger.warning(f"Skipping {wav_path.name}: filename is not 'YYYYMMDD_HHMMSS.wav'")
+            wav_path.unlink(missing_ok=True)
+            continue
 
-            results = analyze_audio_file(tmp_path, analyzer, recording.id, db)
-            detections.extend(results)
+        recording = recording_repo.create(
+            wav_path.name, lat, lon, recording_datetime, job_id=job.id, file_path=str(wav_path)
+        )
+        recording_ids.append(recording.id)
+
+    return job.id, recording_ids
 
-            recording_repo.update_status(recording.id, RecordingStatus.COMPLETED)
-            recording_ids.append(recording.id)
+
+def analyze_wav_files_in_pool(
+    inference_pool: InferencePool,
+    wav_files: Iterable[Path],
+    lat: float,
+    lon: float,
+    db: Session,
+    force: bool = False,
+) -> Tuple[List[DetectionResponse], List[int], List[str]]:
+    """
+    Run BirdNET on many WAV files in the inference process pool.
+
+    Files are submitted as they arrive (e.g. while a ZIP is still being
+    extracted), with at most two per worker in flight. Results are consumed in
+    submission order so detections and status updates are written by this
+    (parent) process in the same order as the serial path, and each file is
+    deleted once its results are stored. Files identical to an earlier upload
+    reuse its detections and never reach the pool, unless `force` is set.
+
+    Returns:
+        The detections created, the IDs of the recordings that completed and
+        the names of the files that were cache hits.
+    """
+    recording_repo = RecordingRepository(db)
+    detections: List[DetectionResponse] = []
+    recording_ids: List[int] = []
+    cache_hits: List[str] = []
+    in_flight = deque()
+    max_in_flight = 2 * inference_pool.num_workers
+
+    def collect(wav_file, recording, content_hash, future):
+        recording_id = recording.id
+        try:
+            if future is None:
+                results = reuse_cached_detections(wav_file, recording_id, content_hash, db, commit=False)
+                if results is None:
+                    raise RuntimeError("Cached analysis is no longer available")
+            else:
+                raw_detections, skipped_windows = future.result()
+                results = save_birdnet_detections(
+                    wav_file, recording, raw_detections, db, content_hash,
+                    skipped_windows=skipped_windows, commit=False,
+                )
+
+            # Detections, analysis parameters and status go out in one commit
+            recording_repo.update_status(recording_id, RecordingStatus.COMPLETED)
+            detections.extend(results)
+            recording_ids.append(recording_id)
+            if future is None:
+                cache_hits.append(wav_file.name)
 
         except Exception as e:
-            logger.exception(f"Failed to process {tmp_path.name}")
-            if recording is not None:
-                recording_repo.update_status(recording.id, RecordingStatus.FAILED, error_message=str(e))
+            logger.exception(f"Failed to process {wav_file.name}")
+            db.rollback()
+            recording_repo.update_status(recording_id, RecordingStatus.FAILED, error_message=str(e))
         finally:
-            tmp_path.unlink(missing_ok=True)
+            wav_file.unlink(missing_ok=True)
 
-    else:
-        raise HTTPException(status_code=400, detail="Only .WAV and .ZIP files are supported")
+    for wav_file in wav_files:
+        try:
+            recording_datetime = get_recording_datetime(wav_file.name)
+            recording = recording_repo.create(
+                wav_file.name, lat, lon, recording_datetime, status=RecordingStatus.PROCESSING
+            )
+        except Exception:
+            logger.exception(f"Failed to process {wav_file.name}")
+            wav_file.unlink(missing_ok=True)
+            continue
 
-    return {
-        "recording_ids": recording_ids,
-        "status": "completed",
-        "detections": detections,
-    }
\ No newline at end of file
+        content_hash = file_sha256(wav_file)
+
+        # Only cache misses are sent to the pool; hits are copied when collected
+        future = None
+        if force or find_cached_analysis(recording, content_hash, db) is None:
+            future = inference_pool.submit(
+                wav_file, lat, lon, recording_datetime.date(), scores_for=recording.id if STORE_SCORES else None
+            )
+        in_flight.append((wav_file, recording, content_hash, future))
+
+        # Wait for the oldest file before accepting more, to bound disk usage
+        while len(in_flight) >= max_in_flight:
+            collect(*in_flight.popleft())
+
+    while in_flight:
+        collect(*in_flight.popleft())
+
+    return detections, recording_ids, cache_hits
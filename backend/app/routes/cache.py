@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from backend.services.grid_cache import grid_cache
+from backend.services.query_cache import query_cache
+from backend.services.species_cache import species_cache
+
+
+router = APIRouter(tags=["cache"])
+
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """
+    Report hit/miss counters of the in-process caches.
+    Counters cover this API process and its job workers; inference pool
+    processes keep their own caches.
+    """
+    return {
+        "species_lists": species_cache.stats(),
+        "grid_tiles": grid_cache.stats(),
+        "detection_queries": query_cache.stats(),
+    }
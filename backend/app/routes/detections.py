@@ -1,30 +1,222 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Tuple, Union
 from datetime import datetime
 from backend.app.schemas import detection as detection_schema
-from backend.app.repositories.detection import DetectionRepository
-from database.config import get_db
+from backend.app.repositories.data_version import DETECTIONS, AsyncDataVersionRepository
+from backend.app.repositories.detection import AsyncDetectionRepository, DetectionRepository
+from backend.app.utils.columnar import to_columnar
+from backend.app.utils.etag import etag_matches, weak_etag
+from backend.app.utils.export import EXPORT_FORMATS
+from backend.app.utils.fast_json import dumps, rows_to_dicts
+from backend.app.config import GRID_MAX_TILES
+from backend.app.utils.geo import GeoArea, decode_bounds, zoom_precision
+from backend.app.utils.pagination import InvalidCursorError
+from backend.services.grid_cache import grid_cache
+from backend.services.query_cache import cache_key, query_cache
+from database.config import AsyncSessionLocal, get_async_db, get_db
 
 
 router = APIRouter(tags=["detections"])
 
+# Fields of a DetectionResponse, in the order they are serialized
+RESPONSE_FIELDS = list(detection_schema.DetectionResponse.model_fields)
+
+# Grid results are cached per tile two geohash characters shorter than the bins (32 x 32 bins)
+GRID_TILE_DEPTH = 2
+
+
+def location_area(
+    bbox: Optional[str] = Query(None, description="Recording location within 'min_lon,min_lat,max_lon,max_lat'"),
+    near: Optional[str] = Query(None, description="Recording location within radius_km of 'lat,lon'"),
+    radius_km: Optional[float] = Query(None, description="Search radius around `near`, in kilometers"),
+) -> Optional[GeoArea]:
+    """
+    Parse the optional bbox or near/radius_km location filter.
+    """
+    if bbox and near:
+        raise HTTPException(status_code=400, detail="Use either bbox or near, not both")
+    if (near is None) != (radius_km is None):
+        raise HTTPException(status_code=400, detail="near and radius_km must be given together")
+    try:
+        if bbox:
+            return GeoArea.from_bbox(bbox)
+        if near:
+            return GeoArea.around(near, radius_km)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return None
+
+
+@router.get("/detections/export", response_class=StreamingResponse)
+async def export_detections(
+    format: Literal["ndjson", "csv", "msgpack"] = Query("ndjson", description="Output format"),
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    area: Optional[GeoArea] = Depends(location_area),
+):
+    """
+    Stream every detection matching the filters, in ID order.
+
+    Rows are read from a server-side cursor and written out batch by batch,
+    so memory use stays flat however large the export is. `msgpack` is a
+    columnar format: one map of column name to values per batch.
+    """
+    encode, media_type, extension = EXPORT_FORMATS[format]
+
+    async def body():
+        # The session must outlive the endpoint, so the stream owns it
+        async with AsyncSessionLocal() as db:
+            batches = AsyncDetectionRepository(db).stream_detections(species, start_date, end_date, area)
+            async for chunk in encode(batches):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="detections.{extension}"'},
+    )
+
+
+@router.get("/detections/grid", response_model=detection_schema.DetectionGrid)
+async def get_detection_grid(
+    z: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    bbox: str = Query(..., description="Visible area as 'min_lon,min_lat,max_lon,max_lat'"),
+    species: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Count detections per geohash cell over a map view.
+
+    The cell size follows the zoom level. Counts are computed in SQL from the
+    recordings.geohash prefix and cached per (zoom, tile, filters), so panning
+    and zooming back only queries the tiles not seen yet. Saving or deleting
+    detections drops the cached tiles around the affected recordings.
+    """
+    try:
+        area = GeoArea.from_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    precision = zoom_precision(z)
+    tile_precision = max(0, precision - GRID_TILE_DEPTH)
+    if area.count_cells_at(tile_precision) > GRID_MAX_TILES:
+        raise HTTPException(status_code=400, detail="bbox is too large for this zoom level")
+
+    filters = (species, start_date, end_date)
+    # Taken before reading, so tiles computed across a concurrent write are not cached
+    generation = grid_cache.generation()
+    bins = []
+    missed = []
+    for tile in area.cells_at(tile_precision):
+        cached = grid_cache.get((tile, precision, filters))
+        if cached is None:
+            missed.append(tile)
+        else:
+            bins.extend(cached)
+
+    if missed:
+        rows = await AsyncDetectionRepository(db).grid_counts(missed, precision, species, start_date, end_date)
+        tile_bins = {tile: [] for tile in missed}
+        for row in rows:
+            tile_bins[row.geohash[:tile_precision]].append(row._asdict())
+        for tile, found in tile_bins.items():
+            grid_cache.put((tile, precision, filters), found, generation)
+            bins.extend(found)
+
+    cells = []
+    for cell in sorted(bins, key=lambda b: b["geohash"]):
+        bounds = decode_bounds(cell["geohash"])
+        # Tiles reach past the bbox; keep only the cells in view
+        if area.intersects(*bounds):
+            cells.append(detection_schema.GridCell(
+                **cell,
+                min_lat=bounds[0],
+                min_lon=bounds[1],
+                max_lat=bounds[2],
+                max_lon=bounds[3],
+            ))
+    return detection_schema.DetectionGrid(zoom=z, precision=precision, cells=cells)
+
+
+@router.get("/detections/changes", response_model=detection_schema.DetectionChanges)
+async def get_detection_changes(
+    since: int = Query(0, ge=0, description="`cursor` of the previous page; 0 for the full history"),
+    limit: int = Query(1000, ge=1, le=10000, description="Approximate number of changes per page"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Return detections and recordings inserted, changed or deleted since a cursor.
+
+    Every write transaction gets a change sequence number, stored on the rows
+    it inserts and on tombstones for the rows it deletes, so a sync is one
+    indexed range scan per table. Keep the returned `cursor` and pass it as
+    `since` on the next call; repeat while `has_more` is true.
+    """
+    return await AsyncDetectionRepository(db).get_changes(since, limit)
+
+
+async def cached_detections_page(db: AsyncSession, version: int, **params) -> Tuple[List[dict], Optional[str]]:
+    """
+    Return a page of detection rows as plain dicts, from the query cache when possible.
+
+    Pages are filed under the detections data version read for the ETag, so a
+    cached page always belongs to the version the ETag names, even when the
+    change was committed by another process.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort order.
+    """
+    # Species names match case-insensitively
+    species = params["species"]
+    key = cache_key("detections", **{**params, "species": species.lower() if species else None})
+    page = await query_cache.get(key, version)
+    if page is None:
+        rows, next_cursor = await AsyncDetectionRepository(db).get_detection_rows_page(**params)
+        page = ([row._asdict() for row in rows], next_cursor)
+        await query_cache.put(key, page, version)
+    return page
+
 
 @router.get("/detections/{detection_id}", response_model=detection_schema.Detection)
-def get_detection(detection_id: int, db: Session = Depends(get_db)):
+async def get_detection(
+    detection_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(None),
+):
     """
     Retrieve a single detection by its unique ID.
+
+    Answers 304 when If-None-Match holds the current ETag of this detection.
     """
-    repo = DetectionRepository(db)
-    detection = repo.get_detection(detection_id)
+    repo = AsyncDetectionRepository(db)
+    detection = await repo.get_detection(detection_id)
     if not detection:
+        # Checked first, so neither '*' nor a stale ETag turns a missing detection into a 304
         raise HTTPException(status_code=404, detail="Detection not found")
+
+    # Named after the detection, so the ETag of the list or of another detection never validates it
+    version = await AsyncDataVersionRepository(db).get(DETECTIONS)
+    etag = weak_etag(f"detection-{detection_id}", version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return detection
 
 
-@router.get("/detections", response_model=List[detection_schema.DetectionResponse])
-def get_detections(
-    db: Session = Depends(get_db),
+@router.get(
+    "/detections",
+    response_model=Union[List[detection_schema.DetectionResponse], detection_schema.DetectionColumnarResponse],
+)
+async def get_detections(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
     species: Optional[str] = None,
@@ -32,35 +224,99 @@ def get_detections(
     end_date: Optional[datetime] = None,
     sort_by: Optional[Literal["detection_time", "confidence"]] = Query(None),
     sort_order: Literal["asc", "desc"] = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fast: bool = Query(False, description="Serialize rows directly to JSON, skipping per-row model validation"),
+    format: Literal["rows", "columnar"] = Query("rows", description="'columnar' returns one array per field"),
+    area: Optional[GeoArea] = Depends(location_area),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Retrieve a list of detections with optional filters and sorting.
+
+    When more results follow, the X-Next-Cursor response header holds a cursor
+    for the next page. Pass it back as `cursor` with the same filters and sort
+    order; unlike `skip`, it stays fast however deep the page is.
+
+    `bbox` or `near` + `radius_km` keep detections from recordings in an
+    area, looked up through the geohash index on recordings.
+
+    With `fast=true` the same JSON is written straight from the database rows
+    instead of building and re-validating a DetectionResponse per row, which
+    matters for large pages.
+
+    With `format=columnar` the page comes back as one array per field, and
+    species and recording metadata are listed once and referenced by index
+    (see DetectionColumnarResponse). It is always serialized the fast way.
+
+    Pages are cached for a few seconds per normalized set of parameters and
+    detections data version, so a change by any API process is never served
+    from an older page.
+
+    Every response carries an ETag that changes with the detections data
+    version. Send it back in If-None-Match to get a 304 without the page
+    being queried again.
     """
-    repo = DetectionRepository(db)
-    return repo.get_detections(
-        skip=skip,
-        limit=limit,
-        species=species,
-        start_date=start_date,
-        end_date=end_date,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
+
+    # Read before the page, so a concurrent write can only make the ETag older than the data
+    version = await AsyncDataVersionRepository(db).get(DETECTIONS)
+    etag = weak_etag(DETECTIONS, version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        rows, next_cursor = await cached_detections_page(
+            db,
+            version,
+            limit=limit,
+            species=species,
+            start_date=start_date,
+            end_date=end_date,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            skip=skip,
+            area=area,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if format == "columnar":
+        return Response(content=dumps(to_columnar(rows)), media_type="application/json", headers=headers)
+    if fast:
+        # A returned Response bypasses response_model validation entirely
+        content = dumps(rows_to_dicts(rows, RESPONSE_FIELDS))
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
+    return [detection_schema.DetectionResponse(**row) for row in rows]
 
 
 @router.post(
-    "/detections", response_model=List[detection_schema.Detection], status_code=201
+    "/detections",
+    response_model=Union[List[detection_schema.Detection], detection_schema.DetectionBulkCreateResponse],
+    status_code=201,
 )
 def create_detections(
-    detections: List[detection_schema.DetectionCreate], db: Session = Depends(get_db)
+    detections: List[detection_schema.DetectionCreate],
+    bulk: bool = Query(False, description="Insert in batches and return only the generated IDs"),
+    db: Session = Depends(get_db),
 ):
     """
     Create one or more detection records in the database.
 
     Accepts a list of validated DetectionCreate objects and inserts them.
-    Returns the inserted detections with their generated ID and created_at fields.
+    Returns the inserted detections with their generated ID and created_at fields,
+    or with `bulk=true` (recommended for large payloads) only their count and IDs.
     """
     repo = DetectionRepository(db)
+    if bulk:
+        ids = repo.bulk_save_detections(detections)
+        return detection_schema.DetectionBulkCreateResponse(count=len(ids), ids=ids)
     return repo.save_detections(detections)
 
 
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from backend.app.schemas import job as job_schema
+from backend.app.repositories.job import JobRepository
+from backend.app.models.recording import RecordingStatus
+from database.config import get_db
+
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/jobs/{job_id}", response_model=job_schema.JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Report the progress of an asynchronous analysis job.
+    Poll this endpoint after `POST /analyze` with `mode=job` until the status
+    is 'completed' or 'failed'.
+    """
+    repo = JobRepository(db)
+    job = repo.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    counts = repo.get_status_counts(job_id)
+    return job_schema.JobResponse(
+        id=job.id,
+        file_name=job.file_name,
+        status=repo.derive_status(counts),
+        created_at=job.created_at,
+        total=sum(counts.values()),
+        pending=counts[RecordingStatus.PENDING],
+        processing=counts[RecordingStatus.PROCESSING],
+        completed=counts[RecordingStatus.COMPLETED],
+        failed=counts[RecordingStatus.FAILED],
+        cache_hits=repo.count_cache_hits(job_id),
+        recording_ids=repo.get_recording_ids(job_id),
+    )
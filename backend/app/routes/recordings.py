@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List
+from backend.app.config import ANALYSIS_RETRY_AFTER
+from backend.app.schemas import recording as recording_schema
+from backend.app.schemas.detection import DetectionResponse
+from backend.app.repositories.recording import AsyncRecordingRepository, RecordingRepository
+from backend.services.audio_analyzer import rethreshold_recording
+from database.config import get_async_db, get_db
+
+
+router = APIRouter(tags=["recordings"])
+
+
+@router.get("/recordings/{recording_id}", response_model=recording_schema.Recording)
+async def get_recording(recording_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a single recording and its processing status by its unique ID.
+    """
+    repo = AsyncRecordingRepository(db)
+    recording = await repo.get(recording_id)
+    if not recording:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return recording
+
+
+@router.post("/recordings/{recording_id}/rethreshold", response_model=List[DetectionResponse])
+async def rethreshold(
+    recording_id: int,
+    params: recording_schema.RethresholdRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Replace a recording's detections using the window scores stored at ingest.
+    BirdNET is not run again, so trying another threshold takes seconds.
+    """
+    # The species lists come from the BirdNET models, which only the analysis threads may use
+    analysis_executor = request.app.state.analysis_executor
+    if not analysis_executor.try_admit():
+        raise HTTPException(
+            status_code=429,
+            detail="Too many analyses in progress. Try again later.",
+            headers={"Retry-After": str(ANALYSIS_RETRY_AFTER)},
+        )
+
+    try:
+        if not await analysis_executor.run(RecordingRepository(db).get, recording_id):
+            raise HTTPException(status_code=404, detail="Recording not found")
+        return await analysis_executor.run_with_analyzer(
+            rethreshold_recording, recording_id, db=db,
+            min_conf=params.min_conf, location_filter=params.location_filter,
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="No stored scores for this recording; analyze it again")
+    finally:
+        analysis_executor.release()
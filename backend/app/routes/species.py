@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from backend.app.schemas import species as species_schema
+from backend.app.repositories.species import SpeciesRepository
+from database.config import get_db
+
+
+router = APIRouter(tags=["species"])
+
+
+@router.get("/species", response_model=List[species_schema.Species])
+def search_species(
+    q: Optional[str] = Query(None, description="Case-insensitive part of the common or scientific name"),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Look up detected species by name, e.g. to autocomplete the detections species filter.
+    """
+    repo = SpeciesRepository(db)
+    return repo.search(q, limit)
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+from backend.app.schemas import stats as stats_schema
+from backend.app.repositories.stats import StatsRepository
+from database.config import get_db
+
+
+router = APIRouter(tags=["stats"])
+
+
+@router.get("/stats/species", response_model=List[stats_schema.SpeciesStats])
+def get_species_stats(
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lat: Optional[float] = Query(None, description="Site latitude (use with lon)"),
+    lon: Optional[float] = Query(None, description="Site longitude (use with lat)"),
+    species: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000),
+):
+    """
+    Detection totals per species, most detected first.
+    Served from the daily rollup, so it covers every detection regardless of volume.
+    """
+    repo = StatsRepository(db)
+    return repo.species_totals(start_date, end_date, lat, lon, species, limit)
+
+
+@router.get("/stats/daily", response_model=List[stats_schema.DailySpeciesStats])
+def get_daily_stats(
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lat: Optional[float] = Query(None, description="Site latitude (use with lon)"),
+    lon: Optional[float] = Query(None, description="Site longitude (use with lat)"),
+    species: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=100000),
+):
+    """
+    Detections per day, species and site, oldest day first.
+    """
+    repo = StatsRepository(db)
+    return repo.daily_counts(start_date, end_date, lat, lon, species, limit)
+
+
+@router.get("/stats/sites", response_model=List[stats_schema.SiteStats])
+def get_site_stats(
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Detection and species totals per site (recording location).
+    """
+    repo = StatsRepository(db)
+    return repo.site_totals(start_date, end_date)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from backend.app.schemas.recording import RecordingChange
 
 
 class DetectionCreate(BaseModel):
@@ -36,6 +37,14 @@ class Detection(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class DetectionBulkCreateResponse(BaseModel):
+    """
+    Schema returned when detections are inserted through the bulk path.
+    Only the generated IDs are sent back, in the order the detections were given.
+    """
+    count: int = Field(..., description="Number of detections inserted")
+    ids: List[int] = Field(..., description="Generated IDs of the inserted detections")
+
 class DetectionResponse(BaseModel):
     """
     Schema for public-facing detection responses.
@@ -52,4 +61,87 @@ class DetectionResponse(BaseModel):
     lat: float = Field(..., description="Latitude of the recording location")
     lon: float = Field(..., description="Longitude of the recording location")
 
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+class DetectionSpeciesEntry(BaseModel):
+    """
+    One species in the dictionary of a columnar detections response.
+    """
+    species: str = Field(..., description="Common name of the bird species")
+    scientific_name: str = Field(..., description="Scientific name of the species")
+
+class DetectionRecordingEntry(BaseModel):
+    """
+    One recording in the dictionary of a columnar detections response.
+    """
+    file_name: str = Field(..., description="Name of the recording file")
+    recording_datetime: datetime = Field(..., description="Datetime the recording was made")
+    lat: float = Field(..., description="Latitude of the recording location")
+    lon: float = Field(..., description="Longitude of the recording location")
+
+class DetectionColumnarResponse(BaseModel):
+    """
+    Schema for detections returned with format=columnar.
+    Holds one array per field, with species and recording metadata stored once
+    in dictionaries and referenced by index from every detection.
+    """
+    detection_time: List[datetime] = Field(..., description="Datetime of each species call")
+    confidence: List[float] = Field(..., description="Model confidence score of each detection")
+    start_sec: List[float] = Field(..., description="Start time of each detected sound (in seconds)")
+    end_sec: List[float] = Field(..., description="End time of each detected sound (in seconds)")
+    species_index: List[int] = Field(..., description="Index into `species` for each detection")
+    recording_index: List[int] = Field(..., description="Index into `recordings` for each detection")
+    species: List[DetectionSpeciesEntry] = Field(..., description="Distinct species of this page")
+    recordings: List[DetectionRecordingEntry] = Field(..., description="Distinct recordings of this page")
+
+class GridCell(BaseModel):
+    """
+    One geohash cell of a detection grid and the detections recorded inside it.
+    """
+    geohash: str = Field(..., description="Geohash of the cell")
+    min_lat: float = Field(..., description="Southern edge of the cell")
+    min_lon: float = Field(..., description="Western edge of the cell")
+    max_lat: float = Field(..., description="Northern edge of the cell")
+    max_lon: float = Field(..., description="Eastern edge of the cell")
+    lat: float = Field(..., description="Mean latitude of the cell's detections")
+    lon: float = Field(..., description="Mean longitude of the cell's detections")
+    detection_count: int = Field(..., description="Number of detections in the cell")
+    species_count: int = Field(..., description="Number of distinct species detected in the cell")
+
+class DetectionGrid(BaseModel):
+    """
+    Schema for detections binned into geohash cells for a map view.
+    Only cells holding at least one detection are listed.
+    """
+    zoom: int = Field(..., description="Map zoom level the grid was built for")
+    precision: int = Field(..., description="Geohash length of the cells")
+    cells: List[GridCell] = Field(..., description="Non-empty cells overlapping the bbox")
+
+class DetectionChange(DetectionResponse):
+    """
+    A detection inserted since a change feed cursor.
+    """
+    id: int = Field(..., description="Unique ID of the detection")
+    recording_id: int = Field(..., description="ID of the recording the detection belongs to")
+    change_seq: int = Field(..., description="Change sequence of the transaction that inserted the detection")
+
+class TombstoneEntry(BaseModel):
+    """
+    A detection or recording deleted since a change feed cursor.
+    """
+    table_name: str = Field(..., description="'detections' or 'recordings'")
+    row_id: int = Field(..., description="ID of the deleted row")
+    change_seq: int = Field(..., description="Change sequence of the deleting transaction")
+
+    model_config = {"from_attributes": True}
+
+class DetectionChanges(BaseModel):
+    """
+    Schema for one page of the detections change feed.
+    Holds every change with a change_seq after the request's `since` and up to
+    `cursor`; pages always end on a transaction boundary.
+    """
+    detections: List[DetectionChange] = Field(..., description="Detections inserted, in change order")
+    recordings: List[RecordingChange] = Field(..., description="Recordings inserted or changed, in change order")
+    deleted: List[TombstoneEntry] = Field(..., description="Detections and recordings deleted, in change order")
+    cursor: int = Field(..., description="Pass as `since` to get the changes after this page")
+    has_more: bool = Field(..., description="True if more changes are already waiting after `cursor`")
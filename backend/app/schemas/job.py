@@ -0,0 +1,24 @@
+# backend/app/schemas/job.py
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+from backend.app.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    """
+    Progress report for an asynchronous analysis job.
+    Counts are taken from the recordings queued by the job's upload.
+    """
+    id: int = Field(..., description="Unique ID of the job (generated by database)")
+    file_name: str = Field(..., description="Name of the uploaded .wav or .zip file")
+    status: JobStatus = Field(..., description="Overall status derived from the job's recordings")
+    created_at: Optional[datetime] = Field(None, description="Timestamp when the upload was accepted")
+    total: int = Field(..., description="Number of recordings queued by the job")
+    pending: int = Field(..., description="Recordings waiting for a worker")
+    processing: int = Field(..., description="Recordings currently being analyzed")
+    completed: int = Field(..., description="Recordings analyzed successfully")
+    failed: int = Field(..., description="Recordings that failed analysis")
+    cache_hits: int = Field(0, description="Recordings that reused detections of an identical earlier upload")
+    recording_ids: List[int] = Field(default_factory=list, description="IDs of the recordings queued by the job")
@@ -28,6 +28,22 @@ class Recording(BaseModel):
     status: RecordingStatus = Field(..., description="Current processing status of the recording")
     completed_at: Optional[datetime] = Field(None, description="Timestamp when processing completed (if applicable)")
     error_message: Optional[str] = Field(None, description="Error message if processing failed")
-    
+    job_id: Optional[int] = Field(None, description="ID of the upload job that queued this recording (if any)")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the analyzed WAV content")
+    reused_from_id: Optional[int] = Field(None, description="Recording whose detections were reused instead of re-running BirdNET")
+    skipped_windows: Optional[int] = Field(None, description="3-second windows skipped as silence before running BirdNET")
+
     model_config = {"from_attributes": True}
-    
\ No newline at end of file
+    
+class RethresholdRequest(BaseModel):
+    """
+    Parameters for regenerating a recording's detections from its stored window scores.
+    """
+    min_conf: float = Field(..., gt=0.0, lt=1.0, description="New minimum confidence for a detection")
+    location_filter: bool = Field(True, description="Keep only species expected at the recording's location and week")
+
+class RecordingChange(Recording):
+    """
+    A recording inserted or changed since a change feed cursor.
+    """
+    change_seq: int = Field(..., description="Change sequence of the transaction that last wrote the recording")
@@ -0,0 +1,14 @@
+# backend/app/schemas/species.py
+
+from pydantic import BaseModel, Field
+
+
+class Species(BaseModel):
+    """
+    Schema for a species in the normalized species table.
+    """
+    id: int = Field(..., description="Unique ID of the species (generated by database)")
+    common_name: str = Field(..., description="Common name of the bird species (e.g., Rufous Hummingbird)")
+    scientific_name: str = Field(..., description="Scientific (Latin) name of the species (e.g., Selasphorus rufus)")
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,44 @@
+# backend/app/schemas/stats.py
+
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+
+
+class SpeciesStats(BaseModel):
+    """
+    Detection totals of one species over the requested period.
+    """
+    species: str = Field(..., description="Common name of the bird species")
+    scientific_name: str = Field(..., description="Scientific name of the species")
+    detection_count: int = Field(..., description="Number of detections")
+    days_detected: int = Field(..., description="Number of distinct days with at least one detection")
+    max_confidence: float = Field(..., description="Highest confidence score")
+    mean_confidence: float = Field(..., description="Mean confidence score")
+    first_detection: datetime = Field(..., description="Earliest detection time")
+    last_detection: datetime = Field(..., description="Latest detection time")
+
+class DailySpeciesStats(BaseModel):
+    """
+    Detections of one species on one day at one site (recording location).
+    """
+    day: date = Field(..., description="Day of the detections")
+    species: str = Field(..., description="Common name of the bird species")
+    scientific_name: str = Field(..., description="Scientific name of the species")
+    lat: float = Field(..., description="Latitude of the site")
+    lon: float = Field(..., description="Longitude of the site")
+    detection_count: int = Field(..., description="Number of detections")
+    max_confidence: float = Field(..., description="Highest confidence score")
+    mean_confidence: float = Field(..., description="Mean confidence score")
+    first_detection: datetime = Field(..., description="Earliest detection time that day")
+    last_detection: datetime = Field(..., description="Latest detection time that day")
+
+class SiteStats(BaseModel):
+    """
+    Detection totals of one site (recording location).
+    """
+    lat: float = Field(..., description="Latitude of the site")
+    lon: float = Field(..., description="Longitude of the site")
+    detection_count: int = Field(..., description="Number of detections")
+    species_count: int = Field(..., description="Number of distinct species detected")
+    first_day: date = Field(..., description="First day with a detection")
+    last_day: date = Field(..., description="Last day with a detection")
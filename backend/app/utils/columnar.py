@@ -0,0 +1,40 @@
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+SPECIES_FIELDS = ("species", "scientific_name")
+RECORDING_FIELDS = ("file_name", "recording_datetime", "lat", "lon")
+VALUE_FIELDS = ("detection_time", "confidence", "start_sec", "end_sec")
+
+
+def to_columnar(rows: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Transpose detection rows into per-field arrays, dictionary-encoding the
+    species and recording metadata that repeat across rows.
+
+    Args:
+        rows: Rows (as mappings) with the DetectionResponse fields.
+
+    Returns:
+        A dict shaped like DetectionColumnarResponse.
+    """
+    columns: Dict[str, List[Any]] = {field: [] for field in VALUE_FIELDS}
+    species_index: List[int] = []
+    recording_index: List[int] = []
+    # Dictionary key -> position, in order of first appearance
+    species: Dict[Tuple, int] = {}
+    recordings: Dict[Tuple, int] = {}
+
+    for mapping in rows:
+        for field in VALUE_FIELDS:
+            columns[field].append(mapping[field])
+        species_key = tuple(mapping[f] for f in SPECIES_FIELDS)
+        species_index.append(species.setdefault(species_key, len(species)))
+        recording_key = tuple(mapping[f] for f in RECORDING_FIELDS)
+        recording_index.append(recordings.setdefault(recording_key, len(recordings)))
+
+    return {
+        **columns,
+        "species_index": species_index,
+        "recording_index": recording_index,
+        "species": [dict(zip(SPECIES_FIELDS, key)) for key in species],
+        "recordings": [dict(zip(RECORDING_FIELDS, key)) for key in recordings],
+    }
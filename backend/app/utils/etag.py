@@ -0,0 +1,27 @@
+from typing import Optional
+
+
+def weak_etag(name: str, version: int) -> str:
+    """
+    Build the weak ETag of a dataset version.
+
+    Weak, because the same version is served both gzip-compressed and plain.
+    """
+    return f'W/"{name}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, using weak comparison.
+
+    Args:
+        if_none_match: Header value: '*' or a comma-separated list of ETags.
+        etag: Current ETag of the resource.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison ignores the W/ prefix on either side
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
@@ -0,0 +1,86 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Sequence
+
+import msgpack
+from sqlalchemy.engine import Row
+
+from backend.app.utils.fast_json import dumps
+
+# Columns of an export, in order (the fields of DetectionResponse)
+EXPORT_COLUMNS = [
+    "id",
+    "detection_time",
+    "species",
+    "scientific_name",
+    "confidence",
+    "start_sec",
+    "end_sec",
+    "file_name",
+    "recording_datetime",
+    "lat",
+    "lon",
+]
+
+RowBatches = AsyncIterator[Sequence[Row]]
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def ndjson_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as newline-delimited JSON, one object per detection.
+    """
+    async for batch in batches:
+        yield b"".join(dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in batch)
+
+
+async def csv_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as CSV with a header line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for batch in batches:
+        writer.writerows([map(_isoformat, row) for row in batch])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _timestamp(value: datetime) -> msgpack.Timestamp:
+    # Naive values (SQLite) are stored as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return msgpack.Timestamp.from_datetime(value)
+
+
+async def msgpack_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as a stream of columnar MessagePack maps.
+
+    Each batch becomes one map from column name to the list of that column's
+    values, with times as MessagePack timestamps. Read it back with
+    `msgpack.Unpacker(file, timestamp=3)` and iterate over the maps.
+    """
+    packer = msgpack.Packer()
+    async for batch in batches:
+        columns = {name: [row[i] for row in batch] for i, name in enumerate(EXPORT_COLUMNS)}
+        for name in ("detection_time", "recording_datetime"):
+            columns[name] = [_timestamp(value) for value in columns[name]]
+        yield packer.pack(columns)
+
+
+# format -> (encoder, media type, file extension)
+EXPORT_FORMATS: Dict[str, tuple[Callable[[RowBatches], AsyncIterator[bytes]], str, str]] = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson", "ndjson"),
+    "csv": (csv_chunks, "text/csv", "csv"),
+    "msgpack": (msgpack_chunks, "application/x-msgpack", "msgpack"),
+}
@@ -1,7 +1,12 @@
 import re
+import hashlib
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Tuple
 from fastapi import UploadFile, HTTPException
 
+from backend.app.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE
+
 def validate_upload(file: UploadFile) -> str:
     if not file.filename:
         raise HTTPException(status_code=400, detail="Uploaded file must have a filename")
@@ -23,6 +28,71 @@ def validate_upload(file: UploadFile) -> str:
 
     return filename
 
+async def save_upload(
+    file: UploadFile,
+    dest: Path,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    Stream an uploaded file to disk in fixed-size chunks, hashing it on the way.
+
+    Only one chunk is held in memory at a time, so peak memory stays the same
+    whatever the size of the upload.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        dest (Path): Where to write the file.
+        max_bytes (int): Largest accepted upload size.
+        chunk_size (int): Number of bytes read and written per step.
+
+    Returns:
+        Tuple[int, str]: The number of bytes written and their SHA-256 hex digest.
+
+    Raises:
+        HTTPException: 413 if the upload is larger than max_bytes.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Uploaded file exceeds the maximum size of {max_bytes // (1024 * 1024)} MB"
+    )
+    # Starlette already knows the size of a fully received upload
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    checksum = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large
+                checksum.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+    return size, checksum.hexdigest()
+
+def file_sha256(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 of a file on disk without loading it into memory.
+
+    Args:
+        path (Path): File to hash.
+        chunk_size (int): Number of bytes read per step.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    checksum = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
 def get_recording_datetime(filename:str) -> datetime:
     """
     Extract the recording date and time from the filename.
@@ -0,0 +1,194 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Geohash alphabet (base32 without a, i, l, o)
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Characters stored per recording (12 is a few centimeters)
+GEOHASH_PRECISION = 12
+
+# Most geohash cells a bbox is covered with; more cells means a tighter cover but a longer query
+MAX_COVER_CELLS = 32
+
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON = 111.320
+
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a point as a geohash.
+
+    Args:
+        lat (float): Latitude in degrees.
+        lon (float): Longitude in degrees.
+        precision (int): Number of characters.
+
+    Returns:
+        str: The geohash of the cell containing the point.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        # Bits alternate between longitude (even) and latitude (odd)
+        value, bounds = (lon, lon_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Return the (height, width) in degrees of a geohash cell of a given length.
+    """
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = (5 * precision) // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+@dataclass(frozen=True)
+class GeoArea:
+    """
+    A search area: a bounding box, optionally narrowed to a circle inside it.
+    """
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+    center: Optional[Tuple[float, float]] = None
+    radius_km: Optional[float] = None
+
+    @classmethod
+    def from_bbox(cls, bbox: str) -> "GeoArea":
+        """
+        Parse a 'min_lon,min_lat,max_lon,max_lat' bounding box (west, south, east, north).
+
+        Raises:
+            ValueError: If the box is malformed or out of range.
+        """
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+        except ValueError:
+            raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+            raise ValueError("bbox must satisfy -180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90")
+        return cls(min_lat, min_lon, max_lat, max_lon)
+
+    @classmethod
+    def around(cls, near: str, radius_km: float) -> "GeoArea":
+        """
+        Parse a 'lat,lon' point and build the area within radius_km of it.
+
+        Raises:
+            ValueError: If the point is malformed or out of range, or the radius is not positive.
+        """
+        try:
+            lat, lon = (float(v) for v in near.split(","))
+        except ValueError:
+            raise ValueError("near must be 'lat,lon'")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("near must satisfy -90 <= lat <= 90 and -180 <= lon <= 180")
+        if radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        # Near the poles the circle spans every longitude
+        cos_lat = math.cos(math.radians(lat))
+        dlon = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE_LON * cos_lat))
+        return cls(
+            max(-90.0, lat - dlat),
+            max(-180.0, lon - dlon),
+            min(90.0, lat + dlat),
+            min(180.0, lon + dlon),
+            center=(lat, lon),
+            radius_km=radius_km,
+        )
+
+    def cells_at(self, precision: int) -> List[str]:
+        """
+        Return every geohash cell of the given length that overlaps the box, in sorted order.
+        """
+        if precision == 0:
+            return [""]
+        height, width = cell_size(precision)
+        rows = range(int((self.min_lat + 90) // height), int(min(self.max_lat + 90, 180 - 1e-9) // height) + 1)
+        cols = range(int((self.min_lon + 180) // width), int(min(self.max_lon + 180, 360 - 1e-9) // width) + 1)
+        return sorted(
+            encode_geohash((row + 0.5) * height - 90, (col + 0.5) * width - 180, precision)
+            for row in rows
+            for col in cols
+        )
+
+    def count_cells_at(self, precision: int) -> int:
+        """
+        Return how many cells `cells_at` would return, without building them.
+        """
+        if precision == 0:
+            return 1
+        height, width = cell_size(precision)
+        rows = int(min(self.max_lat + 90, 180 - 1e-9) // height) - int((self.min_lat + 90) // height) + 1
+        cols = int(min(self.max_lon + 180, 360 - 1e-9) // width) - int((self.min_lon + 180) // width) + 1
+        return rows * cols
+
+    def covering_cells(self, max_cells: int = MAX_COVER_CELLS) -> List[str]:
+        """
+        Return the longest geohash prefixes whose cells cover the box, at most max_cells of them.
+
+        Every point in the box has a geohash starting with one of the returned
+        prefixes, so the prefixes turn into a few index range scans.
+        """
+        precision = 0
+        while precision < GEOHASH_PRECISION and self.count_cells_at(precision + 1) <= max_cells:
+            precision += 1
+        return self.cells_at(precision)
+
+    def intersects(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> bool:
+        """
+        Check whether another box overlaps this area's bounding box.
+        """
+        return min_lat <= self.max_lat and max_lat >= self.min_lat and min_lon <= self.max_lon and max_lon >= self.min_lon
+
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    Return the (min_lat, min_lon, max_lat, max_lon) bounds of a geohash cell.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if bits >> shift & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def zoom_precision(zoom: int) -> int:
+    """
+    Map a web map zoom level (0-22) to the geohash length used to bin detections.
+
+    Each extra geohash character splits a cell 32 ways, about 2.5 zoom levels,
+    so a 256 px map tile holds roughly 4-8 bins across at every zoom.
+    """
+    return max(1, min(GEOHASH_PRECISION, round((zoom + 2) / 2.5)))
@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort order."""
+
+
+def encode_cursor(sort_by: Optional[str], sort_order: str, value: Any, row_id: int) -> str:
+    """
+    Build an opaque keyset cursor pointing just past a row.
+
+    Args:
+        sort_by (Optional[str]): Column the page is sorted by (None for ID order).
+        sort_order (str): 'asc' or 'desc'.
+        value (Any): The row's sort column value (a datetime or number).
+        row_id (int): The row's ID, which breaks ties between equal sort values.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_by, "o": sort_order, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: Optional[str], sort_order: str) -> Tuple[Any, int]:
+    """
+    Decode a keyset cursor made by `encode_cursor` for the same sort order.
+
+    Args:
+        cursor (str): The cursor sent by the client.
+        sort_by (Optional[str]): Column the requested page is sorted by.
+        sort_order (str): 'asc' or 'desc'.
+
+    Returns:
+        Tuple[Any, int]: The sort column value and the ID of the last row already seen.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded or was made for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort, cursor_order, value, row_id = payload["s"], payload["o"], payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if cursor_sort != sort_by or cursor_order != sort_order:
+        raise InvalidCursorError("Cursor was created for a different sort order")
+
+    if sort_by == "detection_time":
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Invalid cursor") from e
+    return value, row_id
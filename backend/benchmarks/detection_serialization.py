@@ -0,0 +1,101 @@
+"""
+Benchmark GET /api/detections with and without `fast=true`.
+
+Fills a throwaway SQLite database with detections, then times the endpoint
+end to end (query, serialization, HTTP) at several page sizes and checks
+that both modes return the same JSON.
+
+Usage:
+    python backend/benchmarks/detection_serialization.py [--rows 20000] [--repeat 15]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Runs against its own database, never the one configured in .env
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmpdir.name) / 'bench.db'}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app.main import app  # noqa: E402
+from backend.app.models.recording import Recording  # noqa: E402
+from backend.app.repositories.detection import DetectionRepository  # noqa: E402
+from backend.app.schemas.detection import DetectionCreate  # noqa: E402
+from backend.app.utils import fast_json  # noqa: E402
+from database.config import Base, SessionLocal, engine  # noqa: E402
+
+PAGE_SIZES = [100, 1000, 5000, 20000]
+
+
+def populate(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2025, 4, 25, 6, tzinfo=timezone.utc)
+    with SessionLocal() as db:
+        db.add(Recording(
+            id=1,
+            file_name="20250425_060000.wav",
+            lat=48.4284,
+            lon=-123.3656,
+            recording_datetime=start,
+            status="COMPLETED",
+        ))
+        db.commit()
+        DetectionRepository(db).bulk_save_detections([
+            DetectionCreate(
+                recording_id=1,
+                detection_time=start + timedelta(seconds=i),
+                start_sec=float(i % 600),
+                end_sec=float(i % 600) + 3.0,
+                species=f"Species {i % 50}",
+                scientific_name=f"Avis {i % 50}",
+                confidence=0.25 + (i % 75) / 100,
+            )
+            for i in range(rows)
+        ])
+
+
+def median_ms(client: TestClient, params: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get("/api/detections", params=params).raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Detections to generate")
+    parser.add_argument("--repeat", type=int, default=15, help="Requests per measurement")
+    args = parser.parse_args()
+
+    populate(args.rows)
+    client = TestClient(app)
+    encoder = "orjson" if fast_json.orjson is not None else "json (orjson not installed)"
+    print(f"{args.rows} detections, median of {args.repeat} requests, encoder: {encoder}\n")
+    print(f"{'limit':>7} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+
+    for limit in PAGE_SIZES:
+        if limit > args.rows:
+            break
+        params = {"limit": limit, "sort_by": "detection_time"}
+        slow_body = client.get("/api/detections", params=params).json()
+        fast_body = client.get("/api/detections", params={**params, "fast": True}).json()
+        assert slow_body == fast_body, "fast mode returned different JSON"
+
+        slow = median_ms(client, params, args.repeat)
+        fast = median_ms(client, {**params, "fast": True}, args.repeat)
+        print(f"{limit:>7} {slow:>11.1f} {fast:>9.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
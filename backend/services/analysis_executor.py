@@ -0,0 +1,92 @@
+# analysis_executor.py
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from birdnetlib.analyzer import Analyzer
+
+from backend.app.config import ANALYSIS_CONCURRENCY, ANALYSIS_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AnalysisExecutor:
+    """
+    Bounded thread pool that runs blocking analysis work off the event loop.
+
+    At most `max_concurrency` analyses run at once and `max_queued` more may
+    wait for a thread. Requests beyond that are refused up front by `try_admit`,
+    so an ingest burst cannot pile up unbounded work or starve the read API.
+
+    BirdNET's TFLite interpreters are not thread-safe, so each thread owns its
+    own Analyzer, loaded the first time it runs work that needs one (as the job
+    queue's workers do).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ANALYSIS_CONCURRENCY,
+        max_queued: int = ANALYSIS_QUEUE_SIZE,
+        analyzer_factory: Callable[[], Analyzer] = Analyzer,
+    ):
+        """
+        Args:
+            max_concurrency (int): Analyses running at the same time.
+            max_queued (int): Admitted analyses allowed to wait for a free thread.
+            analyzer_factory (Callable): Builds the BirdNET Analyzer each thread owns.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queued = max(0, max_queued)
+        self.analyzer_factory = analyzer_factory
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="analysis")
+        self._slots = threading.BoundedSemaphore(self.max_concurrency + self.max_queued)
+        self._local = threading.local()
+
+    def try_admit(self) -> bool:
+        """
+        Reserve a slot for one analysis without waiting.
+
+        Returns:
+            bool: True if admitted (call `release` when done), False if the queue is full.
+        """
+        admitted = self._slots.acquire(blocking=False)
+        if not admitted:
+            logger.warning("Analysis queue is full, refusing request")
+        return admitted
+
+    def release(self) -> None:
+        """
+        Free a slot reserved by `try_admit`.
+        """
+        self._slots.release()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking function in the pool and wait for it without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def run_with_analyzer(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Like `run`, passing the executing thread's own Analyzer as `analyzer=`.
+        """
+        return await self.run(self._call_with_analyzer, func, args, kwargs)
+
+    def _call_with_analyzer(self, func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        # Load the model lazily so threads that never analyze don't hold one
+        analyzer = getattr(self._local, "analyzer", None)
+        if analyzer is None:
+            analyzer = self._local.analyzer = self.analyzer_factory()
+        return func(*args, analyzer=analyzer, **kwargs)
+
+    def shutdown(self) -> None:
+        """
+        Wait for running analyses to finish and stop the threads.
+        """
+        self._executor.shutdown(wait=True)
@@ -1,27 +1,430 @@
 # audio_analyzer.py
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
+import soundfile as sf
+import soxr
 from birdnetlib import Recording as BirdNETRecording
+from birdnetlib import analyzer as birdnet_analyzer
 from birdnetlib.analyzer import Analyzer
+from birdnetlib.main import SAMPLE_RATE
+from birdnetlib.utils import return_week_48_from_datetime
 
 from sqlalchemy.orm import Session
 
+from backend.app.config import (
+    ANALYSIS_BATCH_SIZE,
+    ANALYSIS_OVERLAP,
+    SILENCE_FILTER,
+    SILENCE_MARGIN_DB,
+    STORE_SCORES,
+    STREAMING_THRESHOLD_BYTES,
+)
+from backend.app.models.recording import Recording, RecordingStatus
 from backend.app.repositories.detection import DetectionRepository
 from backend.app.repositories.recording import RecordingRepository
 from backend.app.schemas.detection import DetectionCreate
 from backend.app.schemas.detection import DetectionResponse
 from backend.app.utils.file_utils import calculate_detection_time
+from backend.services.score_store import ScoreWriter, load_scores
+from backend.services.species_cache import species_cache
 
 logger = logging.getLogger(__name__)
 
+# Minimum BirdNET confidence for a detection to be stored
+MIN_CONFIDENCE = 0.5
+
+# Length of the audio window BirdNET scores, in seconds
+WINDOW_SECONDS = 3.0
+
+# Shortest trailing window still scored (zero-padded to WINDOW_SECONDS), as in birdnetlib
+MIN_WINDOW_SECONDS = 1.5
+
+# Frequency band (Hz) the silence pre-filter measures; wind and hum sit mostly below it
+BIRD_BAND_HZ = (300.0, 12000.0)
+
+# Frame length (samples, ~21 ms at 48 kHz) for the pre-filter's short-time band energy
+ENERGY_FRAME_SAMPLES = 1024
+
+# Windows with an RMS level below this (dBFS) are always treated as silence
+SILENCE_FLOOR_DBFS = -90.0
+
+
+def load_analyzer(num_threads: int = 1) -> Analyzer:
+    """
+    Load a BirdNET Analyzer whose TFLite interpreter uses the given thread count.
+
+    birdnetlib always builds its interpreter with a single thread, so the
+    interpreter is rebuilt when more threads are requested.
+
+    Args:
+        num_threads (int): TFLite threads for model inference.
+
+    Returns:
+        Analyzer: A ready-to-use BirdNETlib Analyzer instance.
+    """
+    analyzer = Analyzer()
+    if num_threads > 1:
+        analyzer.interpreter = birdnet_analyzer.tflite.Interpreter(
+            model_path=analyzer.model_path, num_threads=num_threads
+        )
+        analyzer.interpreter.allocate_tensors()
+    return analyzer
+
+
+def run_birdnet(
+    file_path: Path,
+    analyzer: Analyzer,
+    lat: float,
+    lon: float,
+    recording_date: date,
+    silence_filter: bool = SILENCE_FILTER,
+    scores_for: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Run BirdNET on a single .WAV file without touching the database.
+
+    With the silence pre-filter on, only the windows `find_active_windows`
+    keeps are sent to the model. When scores are stored, or for files of at
+    least STREAMING_THRESHOLD_BYTES, the file is analyzed with `stream_birdnet`
+    so long recordings never have to fit in memory; otherwise it goes through
+    birdnetlib, which loads the whole file.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file.
+        analyzer (Analyzer): BirdNETlib Analyzer instance.
+        lat (float): Latitude used for the location/season species filter.
+        lon (float): Longitude used for the location/season species filter.
+        recording_date (date): Date the recording was made.
+        silence_filter (bool): Skip windows that contain only silence or background noise.
+        scores_for (Optional[int]): Recording ID to store every window's full score vector under.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[int]]: Raw BirdNETlib detection
+        dictionaries, and the number of windows skipped as silence (None if
+        the pre-filter was off).
+    """
+    active = None
+    skipped_windows = None
+    if silence_filter:
+        active = find_active_windows(file_path)
+        skipped_windows = int(np.count_nonzero(~active))
+        logger.info(f"Skipping {skipped_windows} of {len(active)} quiet windows in {file_path.name}")
+
+    if scores_for is not None:
+        with ScoreWriter(scores_for, len(analyzer.labels)) as score_writer:
+            detections = list(
+                stream_birdnet(file_path, analyzer, lat, lon, recording_date, active=active, score_writer=score_writer)
+            )
+        return detections, skipped_windows
+
+    if active is not None and not active.any():
+        return [], skipped_windows
+
+    if active is not None or file_path.stat().st_size >= STREAMING_THRESHOLD_BYTES:
+        return list(stream_birdnet(file_path, analyzer, lat, lon, recording_date, active=active)), skipped_windows
+
+    # birdnetlib filters detections by the analyzer's species list; leaving lat/lon
+    # off the recording stops it from recomputing that list for every file
+    analyzer.custom_species_list = sorted(species_allow_list(analyzer, lat, lon, recording_date))
+    birdnet_recording = BirdNETRecording(
+        analyzer=analyzer,
+        path=str(file_path),
+        date=recording_date,
+        min_conf=MIN_CONFIDENCE,
+        overlap=ANALYSIS_OVERLAP,
+    )
+    birdnet_recording.analyze()
+    return birdnet_recording.detections, None
+
+
+def iter_audio_windows(
+    file_path: Path,
+    overlap: float = ANALYSIS_OVERLAP,
+    block_frames: int = 60 * SAMPLE_RATE,
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Read a WAV file block by block and yield its 3-second analysis windows.
+
+    Audio is mixed down to mono and resampled to BirdNET's 48 kHz with a
+    streaming resampler, so only one block plus one window is held in memory.
+    Windows follow birdnetlib's splitting: a window starts every
+    WINDOW_SECONDS - overlap seconds and a trailing window shorter than
+    MIN_WINDOW_SECONDS is dropped, while longer ones are padded with zeros.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file.
+        overlap (float): Seconds of overlap between consecutive windows.
+        block_frames (int): Frames read from the file per step.
+
+    Yields:
+        Tuple[float, np.ndarray]: Window start time in seconds and its 48 kHz samples.
+
+    Raises:
+        ValueError: If the overlap is negative or leaves windows less than one sample apart.
+    """
+    window = int(WINDOW_SECONDS * SAMPLE_RATE)
+    step = int((WINDOW_SECONDS - overlap) * SAMPLE_RATE)
+    min_length = int(MIN_WINDOW_SECONDS * SAMPLE_RATE)
+    if overlap < 0 or step <= 0:
+        raise ValueError(f"overlap must be at least 0 and below {WINDOW_SECONDS} seconds, got {overlap}")
+
+    with sf.SoundFile(str(file_path)) as wav:
+        resampler = None
+        if wav.samplerate != SAMPLE_RATE:
+            resampler = soxr.ResampleStream(wav.samplerate, SAMPLE_RATE, 1, dtype="float32")
+
+        # `buffer` holds the samples from `next_start` (absolute sample index) onwards
+        buffer = np.zeros(0, dtype=np.float32)
+        next_start = 0
+        end_of_file = False
+
+        while not end_of_file:
+            block = wav.read(block_frames, dtype="float32", always_2d=True)
+            end_of_file = len(block) < block_frames
+            samples = block.mean(axis=1, dtype=np.float32)
+            if resampler is not None:
+                samples = resampler.resample_chunk(samples, last=end_of_file)
+
+            buffer = np.concatenate([buffer, samples])
+            offset = 0
+            while len(buffer) - offset >= window:
+                yield next_start / SAMPLE_RATE, buffer[offset:offset + window]
+                offset += step
+                next_start += step
+            buffer = buffer[offset:]
+
+        while len(buffer) >= min_length:
+            padded = np.zeros(window, dtype=np.float32)
+            padded[:len(buffer)] = buffer[:window]
+            yield next_start / SAMPLE_RATE, padded
+            buffer = buffer[step:]
+            next_start += step
+
+
+def window_levels(windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Measure the loudness of a batch of analysis windows.
+
+    Each window is cut into short frames and the energy of every frame within
+    BIRD_BAND_HZ is computed from its spectrum, so a brief call stands out
+    against the rest of its window instead of being averaged away.
+
+    Args:
+        windows (np.ndarray): Windows of shape (n, 144000) at 48 kHz.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Per window, the RMS level
+        (dBFS), the loudest frame's band energy and the 20th percentile of its
+        frames' band energy (both in dB).
+    """
+    rms_db = 10 * np.log10(np.mean(np.square(windows, dtype=np.float64), axis=1) + 1e-20)
+
+    num_frames = windows.shape[1] // ENERGY_FRAME_SAMPLES
+    frames = windows[:, :num_frames * ENERGY_FRAME_SAMPLES].reshape(len(windows), num_frames, ENERGY_FRAME_SAMPLES)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(ENERGY_FRAME_SAMPLES), axis=2)) ** 2
+
+    freqs = np.fft.rfftfreq(ENERGY_FRAME_SAMPLES, 1 / SAMPLE_RATE)
+    in_band = (freqs >= BIRD_BAND_HZ[0]) & (freqs <= BIRD_BAND_HZ[1])
+    band_db = 10 * np.log10(spectrum[:, :, in_band].sum(axis=2) + 1e-20)
+
+    return rms_db, band_db.max(axis=1), np.percentile(band_db, 20, axis=1)
+
+
+def find_active_windows(
+    file_path: Path,
+    overlap: float = ANALYSIS_OVERLAP,
+    margin_db: float = SILENCE_MARGIN_DB,
+    batch_size: int = 64,
+) -> np.ndarray:
+    """
+    Decide which analysis windows of a recording are worth running BirdNET on.
+
+    The threshold adapts to each recording: its noise floor is the median of the
+    windows' quiet-frame band energy, and a window is kept only if its loudest
+    frame rises at least `margin_db` above that floor. Digital silence (RMS
+    below SILENCE_FLOOR_DBFS) is always skipped. Memory use depends on
+    `batch_size`, and only three numbers are kept per window.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file.
+        overlap (float): Seconds of overlap between consecutive windows.
+        margin_db (float): Decibels above the noise floor a window must reach.
+        batch_size (int): Windows measured per vectorized step.
+
+    Returns:
+        np.ndarray: Boolean mask with one entry per window, True for windows to analyze.
+    """
+    batch = np.zeros((batch_size, int(WINDOW_SECONDS * SAMPLE_RATE)), dtype=np.float32)
+    levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    count = 0
+
+    for _, samples in iter_audio_windows(file_path, overlap):
+        batch[count] = samples
+        count += 1
+        if count == batch_size:
+            levels.append(window_levels(batch))
+            count = 0
+    if count:
+        levels.append(window_levels(batch[:count]))
+
+    if not levels:
+        return np.zeros(0, dtype=bool)
+
+    rms_db, peak_db, quiet_db = (np.concatenate(values) for values in zip(*levels))
+    noise_floor = np.median(quiet_db)
+    return (rms_db > SILENCE_FLOOR_DBFS) & (peak_db >= noise_floor + margin_db)
+
+
+def predict_batch(analyzer: Analyzer, batch: np.ndarray) -> np.ndarray:
+    """
+    Score a batch of 3-second windows with one model invocation.
+
+    Args:
+        analyzer (Analyzer): BirdNETlib Analyzer instance.
+        batch (np.ndarray): Windows of shape (n, 144000).
+
+    Returns:
+        np.ndarray: Sigmoid confidences of shape (n, number of labels).
+    """
+    interpreter = analyzer.interpreter
+    # Reallocating tensors is expensive, so only resize when the batch size changes
+    if interpreter.get_input_details()[0]["shape"][0] != len(batch):
+        interpreter.resize_tensor_input(analyzer.input_layer_index, list(batch.shape))
+        interpreter.allocate_tensors()
+
+    interpreter.set_tensor(analyzer.input_layer_index, batch)
+    interpreter.invoke()
+    logits = interpreter.get_tensor(analyzer.output_layer_index)
+    return analyzer.flat_sigmoid(logits, sensitivity=-1.0)
+
+
+def species_allow_list(analyzer: Analyzer, lat: float, lon: float, recording_date: date) -> Set[str]:
+    """
+    Return the labels BirdNET expects at a location and time of year.
+
+    Args:
+        analyzer (Analyzer): BirdNETlib Analyzer instance (runs the species-range model on cache misses).
+        lat (float): Latitude of the recording.
+        lon (float): Longitude of the recording.
+        recording_date (date): Date the recording was made.
+
+    Returns:
+        Set[str]: Allowed labels; empty means every species is allowed.
+    """
+    if lat and lon:
+        return set(species_cache.get(analyzer, lat, lon, return_week_48_from_datetime(recording_date)))
+    return set()
+
+
+def detections_from_scores(
+    labels: Sequence[str],
+    starts: Sequence[float],
+    scores: np.ndarray,
+    min_conf: float = MIN_CONFIDENCE,
+    allow_list: Set[str] = frozenset(),
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turn per-window confidence vectors into BirdNETlib-style detections.
+
+    Args:
+        labels (Sequence[str]): Model labels ("Scientific name_Common name"), one per score column.
+        starts (Sequence[float]): Start time of each window in seconds.
+        scores (np.ndarray): Confidences of shape (len(starts), len(labels)).
+        min_conf (float): Only confidences above this become detections.
+        allow_list (Set[str]): Labels to keep; empty keeps every species.
+
+    Yields:
+        Dict[str, Any]: Raw BirdNETlib-style detection dictionaries.
+    """
+    for start, window_scores in zip(starts, scores):
+        # Highest confidence first within a window, as birdnetlib reports them
+        for idx in sorted(np.flatnonzero(window_scores > min_conf), key=lambda i: -window_scores[i]):
+            label = labels[idx]
+            if allow_list and label not in allow_list:
+                continue
+            scientific_name, common_name = label.split("_")[:2]
+            yield {
+                "common_name": common_name,
+                "scientific_name": scientific_name,
+                "start_time": float(start),
+                "end_time": float(start) + WINDOW_SECONDS,
+                "confidence": float(window_scores[idx]),
+                "label": label,
+            }
+
+
+def stream_birdnet(
+    file_path: Path,
+    analyzer: Analyzer,
+    lat: float,
+    lon: float,
+    recording_date: date,
+    batch_size: int = ANALYSIS_BATCH_SIZE,
+    overlap: float = ANALYSIS_OVERLAP,
+    active: Optional[np.ndarray] = None,
+    score_writer: Optional[ScoreWriter] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run BirdNET on a .WAV file of any length in bounded memory.
+
+    Windows are read with `iter_audio_windows` and scored `batch_size` at a
+    time; detections are yielded as soon as their batch is scored. Memory use
+    depends on the batch size, not on the length of the recording. Detections
+    have the same format and filtering as birdnetlib's.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file.
+        analyzer (Analyzer): BirdNETlib Analyzer instance.
+        lat (float): Latitude used for the location/season species filter.
+        lon (float): Longitude used for the location/season species filter.
+        recording_date (date): Date the recording was made.
+        batch_size (int): Windows scored per model invocation.
+        overlap (float): Seconds of overlap between consecutive windows.
+        active (Optional[np.ndarray]): Mask from `find_active_windows`; windows marked False are skipped.
+        score_writer (Optional[ScoreWriter]): Receives the full score vector of every scored window.
+
+    Yields:
+        Dict[str, Any]: Raw BirdNETlib-style detection dictionaries.
+    """
+    allow_list = species_allow_list(analyzer, lat, lon, recording_date)
+
+    batch = np.zeros((max(1, batch_size), int(WINDOW_SECONDS * SAMPLE_RATE)), dtype=np.float32)
+    starts: List[float] = []
+
+    def score(count: int) -> Iterator[Dict[str, Any]]:
+        confidences = predict_batch(analyzer, batch[:count])
+        if score_writer is not None:
+            score_writer.write(starts, confidences)
+        yield from detections_from_scores(analyzer.labels, starts, confidences, MIN_CONFIDENCE, allow_list)
+
+    windows = 0
+    for index, (start, samples) in enumerate(iter_audio_windows(file_path, overlap)):
+        if active is not None and not active[index]:
+            continue
+        batch[len(starts)] = samples
+        starts.append(start)
+        windows += 1
+        if len(starts) == len(batch):
+            yield from score(len(starts))
+            starts.clear()
+
+    if starts:
+        yield from score(len(starts))
+
+    logger.info(f"Streamed {windows} windows of {file_path.name} through BirdNET")
+
+
 def analyze_audio_file(
     file_path: Path,
     analyzer: Analyzer,
     recording_id: int,
-    db: Session
+    db: Session,
+    content_hash: Optional[str] = None,
+    commit: bool = True,
 ) -> List[DetectionResponse]:
     """
     Analyze a single .WAV file using BirdNETlib and store detections linked to the given recording ID.
@@ -31,6 +434,8 @@ def analyze_audio_file(
         analyzer (Analyzer): BirdNETlib Analyzer instance.
         recording_id (int): ID of the associated recording row in the DB.
         db (Session): SQLAlchemy DB session.
+        content_hash (Optional[str]): SHA-256 of the file, recorded so later uploads can reuse the result.
+        commit (bool): Commit the detections; pass False to leave it to the caller's transaction.
 
     Returns:
         List[DetectionResponse]: The detection records created.
@@ -40,27 +445,184 @@ def analyze_audio_file(
         recording_metadata = RecordingRepository(db).get(recording_id)
         if not recording_metadata:
             raise ValueError(f"Recording with ID {recording_id} not found")
-        
-        birdnet_recording = BirdNETRecording(
-            analyzer=analyzer,
-            path=str(file_path),
-            lat=recording_metadata.lat,
-            lon=recording_metadata.lon,
-            date=recording_metadata.recording_datetime.date(),
-            min_conf=0.5,
+
+        raw_detections, skipped_windows = run_birdnet(
+            file_path,
+            analyzer,
+            recording_metadata.lat,
+            recording_metadata.lon,
+            recording_metadata.recording_datetime.date(),
+            scores_for=recording_id if STORE_SCORES else None,
         )
-        
-        birdnet_recording.analyze()
-        
+
     except Exception as e:
         logger.exception(f"Failed to initialize or run BirdNET on {file_path.name}")
         raise
-    
+
+    return save_birdnet_detections(
+        file_path, recording_metadata, raw_detections, db, content_hash,
+        skipped_windows=skipped_windows, commit=commit,
+    )
+
+
+def analyze_or_reuse(
+    file_path: Path,
+    analyzer: Analyzer,
+    recording_id: int,
+    db: Session,
+    content_hash: str,
+    force: bool = False,
+) -> Tuple[List[DetectionResponse], bool]:
+    """
+    Reuse the detections of an identical earlier upload, or run BirdNET on a cache miss,
+    and mark the recording 'COMPLETED'.
+
+    The detections, analysis parameters and status change are committed in a
+    single transaction. On failure nothing is committed and the caller is
+    expected to roll back and mark the recording 'FAILED'.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file.
+        analyzer (Analyzer): BirdNETlib Analyzer instance.
+        recording_id (int): ID of the associated recording row in the DB.
+        db (Session): SQLAlchemy DB session.
+        content_hash (str): SHA-256 of the file.
+        force (bool): Always run BirdNET, ignoring earlier results.
+
+    Returns:
+        Tuple[List[DetectionResponse], bool]: The detection records created and whether they were reused.
+    """
+    results = None
+    if not force:
+        results = reuse_cached_detections(file_path, recording_id, content_hash, db, commit=False)
+    reused = results is not None
+    if not reused:
+        results = analyze_audio_file(file_path, analyzer, recording_id, db, content_hash, commit=False)
+
+    RecordingRepository(db).update_status(recording_id, RecordingStatus.COMPLETED)
+    return results, reused
+
+
+def find_cached_analysis(
+    recording_metadata: Recording,
+    content_hash: str,
+    db: Session
+) -> Optional[Recording]:
+    """
+    Find an earlier completed analysis of identical audio with the same analyzer parameters.
+
+    Args:
+        recording_metadata (Recording): The recording about to be analyzed.
+        content_hash (str): SHA-256 of its file.
+        db (Session): SQLAlchemy DB session.
+
+    Returns:
+        Optional[Recording]: The recording whose detections can be reused, or None.
+    """
+    return RecordingRepository(db).find_analyzed(
+        content_hash,
+        MIN_CONFIDENCE,
+        recording_metadata.lat,
+        recording_metadata.lon,
+        return_week_48_from_datetime(recording_metadata.recording_datetime),
+        exclude_id=recording_metadata.id,
+        silence_filtered=SILENCE_FILTER,
+    )
+
+
+def reuse_cached_detections(
+    file_path: Path,
+    recording_id: int,
+    content_hash: str,
+    db: Session,
+    commit: bool = True,
+) -> Optional[List[DetectionResponse]]:
+    """
+    Copy the detections of an earlier analysis of identical audio, skipping BirdNET.
+
+    A previous result is only reused when it was produced with the same content
+    hash, confidence threshold, location and week of the year, since those are
+    everything that determines BirdNET's output for a file.
+
+    Args:
+        file_path (Path): Path to the .WAV audio file (used for detection times).
+        recording_id (int): ID of the associated recording row in the DB.
+        content_hash (str): SHA-256 of the file.
+        db (Session): SQLAlchemy DB session.
+        commit (bool): Commit the detections; pass False to leave it to the caller's transaction.
+
+    Returns:
+        Optional[List[DetectionResponse]]: The detection records created, or None on a cache miss.
+    """
+    recording_metadata = RecordingRepository(db).get(recording_id)
+    if not recording_metadata:
+        raise ValueError(f"Recording with ID {recording_id} not found")
+
+    cached = find_cached_analysis(recording_metadata, content_hash, db)
+    if cached is None:
+        return None
+
+    raw_detections = [
+        {
+            "start_time": det.start_sec,
+            "end_time": det.end_sec,
+            "common_name": det.species,
+            "scientific_name": det.scientific_name,
+            "confidence": det.confidence,
+        }
+        for det in DetectionRepository(db).get_recording_detections(cached.id)
+    ]
+    logger.info(f"Reusing detections of recording ID {cached.id} for {file_path.name}")
+    return save_birdnet_detections(
+        file_path,
+        recording_metadata,
+        raw_detections,
+        db,
+        content_hash,
+        # Point at the recording BirdNET actually ran on, which holds the scores
+        reused_from_id=cached.reused_from_id or cached.id,
+        skipped_windows=cached.skipped_windows,
+        commit=commit,
+    )
+
+
+def save_birdnet_detections(
+    file_path: Path,
+    recording_metadata: Recording,
+    raw_detections: List[Dict[str, Any]],
+    db: Session,
+    content_hash: Optional[str] = None,
+    reused_from_id: Optional[int] = None,
+    skipped_windows: Optional[int] = None,
+    commit: bool = True,
+) -> List[DetectionResponse]:
+    """
+    Parse raw BirdNET detections and store them linked to the given recording.
+
+    Args:
+        file_path (Path): Path to the analyzed .WAV file (used for detection times).
+        recording_metadata (Recording): The recording row the detections belong to.
+        raw_detections (List[Dict[str, Any]]): Detections returned by `run_birdnet`.
+        db (Session): SQLAlchemy DB session.
+        content_hash (Optional[str]): SHA-256 of the file, stored with the analysis parameters.
+        reused_from_id (Optional[int]): Recording the detections were copied from, for cache hits.
+        skipped_windows (Optional[int]): Windows the silence pre-filter skipped, if it ran.
+        commit (bool): Commit the writes; pass False to leave it to the caller's transaction.
+
+    Returns:
+        List[DetectionResponse]: The detection records created.
+
+    Raises:
+        Exception: If the detections cannot be stored; with commit=False the
+        caller's transaction is left for it to roll back.
+    """
+    recording_id = recording_metadata.id
+
     # Parse detections
     results_to_save: List[DetectionCreate] = []
     results_to_return: List[DetectionResponse] = []
     
-    for det in birdnet_recording.detections:
+    for det in raw_detections:
         try:
             # Build the DB save schema
             to_save = DetectionCreate(
@@ -95,12 +657,88 @@ def analyze_audio_file(
         
     if results_to_save:
         logger.info(f"Parsed {len(results_to_save)} detections from {file_path.name}")
-        try:
-            DetectionRepository(db).save_detections(results_to_save)
-            logger.info(f"Saved {len(results_to_save)} detections for recording ID {recording_id}")
-        except Exception as e:
-            logger.exception(f"Failed to save detections to DB for {file_path.name}")
+        # A failed insert propagates, so the caller never records the analysis as complete
+        DetectionRepository(db).bulk_save_detections(results_to_save, commit=commit)
+        logger.info(f"Saved {len(results_to_save)} detections for recording ID {recording_id}")
     else:
         logger.warning(f"No detections found in file {file_path.name}")
-                
-    return results_to_return
\ No newline at end of file
+
+    if content_hash or skipped_windows is not None:
+        RecordingRepository(db).set_analysis_params(
+            recording_id,
+            content_hash,
+            MIN_CONFIDENCE,
+            return_week_48_from_datetime(recording_metadata.recording_datetime),
+            reused_from_id=reused_from_id,
+            skipped_windows=skipped_windows,
+            commit=commit,
+        )
+
+    return results_to_return
+
+
+def rethreshold_recording(
+    recording_id: int,
+    analyzer: Analyzer,
+    db: Session,
+    min_conf: float,
+    location_filter: bool = True,
+) -> List[DetectionResponse]:
+    """
+    Regenerate a recording's detections from its stored scores, without running BirdNET.
+
+    The existing detections are replaced by every stored window score above
+    `min_conf`. Recordings whose detections were reused from an identical upload
+    use that upload's scores.
+
+    Args:
+        recording_id (int): ID of the recording.
+        analyzer (Analyzer): BirdNETlib Analyzer instance (provides labels and species lists).
+        db (Session): SQLAlchemy DB session.
+        min_conf (float): New minimum confidence for a detection.
+        location_filter (bool): Keep only species BirdNET expects at the recording's location and week.
+
+    Returns:
+        List[DetectionResponse]: The detection records created.
+
+    Raises:
+        ValueError: If the recording does not exist.
+        FileNotFoundError: If no scores were stored for the recording.
+    """
+    recording_repo = RecordingRepository(db)
+    recording_metadata = recording_repo.get(recording_id)
+    if not recording_metadata:
+        raise ValueError(f"Recording with ID {recording_id} not found")
+
+    stored = load_scores(recording_metadata.reused_from_id or recording_id)
+    if stored is None:
+        raise FileNotFoundError(f"No stored scores for recording ID {recording_id}")
+    starts, scores = stored
+
+    allow_list: Set[str] = set()
+    week_48 = None
+    if location_filter:
+        allow_list = species_allow_list(
+            analyzer, recording_metadata.lat, recording_metadata.lon, recording_metadata.recording_datetime.date()
+        )
+        week_48 = return_week_48_from_datetime(recording_metadata.recording_datetime)
+
+    raw_detections = list(detections_from_scores(analyzer.labels, starts, scores, min_conf, allow_list))
+
+    # Replace the detections and record the new threshold in one transaction,
+    # so the dedupe cache only ever matches identical settings
+    DetectionRepository(db).delete_recording_detections(recording_id, commit=False)
+    results = save_birdnet_detections(
+        Path(recording_metadata.file_name), recording_metadata, raw_detections, db, commit=False
+    )
+    recording_repo.set_analysis_params(
+        recording_id,
+        recording_metadata.content_hash,
+        min_conf,
+        week_48,
+        reused_from_id=recording_metadata.reused_from_id,
+        skipped_windows=recording_metadata.skipped_windows,
+    )
+    logger.info(f"Re-thresholded recording ID {recording_id} at {min_conf}: {len(results)} detections")
+    return results
+
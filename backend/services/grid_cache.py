@@ -0,0 +1,165 @@
+# grid_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.config import GRID_CACHE_SIZE, GRID_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting the geohashes whose detections changed in the current transaction
+DIRTY_KEY = "grid_dirty_geohashes"
+
+# (tile geohash prefix, bin precision, filters)
+GridKey = Tuple[str, int, Hashable]
+
+
+class GridTileCache:
+    """
+    LRU + TTL cache of binned detection counts for map tiles.
+
+    Each entry holds the bins of one geohash tile at one precision for one set
+    of filters. When detections are saved or deleted, every tile containing
+    the affected recordings' locations is dropped, at any zoom level. One
+    instance is shared by all requests and worker threads of a process; writes
+    committed by other processes (other API workers, partition retention) are
+    only picked up once the tiles expire.
+    """
+
+    def __init__(self, maxsize: int = GRID_CACHE_SIZE, ttl: float = GRID_CACHE_TTL):
+        """
+        Args:
+            maxsize (int): Number of tiles kept before the least recently used is evicted.
+            ttl (float): Seconds a tile is served; 0 disables the cache.
+        """
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._tiles: "OrderedDict[GridKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # Tile prefix -> cached keys for that tile, so invalidation doesn't scan the cache
+        self._keys_by_tile: Dict[str, Set[GridKey]] = {}
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        """
+        Return a counter that changes on every invalidation.
+
+        Take it before querying a missed tile and pass it to `put`, so a result
+        computed while detections changed is not cached.
+        """
+        with self._lock:
+            return self.invalidations
+
+    def get(self, key: GridKey) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the cached bins of a tile, or None on a miss.
+        """
+        with self._lock:
+            entry = self._tiles.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._tiles[key]
+                self._discard_key(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: GridKey, bins: List[Dict[str, Any]], generation: int) -> None:
+        """
+        Cache the bins of a tile unless an invalidation happened since `generation`.
+        """
+        with self._lock:
+            if self.ttl <= 0 or generation != self.invalidations:
+                return
+            self._tiles[key] = (time.monotonic() + self.ttl, bins)
+            self._tiles.move_to_end(key)
+            self._keys_by_tile.setdefault(key[0], set()).add(key)
+            while len(self._tiles) > self.maxsize:
+                evicted, _ = self._tiles.popitem(last=False)
+                self._discard_key(evicted)
+
+    def invalidate(self, geohashes: Iterable[str]) -> None:
+        """
+        Drop every cached tile containing one of the given locations.
+
+        Args:
+            geohashes (Iterable[str]): Full-length geohashes of recordings whose
+                detections changed; an empty string drops every tile.
+        """
+        with self._lock:
+            self.invalidations += 1
+            for geohash in set(geohashes):
+                for length in range(len(geohash) + 1):
+                    for key in self._keys_by_tile.pop(geohash[:length], ()):
+                        self._tiles.pop(key, None)
+                if geohash == "":
+                    self._tiles.clear()
+                    self._keys_by_tile.clear()
+
+    def _discard_key(self, key: GridKey) -> None:
+        keys = self._keys_by_tile.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tile[key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the hit/miss/invalidation counters and the current size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._tiles),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+    def clear(self) -> None:
+        """
+        Drop every cached tile and reset the counters.
+        """
+        with self._lock:
+            self._tiles.clear()
+            self._keys_by_tile.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+
+# Cache shared by every grid request in this process
+grid_cache = GridTileCache()
+
+
+def mark_dirty(db: Session, geohashes: Iterable[str]) -> None:
+    """
+    Record that detections at these locations change in the session's transaction.
+
+    The matching tiles are dropped once the transaction commits, so readers
+    never re-cache counts from before the change.
+    """
+    db.info.setdefault(DIRTY_KEY, set()).update(geohashes)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    geohashes = session.info.pop(DIRTY_KEY, None)
+    if geohashes:
+        grid_cache.invalidate(geohashes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(DIRTY_KEY, None)
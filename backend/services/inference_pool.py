@@ -0,0 +1,114 @@
+# inference_pool.py
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from birdnetlib.analyzer import Analyzer
+
+from backend.app.config import INFERENCE_THREADS_PER_WORKER, INFERENCE_WORKERS
+from backend.services.audio_analyzer import load_analyzer, run_birdnet
+
+logger = logging.getLogger(__name__)
+
+# Analyzer owned by the current worker process (set by the pool initializer)
+_worker_analyzer: Optional[Analyzer] = None
+
+
+def _init_worker(num_threads: int) -> None:
+    global _worker_analyzer
+    _worker_analyzer = load_analyzer(num_threads)
+
+
+def _run_in_worker(
+    file_path: str, lat: float, lon: float, recording_date: date, scores_for: Optional[int]
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    return run_birdnet(Path(file_path), _worker_analyzer, lat, lon, recording_date, scores_for=scores_for)
+
+
+class InferencePool:
+    """
+    Process pool that runs BirdNET inference for many WAV files in parallel.
+
+    Each worker process loads its own Analyzer once at startup, with its TFLite
+    thread count chosen so that workers x threads does not oversubscribe the
+    CPU. Workers only run the model; the parent keeps ownership of the database
+    session and consumes results in submission order.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = INFERENCE_WORKERS,
+        threads_per_worker: int = INFERENCE_THREADS_PER_WORKER,
+    ):
+        """
+        Args:
+            num_workers (int): Number of worker processes.
+            threads_per_worker (int): TFLite threads for each worker's interpreter.
+        """
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self._executor = self._create_executor()
+        # Serializes replacing a broken executor between concurrent submitters
+        self._restart_lock = threading.Lock()
+        logger.info(
+            f"Inference pool ready with {self.num_workers} workers "
+            f"x {self.threads_per_worker} TFLite threads"
+        )
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # TensorFlow is not fork-safe once loaded, so always spawn fresh workers
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        )
+
+    def submit(
+        self,
+        file_path: Path,
+        lat: float,
+        lon: float,
+        recording_date: date,
+        scores_for: Optional[int] = None,
+    ) -> Future:
+        """
+        Queue a WAV file for inference.
+
+        Args:
+            file_path (Path): Path to the .WAV audio file.
+            lat (float): Latitude used for the location/season species filter.
+            lon (float): Longitude used for the location/season species filter.
+            recording_date (date): Date the recording was made.
+            scores_for (Optional[int]): Recording ID to store the full window scores under.
+
+        Returns:
+            Future: Resolves to the result of `run_birdnet` (detections and skipped windows).
+        """
+        args = (str(file_path), lat, lon, recording_date, scores_for)
+        executor = self._executor
+        try:
+            return executor.submit(_run_in_worker, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool and retry once
+            with self._restart_lock:
+                # Another submitter may have replaced it while we waited for the lock
+                if self._executor is executor:
+                    logger.warning("Inference pool is broken, restarting workers")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = self._create_executor()
+                executor = self._executor
+            return executor.submit(_run_in_worker, *args)
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, cancelling any inference not yet started.
+        """
+        with self._restart_lock:
+            executor = self._executor
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,170 @@
+# job_queue.py
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+from birdnetlib.analyzer import Analyzer
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.app.config import JOB_LEASE_TIMEOUT, JOB_POLL_INTERVAL, JOB_WORKERS
+from backend.app.models.recording import Recording, RecordingStatus
+from backend.app.repositories.recording import RecordingRepository
+from backend.app.utils.file_utils import file_sha256
+from backend.services.audio_analyzer import analyze_or_reuse
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorkerPool:
+    """
+    Bounded pool of background threads that drains the analysis job queue.
+
+    The queue is persistent: it is the set of job recordings stored in the
+    database with status 'PENDING'. Each worker claims one recording at a time,
+    runs BirdNET on its spooled file with a worker-local Analyzer (or reuses the
+    detections of an identical earlier upload), and moves the recording to
+    'COMPLETED' or 'FAILED'.
+
+    Claims are leases: a heartbeat thread renews the claims of the recordings
+    this pool is analyzing and requeues those whose claim has not been renewed
+    for `lease_timeout` seconds, so recordings abandoned by a stopped or crashed
+    process are picked up again while other processes' work is left alone.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        analyzer_factory: Callable[[], Analyzer] = Analyzer,
+        num_workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease_timeout: float = JOB_LEASE_TIMEOUT,
+    ):
+        """
+        Args:
+            session_factory (sessionmaker): Factory for per-worker DB sessions.
+            analyzer_factory (Callable): Builds the BirdNET Analyzer each worker owns.
+            num_workers (int): Number of worker threads.
+            poll_interval (float): Seconds an idle worker waits before polling again.
+            lease_timeout (float): Seconds an unrenewed claim lasts before it is requeued.
+        """
+        self.session_factory = session_factory
+        self.analyzer_factory = analyzer_factory
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self._in_flight: Set[int] = set()
+        self._in_flight_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self) -> None:
+        """
+        Requeue work whose claim has expired and start the workers and heartbeat.
+        """
+        self._requeue_expired()
+
+        self._stop.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f"analysis-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="analysis-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Started {self.num_workers} analysis workers")
+
+    def notify(self) -> None:
+        """
+        Wake idle workers because new recordings were queued.
+        """
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Signal the workers to exit and wait for in-flight recordings to finish.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _run(self) -> None:
+        analyzer: Optional[Analyzer] = None
+        db = self.session_factory()
+        try:
+            while not self._stop.is_set():
+                try:
+                    recording = RecordingRepository(db).claim_next_pending()
+                except Exception:
+                    logger.exception("Failed to claim a queued recording")
+                    db.rollback()
+                    recording = None
+
+                if recording is None:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+
+                # Load the model lazily so idle pools don't hold one per thread
+                if analyzer is None:
+                    analyzer = self.analyzer_factory()
+
+                with self._in_flight_lock:
+                    self._in_flight.add(recording.id)
+                try:
+                    self._process(db, analyzer, recording)
+                finally:
+                    with self._in_flight_lock:
+                        self._in_flight.discard(recording.id)
+        finally:
+            db.close()
+
+    def _heartbeat(self) -> None:
+        # Renew well before the lease runs out so a slow renewal doesn't let it lapse
+        while not self._stop.wait(self.lease_timeout / 3):
+            with self._in_flight_lock:
+                recording_ids = list(self._in_flight)
+            db = self.session_factory()
+            try:
+                RecordingRepository(db).renew_claims(recording_ids)
+            except Exception:
+                logger.exception("Failed to renew claims on queued recordings")
+            finally:
+                db.close()
+            self._requeue_expired()
+
+    def _requeue_expired(self) -> None:
+        db = self.session_factory()
+        try:
+            requeued = RecordingRepository(db).requeue_interrupted(self.lease_timeout)
+            if requeued:
+                logger.info(f"Requeued {requeued} recordings with expired claims")
+                self.notify()
+        except Exception:
+            logger.exception("Failed to requeue recordings with expired claims")
+        finally:
+            db.close()
+
+    def _process(self, db: Session, analyzer: Analyzer, recording: Recording) -> None:
+        recording_repo = RecordingRepository(db)
+        recording_id = recording.id
+        file_path = Path(recording.file_path)
+        force = recording.job is not None and recording.job.force_reanalysis
+
+        try:
+            # Stores the detections and marks the recording COMPLETED in one commit
+            analyze_or_reuse(file_path, analyzer, recording_id, db, file_sha256(file_path), force)
+        except Exception as e:
+            logger.exception(f"Failed to process queued recording {recording_id}")
+            db.rollback()
+            recording_repo.update_status(recording_id, RecordingStatus.FAILED, error_message=str(e))
+        finally:
+            file_path.unlink(missing_ok=True)
+            # Drop the job's spool directory once its last file is gone
+            try:
+                file_path.parent.rmdir()
+            except OSError:
+                pass
@@ -0,0 +1,294 @@
+# partitions.py
+import logging
+import re
+import threading
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.app.config import (
+    PARTITION_MAINTENANCE_INTERVAL,
+    PARTITION_MONTHS_AHEAD,
+    RETENTION_MONTHS,
+)
+from backend.app.models.detection import Detection
+from backend.app.models.species_daily import SpeciesDaily
+from backend.app.repositories.changes import detection_tombstones
+from backend.app.repositories.detection import DetectionRepository
+from backend.services.grid_cache import mark_dirty
+from backend.services.query_cache import mark_stale
+
+logger = logging.getLogger(__name__)
+
+# Monthly partitions are named detections_pYYYY_MM; the migration uses the same scheme
+PARTITION_NAME = re.compile(r"^detections_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Return the first day of the month `months` after (or before) the given one.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(month: date) -> datetime:
+    """
+    Return the first instant of a month, in UTC (the partition boundaries).
+    """
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: date) -> str:
+    return f"detections_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """
+    Check whether `detections` is a partitioned PostgreSQL table.
+
+    SQLite databases (tests, local development) always keep a plain table.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'detections' AND c.relnamespace = to_regnamespace(current_schema()))"
+    )).scalar())
+
+
+def has_default_partition(db: Session) -> bool:
+    """
+    Check whether detections_default is attached as the default partition.
+    """
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "WHERE pt.partrelid = 'detections'::regclass "
+        "AND pt.partdefid = to_regclass('detections_default'))"
+    )).scalar())
+
+
+def list_partitions(db: Session) -> List[date]:
+    """
+    List the months that currently have a partition attached, oldest first.
+
+    The default partition (rows outside every monthly range) is not included.
+    """
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'detections'::regclass"
+    )).scalars()
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(db: Session, month: date) -> None:
+    """
+    Create the partition holding one month of detections (UTC month boundaries).
+
+    Rows for the month may already sit in the default partition, e.g. after
+    the maintainer was down when the month began. PostgreSQL refuses to add a
+    partition whose range the default partition holds rows for, so those rows
+    are moved: the default partition is detached, the month is created, its
+    rows are copied over and the default partition is attached again. Does
+    not commit, so all of it happens in the caller's transaction.
+    """
+    name = partition_name(month)
+    bounds = {"start": month_start(month), "end": month_start(add_months(month, 1))}
+    stray = has_default_partition(db) and db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM detections_default "
+        "WHERE detection_time >= :start AND detection_time < :end)"
+    ), bounds).scalar()
+    if stray:
+        db.execute(text("ALTER TABLE detections DETACH PARTITION detections_default"))
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF detections "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    ))
+    if stray:
+        moved = db.execute(text(
+            f"INSERT INTO {name} SELECT * FROM detections_default "
+            "WHERE detection_time >= :start AND detection_time < :end"
+        ), bounds).rowcount
+        db.execute(text(
+            "DELETE FROM detections_default WHERE detection_time >= :start AND detection_time < :end"
+        ), bounds)
+        db.execute(text("ALTER TABLE detections ATTACH PARTITION detections_default DEFAULT"))
+        logger.warning(f"Moved {moved} detections from detections_default into {name}")
+
+
+def ensure_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """
+    Create the partitions for the current month and the next `months_ahead` months.
+
+    Args:
+        db: Database session.
+        months_ahead: Number of upcoming months to prepare.
+        today: Reference day (defaults to today, UTC).
+
+    Returns:
+        The names of the partitions that were created.
+    """
+    if not is_partitioned(db):
+        return []
+
+    current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    existing = set(list_partitions(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        create_partition(db, month)
+        created.append(partition_name(month))
+    db.commit()
+    return created
+
+
+def drop_partition(db: Session, month: date) -> bool:
+    """
+    Remove one month of detections by detaching and dropping its partition.
+
+    Detaching only touches the catalog, so this takes milliseconds however many
+    rows the month holds. The month's daily statistics are removed in the same
+    transaction so /api/stats stays consistent with the detections, and every
+    dropped detection leaves a tombstone so the change feed reports it; that
+    reads the month's IDs once, from its partition only.
+
+    Args:
+        db: Database session.
+        month: First day of the month to drop.
+
+    Returns:
+        False if the month has no partition, True otherwise.
+    """
+    if month not in list_partitions(db):
+        return False
+
+    name = partition_name(month)
+    db.execute(detection_tombstones(db, and_(
+        Detection.detection_time >= month_start(month),
+        Detection.detection_time < month_start(add_months(month, 1)),
+    )))
+    db.execute(text(f"ALTER TABLE detections DETACH PARTITION {name}"))
+    db.execute(text(f"DROP TABLE {name}"))
+    db.execute(
+        delete(SpeciesDaily)
+        .where(SpeciesDaily.day >= month, SpeciesDaily.day < add_months(month, 1))
+    )
+    mark_stale(db)
+    mark_dirty(db, [""])
+    db.commit()
+    return True
+
+
+def apply_retention(db: Session, retention_months: int = RETENTION_MONTHS, today: Optional[date] = None) -> List[str]:
+    """
+    Drop every detection older than the retention window.
+
+    Whole months go by dropping their partitions; the few older rows that
+    landed in the default partition are deleted the regular way.
+
+    Args:
+        db: Database session.
+        retention_months: Months to keep, counting the current one (0 keeps everything).
+        today: Reference day (defaults to today, UTC).
+
+    Returns:
+        The names of the partitions that were dropped.
+    """
+    if retention_months <= 0 or not is_partitioned(db):
+        return []
+
+    current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    cutoff = add_months(current, 1 - retention_months)
+    dropped = []
+    for month in list_partitions(db):
+        if month < cutoff and drop_partition(db, month):
+            dropped.append(partition_name(month))
+
+    DetectionRepository(db).delete_detections_before(month_start(cutoff))
+    return dropped
+
+
+class PartitionMaintainer:
+    """
+    Background thread that keeps the monthly detection partitions in shape.
+
+    On start and then every `interval` seconds it creates the partitions for
+    the upcoming months (so inserts never fall into the default partition)
+    and applies the retention window. It does nothing on databases where
+    `detections` is not partitioned.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        months_ahead: int = PARTITION_MONTHS_AHEAD,
+        retention_months: int = RETENTION_MONTHS,
+        interval: float = PARTITION_MAINTENANCE_INTERVAL,
+    ):
+        """
+        Args:
+            session_factory (sessionmaker): Factory for the maintenance DB session.
+            months_ahead (int): Upcoming months to keep partitions for.
+            retention_months (int): Months of detections to keep (0 keeps everything).
+            interval (float): Seconds between maintenance runs.
+        """
+        self.session_factory = session_factory
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def run_once(self) -> None:
+        """
+        Create upcoming partitions and apply retention now.
+        """
+        db = self.session_factory()
+        try:
+            if not is_partitioned(db):
+                return
+            created = ensure_partitions(db, self.months_ahead)
+            if created:
+                logger.info(f"Created detection partitions: {', '.join(created)}")
+            dropped = apply_retention(db, self.retention_months)
+            if dropped:
+                logger.info(f"Dropped detection partitions past retention: {', '.join(dropped)}")
+        except Exception:
+            logger.exception("Detection partition maintenance failed")
+            db.rollback()
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """
+        Start the maintenance thread; its first run happens immediately.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="partition-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Signal the maintenance thread to exit and wait for it.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
@@ -0,0 +1,237 @@
+# query_cache.py
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.config import QUERY_CACHE_REDIS_URL, QUERY_CACHE_SIZE, QUERY_CACHE_TTL
+from backend.app.repositories.changes import CHANGE_SEQ_KEY
+from backend.app.repositories.data_version import DETECTIONS, DataVersionRepository
+from backend.app.utils.fast_json import dumps, loads
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:  # Optional: only needed to share the cache between workers
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Session.info key set when the current transaction changes detections or recordings
+STALE_KEY = "query_cache_stale"
+
+# Prefix of every Redis key written by the cache
+REDIS_PREFIX = "soundbird:query:"
+
+
+def _normalize(value: Any) -> Any:
+    # Aware datetimes in any offset name the same instant
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc)
+    return value
+
+
+def cache_key(name: str, **params: Any) -> str:
+    """
+    Build a cache key from a query name and its parameters.
+
+    Parameters are sorted by name and aware datetimes are converted to UTC,
+    so equivalent requests share an entry.
+    """
+    normalized = repr(sorted((k, _normalize(v)) for k, v in params.items()))
+    return f"{name}:{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of read query results, keyed by a generation.
+
+    Every entry is stored under the generation its query read, normally the
+    detections data version taken before querying. The data version moves with
+    every committed change, whichever process made it, so entries of older
+    generations are never read again and age out of the LRU or expire.
+    Entries live in this process by default; with an asyncio Redis client they
+    are shared by every worker pointing at the same Redis. Shared entries are
+    stored as JSON, so values must be plain JSON data (dicts, lists, strings,
+    numbers, datetimes) and come back with datetimes as ISO strings.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL, client: Any = None):
+        """
+        Args:
+            maxsize (int): Entries kept in process before the least recently used is evicted.
+            ttl (float): Seconds an entry is served; 0 disables the cache.
+            client: Optional `redis.asyncio` client used instead of process memory.
+        """
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.client = client
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def generation(self) -> int:
+        """
+        Return how many times this process has dropped its entries with `bump`.
+        """
+        with self._lock:
+            return self._generation
+
+    async def get(self, key: str, generation: int) -> Optional[Any]:
+        """
+        Return the value cached for a key in a generation, or None on a miss.
+        """
+        value = None
+        if self.enabled:
+            if self.client is not None:
+                value = await self._redis_get(key, generation)
+            else:
+                value = self._local_get(key, generation)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    async def put(self, key: str, value: Any, generation: int) -> None:
+        """
+        Cache a query result computed in `generation`.
+        """
+        if not self.enabled:
+            return
+        if self.client is not None:
+            await self._redis_put(key, value, generation)
+            return
+        with self._lock:
+            self._entries[(generation, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((generation, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def bump(self) -> None:
+        """
+        Drop the entries of this process after a commit changed the data.
+
+        Their generation is already outdated, so this only frees memory early;
+        Redis entries expire by themselves.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _local_get(self, key: str, generation: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((generation, key))
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[(generation, key)]
+                return None
+            self._entries.move_to_end((generation, key))
+            return entry[1]
+
+    async def _redis_get(self, key: str, generation: int) -> Optional[Any]:
+        try:
+            data = await self.client.get(f"{REDIS_PREFIX}{generation}:{key}")
+        except redis.RedisError as e:
+            logger.warning(f"Query cache read failed: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return loads(data)
+        except ValueError as e:
+            logger.warning(f"Query cache entry is not valid JSON: {e}")
+            return None
+
+    async def _redis_put(self, key: str, value: Any, generation: int) -> None:
+        try:
+            # Redis evicts by its own maxmemory policy; the TTL bounds staleness
+            await self.client.set(f"{REDIS_PREFIX}{generation}:{key}", dumps(value), px=int(self.ttl * 1000))
+        except redis.RedisError as e:
+            logger.warning(f"Query cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the hit/miss counters, hit rate and current size of the cache.
+
+        Counters cover this process; with Redis, `size` is not tracked (None).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis" if self.client is not None else "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries) if self.client is None else None,
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "generation": self._generation,
+            }
+
+    def clear(self) -> None:
+        """
+        Drop every cached result of this process and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _redis_client(url: str) -> Any:
+    if not url:
+        return None
+    if redis is None:
+        logger.warning("SOUNDBIRD_QUERY_CACHE_REDIS_URL is set but redis is not installed; caching in process")
+        return None
+    # Short timeouts: a slow Redis should cost a cache miss, not a stalled request
+    return redis.asyncio.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+
+# Cache shared by every read request in this process
+query_cache = QueryCache(client=_redis_client(QUERY_CACHE_REDIS_URL))
+
+
+def mark_stale(db: Session) -> None:
+    """
+    Record that the session's transaction changes detections or recordings.
+
+    The detections data version is bumped as part of the commit, which moves
+    readers to a new cache generation, and this process's cached entries are
+    dropped once it has succeeded.
+    """
+    db.info[STALE_KEY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_data_version(session: Session) -> None:
+    # Bumping at commit time keeps the counter row locked as briefly as possible.
+    # Pending rows were flushed by the change feed's before_commit hook, registered first
+    if session.info.get(STALE_KEY) or CHANGE_SEQ_KEY in session.info:
+        DataVersionRepository(session).bump(DETECTIONS)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session) -> None:
+    if session.info.pop(STALE_KEY, False):
+        query_cache.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(STALE_KEY, None)
@@ -0,0 +1,125 @@
+# score_store.py
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.app.config import SCORES_DIR
+
+logger = logging.getLogger(__name__)
+
+# Scores are sigmoid confidences in [0, 1]; float16 keeps ~3 significant digits at half the size
+SCORE_DTYPE = np.dtype(np.float16)
+
+# Space reserved for the .npy header, which is only written once the row count is known
+HEADER_BYTES = 128
+
+
+def score_paths(recording_id: int, scores_dir: Path = SCORES_DIR) -> Tuple[Path, Path]:
+    """
+    Return the score matrix and window start-time files of a recording.
+
+    Args:
+        recording_id (int): ID of the recording.
+        scores_dir (Path): Directory holding the score files.
+
+    Returns:
+        Tuple[Path, Path]: Paths of the (windows x labels) float16 matrix and of the
+        window start times, both in .npy format.
+    """
+    return scores_dir / f"{recording_id}.npy", scores_dir / f"{recording_id}.starts.npy"
+
+
+class ScoreWriter:
+    """
+    Append per-window score vectors to a float16 .npy file as they are produced.
+
+    Rows go straight to disk, so memory use does not depend on the length of the
+    recording. The files are written under temporary names and only moved into
+    place by `close`, so readers never see a partial matrix.
+    """
+
+    def __init__(self, recording_id: int, num_labels: int, scores_dir: Path = SCORES_DIR):
+        """
+        Args:
+            recording_id (int): ID of the recording the scores belong to.
+            num_labels (int): Length of each score vector (number of model labels).
+            scores_dir (Path): Directory holding the score files.
+        """
+        scores_dir.mkdir(parents=True, exist_ok=True)
+        self.path, self.starts_path = score_paths(recording_id, scores_dir)
+        self.num_labels = num_labels
+        self.rows = 0
+        self._starts: List[float] = []
+        self._part_path = self.path.with_suffix(".part")
+        self._file = open(self._part_path, "wb")
+        self._file.seek(HEADER_BYTES)
+
+    def write(self, starts: Sequence[float], scores: np.ndarray) -> None:
+        """
+        Append the scores of a batch of windows.
+
+        Args:
+            starts (Sequence[float]): Start time of each window in seconds.
+            scores (np.ndarray): Confidences of shape (len(starts), num_labels).
+        """
+        self._file.write(np.ascontiguousarray(scores, dtype=SCORE_DTYPE).tobytes())
+        self._starts.extend(starts)
+        self.rows += len(starts)
+
+    def close(self) -> None:
+        """
+        Write the .npy header and the start times, then publish both files.
+        """
+        self._file.seek(0)
+        np.lib.format.write_array_header_1_0(
+            self._file,
+            {
+                "descr": np.lib.format.dtype_to_descr(SCORE_DTYPE),
+                "fortran_order": False,
+                "shape": (self.rows, self.num_labels),
+            },
+        )
+        if self._file.tell() != HEADER_BYTES:
+            self.abort()
+            raise ValueError("Score matrix header does not fit the reserved space")
+        self._file.close()
+
+        np.save(self.starts_path, np.asarray(self._starts, dtype=np.float32))
+        self._part_path.replace(self.path)
+        logger.info(f"Stored {self.rows} score vectors in {self.path.name}")
+
+    def abort(self) -> None:
+        """
+        Discard a partially written matrix.
+        """
+        self._file.close()
+        self._part_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ScoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def load_scores(recording_id: int, scores_dir: Path = SCORES_DIR) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Open the stored scores of a recording without reading them into memory.
+
+    Args:
+        recording_id (int): ID of the recording.
+        scores_dir (Path): Directory holding the score files.
+
+    Returns:
+        Optional[Tuple[np.ndarray, np.ndarray]]: Window start times and the
+        memory-mapped (windows x labels) score matrix, or None if no scores were stored.
+    """
+    path, starts_path = score_paths(recording_id, scores_dir)
+    if not path.exists() or not starts_path.exists():
+        return None
+    return np.load(starts_path), np.load(path, mmap_mode="r")
@@ -0,0 +1,92 @@
+# species_cache.py
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from birdnetlib.analyzer import Analyzer
+
+from backend.app.config import SPECIES_CACHE_PRECISION, SPECIES_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class SpeciesListCache:
+    """
+    LRU cache of BirdNET's location/season species lists.
+
+    Lists are keyed by lat/lon rounded to `precision` decimals and by the week
+    of the year (1-48), so every file of an upload, and nearby uploads in the
+    same week, share one run of the species-range model. One instance is shared
+    by all requests and worker threads of a process.
+    """
+
+    def __init__(self, maxsize: int = SPECIES_CACHE_SIZE, precision: int = SPECIES_CACHE_PRECISION):
+        """
+        Args:
+            maxsize (int): Number of species lists kept before the least recently used is evicted.
+            precision (int): Decimal places lat/lon are rounded to.
+        """
+        self.maxsize = max(1, maxsize)
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._lists: "OrderedDict[Tuple[float, float, int], List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, analyzer: Analyzer, lat: float, lon: float, week_48: int) -> List[str]:
+        """
+        Return the species expected at a location and week, computing it on a miss.
+
+        Args:
+            analyzer (Analyzer): BirdNETlib Analyzer owned by the calling thread, used to run the species-range model.
+            lat (float): Latitude of the recording.
+            lon (float): Longitude of the recording.
+            week_48 (int): Week of the year (1-48).
+
+        Returns:
+            List[str]: Labels ("Scientific name_Common name") expected at that place and time.
+        """
+        key = (round(lat, self.precision), round(lon, self.precision), week_48)
+        with self._lock:
+            species_list = self._lists.get(key)
+            if species_list is not None:
+                self._lists.move_to_end(key)
+                self.hits += 1
+                return species_list
+            self.misses += 1
+
+        # Run the model outside the lock; two threads missing the same key just compute it twice
+        species_list = analyzer.return_predicted_species_list(lon=key[1], lat=key[0], week_48=week_48)
+
+        with self._lock:
+            self._lists[key] = species_list
+            self._lists.move_to_end(key)
+            while len(self._lists) > self.maxsize:
+                self._lists.popitem(last=False)
+        return species_list
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit/miss counters and the current size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._lists),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        """
+        Drop every cached list and reset the counters.
+        """
+        with self._lock:
+            self._lists.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache shared by every analysis in this process
+species_cache = SpeciesListCache()
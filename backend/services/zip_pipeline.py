@@ -0,0 +1,211 @@
+# zip_pipeline.py
+import logging
+import queue
+import threading
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from backend.app.config import (
+    MAX_ZIP_COMPRESSION_RATIO,
+    MAX_ZIP_MEMBER_BYTES,
+    MAX_ZIP_MEMBERS,
+    MAX_ZIP_TOTAL_BYTES,
+    UPLOAD_CHUNK_SIZE,
+    ZIP_PIPELINE_DEPTH,
+    ZIP_RATIO_MIN_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the extraction queue
+_DONE = object()
+
+
+class UnsafeArchiveError(ValueError):
+    """
+    Raised when a ZIP archive or one of its members is too large or suspiciously compressed.
+    """
+
+
+def list_wav_members(
+    zip_ref: zipfile.ZipFile,
+    max_member_bytes: int = MAX_ZIP_MEMBER_BYTES,
+    max_total_bytes: int = MAX_ZIP_TOTAL_BYTES,
+    max_members: int = MAX_ZIP_MEMBERS,
+    max_ratio: float = MAX_ZIP_COMPRESSION_RATIO,
+    ratio_min_bytes: int = ZIP_RATIO_MIN_BYTES,
+) -> Tuple[List[zipfile.ZipInfo], List[str]]:
+    """
+    List the .WAV members of a ZIP archive, skipping folders and hidden files.
+
+    Members are extracted under their base name, so a member whose name was
+    already seen in another folder is left out and reported as a duplicate.
+    Every member's declared size, the archive's total uncompressed size and its
+    member count are checked before anything is extracted, so zip bombs are
+    rejected up front. The compression ratio is only checked for members of at
+    least `ratio_min_bytes`, because recordings with long stretches of digital
+    silence legitimately compress far beyond any useful ratio limit.
+
+    Args:
+        zip_ref (ZipFile): The open archive.
+        max_member_bytes (int): Largest accepted uncompressed member size.
+        max_total_bytes (int): Largest accepted uncompressed size of all WAV members.
+        max_members (int): Most WAV members accepted.
+        max_ratio (float): Highest accepted uncompressed/compressed size ratio (0 disables it).
+        ratio_min_bytes (int): Uncompressed size from which the ratio is checked.
+
+    Returns:
+        Tuple[List[ZipInfo], List[str]]: The WAV members in archive order and
+        the names of the duplicates that were skipped.
+
+    Raises:
+        UnsafeArchiveError: If a WAV member or the archive exceeds a limit.
+    """
+    members = []
+    duplicates = []
+    seen = set()
+    total_bytes = 0
+    for member in zip_ref.infolist():
+        member_name = Path(member.filename).name
+        if member.is_dir() or member_name.startswith(("._", ".")):
+            continue
+        if not member_name.lower().endswith(".wav"):
+            continue
+        if member_name in seen:
+            logger.warning(f"Skipping duplicate {member.filename} in ZIP archive")
+            duplicates.append(member.filename)
+            continue
+        seen.add(member_name)
+
+        if member.file_size > max_member_bytes:
+            raise UnsafeArchiveError(
+                f"{member_name} is larger than the {max_member_bytes // (1024 * 1024)} MB limit"
+            )
+        if (
+            max_ratio > 0
+            and member.file_size >= ratio_min_bytes
+            and member.compress_size
+            and member.file_size / member.compress_size > max_ratio
+        ):
+            raise UnsafeArchiveError(f"{member_name} has a suspicious compression ratio")
+
+        total_bytes += member.file_size
+        if total_bytes > max_total_bytes:
+            raise UnsafeArchiveError(
+                f"ZIP archive inflates beyond the {max_total_bytes // (1024 * 1024)} MB limit"
+            )
+        members.append(member)
+        if len(members) > max_members:
+            raise UnsafeArchiveError(f"ZIP archive has more than {max_members} WAV files")
+    return members, duplicates
+
+
+def extract_wav_member(
+    zip_ref: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    dest_dir: Path,
+    max_member_bytes: int = MAX_ZIP_MEMBER_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> Optional[Path]:
+    """
+    Stream one ZIP member to `dest_dir`, flattening any folders in its name.
+
+    The number of bytes actually written is enforced as well, in case the
+    archive's headers understate the member's size.
+
+    Returns:
+        Path: The extracted file, or None if a file with that name already exists.
+
+    Raises:
+        UnsafeArchiveError: If the member inflates beyond its limit.
+    """
+    member_name = Path(member.filename).name
+    dest = dest_dir / member_name
+    if dest.exists():
+        logger.warning(f"Skipping duplicate {member_name} in ZIP archive")
+        return None
+
+    limit = min(member.file_size, max_member_bytes)
+    written = 0
+    try:
+        with zip_ref.open(member) as src, open(dest, "wb") as out:
+            while chunk := src.read(chunk_size):
+                written += len(chunk)
+                if written > limit:
+                    raise UnsafeArchiveError(f"{member_name} inflates beyond its declared size")
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+    return dest
+
+
+def iter_extracted_wavs(
+    zip_ref: zipfile.ZipFile,
+    members: List[zipfile.ZipInfo],
+    dest_dir: Path,
+    depth: int = ZIP_PIPELINE_DEPTH,
+) -> Iterator[Path]:
+    """
+    Extract WAV members one at a time in a background thread and yield each
+    file as soon as it is on disk, so analysis overlaps with unzipping.
+
+    At most `depth` extracted files wait in the queue, which bounds the disk
+    space used by the archive's contents. The caller owns each yielded file and
+    should delete it once analyzed. Members that fail to extract are logged and
+    skipped. Closing the generator early stops extraction and removes any files
+    that were never consumed.
+
+    Args:
+        zip_ref (ZipFile): The open archive (only read by the extraction thread).
+        members (List[ZipInfo]): Members to extract, usually from `list_wav_members`.
+        dest_dir (Path): Directory to extract into.
+        depth (int): Maximum number of extracted files waiting to be consumed.
+
+    Yields:
+        Path: The next extracted WAV file, in archive order.
+    """
+    ready: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Block while the consumer is busy, but give up once it has gone away
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for member in members:
+                if stop.is_set():
+                    return
+                try:
+                    path = extract_wav_member(zip_ref, member, dest_dir)
+                except Exception:
+                    logger.exception(f"Failed to extract {member.filename} from ZIP archive")
+                    continue
+                if path is not None and not put(path):
+                    path.unlink(missing_ok=True)
+                    return
+        finally:
+            put(_DONE)
+
+    producer = threading.Thread(target=produce, name="zip-extractor", daemon=True)
+    producer.start()
+    try:
+        while (item := ready.get()) is not _DONE:
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+        # Remove files that were extracted but never handed out
+        while not ready.empty():
+            item = ready.get_nowait()
+            if item is not _DONE:
+                item.unlink(missing_ok=True)
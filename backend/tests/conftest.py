@@ -0,0 +1,70 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from database.config import async_database_url
+
+# PostgreSQL-only behaviour (partitions, advisory locks) is tested against this database
+# when set, e.g. postgresql+psycopg2://postgres@localhost/soundbird_test
+POSTGRES_URL = os.getenv("SOUNDBIRD_TEST_POSTGRES_URL")
+
+
+def use_schema(engine, schema):
+    @event.listens_for(engine, "connect", insert=True)
+    def _set_search_path(dbapi_connection, connection_record):
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        # Extensions such as pg_trgm live in public
+        cursor.execute(f"SET SESSION search_path = {schema}, public")
+        # A test waiting on a lock fails instead of hanging the suite
+        cursor.execute("SET SESSION lock_timeout = '10s'")
+        cursor.close()
+        dbapi_connection.autocommit = autocommit
+
+
+@pytest.fixture
+def postgres_engines():
+    """
+    Yield a factory of engines on a throwaway schema of SOUNDBIRD_TEST_POSTGRES_URL.
+
+    `postgres_engines(**pool_options)` returns a sync engine and
+    `postgres_engines(asyncio=True)` an asyncio one; the schema and every
+    engine are dropped afterwards. Skips the test when no URL is set.
+    """
+    if not POSTGRES_URL:
+        pytest.skip("SOUNDBIRD_TEST_POSTGRES_URL is not set")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as conn:
+        # The species search index needs it, as in the migrations
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engines = []
+
+    def make(asyncio=False, **options):
+        if asyncio:
+            # asyncpg connections belong to one event loop, and tests start a new loop per asyncio.run
+            engine = create_async_engine(async_database_url(POSTGRES_URL), poolclass=NullPool, **options)
+            use_schema(engine.sync_engine, schema)
+        else:
+            engine = create_engine(POSTGRES_URL, **options)
+            use_schema(engine, schema)
+        engines.append(engine)
+        return engine
+
+    yield make
+
+    for engine in engines:
+        if hasattr(engine, "sync_engine"):
+            engine.sync_engine.dispose()
+        else:
+            engine.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
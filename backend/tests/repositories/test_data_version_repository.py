@@ -0,0 +1,31 @@
+import asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.data_version import Base
+from backend.app.repositories.data_version import DETECTIONS, AsyncDataVersionRepository, DataVersionRepository
+
+def test_bump_creates_and_increments_the_version(tmp_path):
+    url = f"sqlite:///{tmp_path / 'versions.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        repo = DataVersionRepository(db)
+        assert repo.get(DETECTIONS) == 0
+
+        repo.bump(DETECTIONS)
+        repo.bump(DETECTIONS)
+        db.commit()
+        assert repo.get(DETECTIONS) == 2
+        assert repo.get("recordings") == 0
+
+    async def read():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                return await AsyncDataVersionRepository(db).get(DETECTIONS)
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(read()) == 2
+    engine.dispose()
@@ -1,11 +1,22 @@
+import asyncio
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from pydantic import ValidationError
 from backend.app.models.detection import Base, Detection
-from backend.app.repositories.detection import DetectionRepository
+from backend.app.repositories.detection import AsyncDetectionRepository, DetectionRepository, filtered_detections_query
 from backend.app.schemas.detection import DetectionCreate
 from backend.app.models.recording import Recording
+from backend.app.models.tombstone import Tombstone
+from backend.app.repositories import changes as changes_module
+from backend.app.repositories.changes import change_seq
+from backend.app.repositories.data_version import DETECTIONS, DataVersionRepository
+from backend.app.utils.geo import GeoArea
+from backend.app.utils.pagination import InvalidCursorError, encode_cursor
+from backend.services.grid_cache import grid_cache
+from backend.services.query_cache import query_cache
 from datetime import datetime, UTC, timezone
 from typing import List, cast
 
@@ -134,6 +145,448 @@ def test_delete_detection_success(db_session):
     success = repo.delete_detection(saved[0].id)
     assert success is True
 
+def test_detection_writes_invalidate_cached_queries(db_session):
+    repo = DetectionRepository(db_session)
+    generation = query_cache.generation()
+    saved = repo.save_detections([DetectionCreate(
+        recording_id=1,
+        detection_time=datetime.now(UTC),
+        start_sec=0.0,
+        end_sec=1.0,
+        species="Red Bird",
+        scientific_name="Cardinalis cardinalis",
+        confidence=0.7,
+    )])
+    assert query_cache.generation() == generation + 1
+
+    repo.delete_detection(saved[0].id)
+    assert query_cache.generation() == generation + 2
+
 def test_delete_detection_not_found_returns_false(db_session):
     repo = DetectionRepository(db_session)
-    assert repo.delete_detection(9999) is False
\ No newline at end of file
+    assert repo.delete_detection(9999) is False
+def test_bulk_save_detections_returns_ids_in_order(db_session):
+    repo = DetectionRepository(db_session)
+    detections = [
+        DetectionCreate(
+            recording_id=1,
+            detection_time=datetime.now(UTC),
+            start_sec=3.0 * i,
+            end_sec=3.0 * i + 3.0,
+            species=f"Bird {i}",
+            scientific_name=f"Avis {i}",
+            confidence=0.5,
+        )
+        for i in range(50)
+    ]
+
+    ids = repo.bulk_save_detections(detections)
+
+    assert len(ids) == 50
+    assert [repo.get_detection(i).species for i in ids] == [f"Bird {i}" for i in range(50)]
+    assert repo.bulk_save_detections([]) == []
+
+@pytest.mark.parametrize("sort_by", ["detection_time", "confidence", None])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_get_detections_page_cursor_walks_every_row_once(db_session, sort_by, sort_order):
+    db_session.add(Recording(
+        id=1,
+        file_name="test.wav",
+        lat=48.5,
+        lon=-123.4,
+        recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status="COMPLETED"
+    ))
+    db_session.commit()
+    repo = DetectionRepository(db_session)
+    # Repeated times and confidences make the ID tie-breaker matter
+    repo.bulk_save_detections([
+        DetectionCreate(
+            recording_id=1,
+            detection_time=datetime(2025, 4, 25, 7, 30, i // 3, tzinfo=timezone.utc),
+            start_sec=float(i),
+            end_sec=float(i) + 3.0,
+            species=f"Bird {i}",
+            scientific_name=f"Avis {i}",
+            confidence=0.5 + (i % 4) / 10,
+        )
+        for i in range(23)
+    ])
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = repo.get_detections_page(limit=5, sort_by=sort_by, sort_order=sort_order, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected = repo.get_detections(limit=100, sort_by=sort_by, sort_order=sort_order)
+    assert len(seen) == 23
+    assert [d.species for d in seen] == [d.species for d in expected]
+
+def test_get_detections_page_rejects_cursor_for_other_sort_order(db_session):
+    repo = DetectionRepository(db_session)
+    cursor = encode_cursor("confidence", "desc", 0.9, 10)
+
+    with pytest.raises(InvalidCursorError):
+        repo.get_detections_page(sort_by="detection_time", cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        repo.get_detections_page(sort_by="confidence", cursor="not-a-cursor")
+
+def test_async_repository_matches_sync_pages(tmp_path):
+    # aiosqlite runs on its own connection, so share a database file instead of :memory:
+    url = f"sqlite:///{tmp_path / 'detections.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        db.add(Recording(
+            id=1,
+            file_name="20250425_073000.wav",
+            lat=48.4284,
+            lon=-123.3656,
+            recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+            status="COMPLETED"
+        ))
+        db.commit()
+        repo = DetectionRepository(db)
+        repo.bulk_save_detections([
+            DetectionCreate(
+                recording_id=1,
+                detection_time=datetime(2025, 4, 25, 7, 30, i, tzinfo=timezone.utc),
+                start_sec=float(i),
+                end_sec=float(i) + 3.0,
+                species="Blue Jay" if i % 2 else "American Robin",
+                scientific_name="Cyanocitta cristata" if i % 2 else "Turdus migratorius",
+                confidence=0.5 + (i % 5) / 10,
+            )
+            for i in range(12)
+        ])
+        expected_page, expected_cursor = repo.get_detections_page(limit=4, species="jay", sort_by="confidence")
+        expected_rest, _ = repo.get_detections_page(limit=10, species="jay", sort_by="confidence", cursor=expected_cursor)
+        expected_detection = repo.get_detection(3)
+
+    async def read():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                repo = AsyncDetectionRepository(db)
+                page, cursor = await repo.get_detections_page(limit=4, species="jay", sort_by="confidence")
+                rest, _ = await repo.get_detections_page(limit=10, species="jay", sort_by="confidence", cursor=cursor)
+                detection = await repo.get_detection(3)
+                missing = await repo.get_detection(999)
+                recording_detections = await repo.get_recording_detections(1)
+                batches = [batch async for batch in repo.stream_detections(species="robin", batch_size=4)]
+                return page, cursor, rest, detection, missing, recording_detections, batches
+        finally:
+            await async_engine.dispose()
+
+    page, cursor, rest, detection, missing, recording_detections, batches = asyncio.run(read())
+    sync_engine.dispose()
+
+    assert page == expected_page
+    assert cursor == expected_cursor
+    assert rest == expected_rest
+    assert len(page) + len(rest) == 6
+    assert detection.species == expected_detection.species
+    assert missing is None
+    assert [d.start_sec for d in recording_detections] == [float(i) for i in range(12)]
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert [r.start_sec for batch in batches for r in batch] == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+def test_get_detections_filters_by_location(db_session):
+    sites = {1: (48.4284, -123.3656), 2: (48.4700, -123.3000), 3: (49.2827, -123.1207)}
+    for recording_id, (lat, lon) in sites.items():
+        db_session.add(Recording(
+            id=recording_id,
+            file_name="20250425_073000.wav",
+            lat=lat,
+            lon=lon,
+            recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+            status="COMPLETED"
+        ))
+    db_session.commit()
+    repo = DetectionRepository(db_session)
+    repo.bulk_save_detections([
+        DetectionCreate(
+            recording_id=recording_id,
+            detection_time=datetime(2025, 4, 25, 7, 30, recording_id, tzinfo=timezone.utc),
+            start_sec=0.0,
+            end_sec=3.0,
+            species="American Robin",
+            scientific_name="Turdus migratorius",
+            confidence=0.8,
+        )
+        for recording_id in sites
+    ])
+
+    in_box = repo.get_detections(area=GeoArea.from_bbox("-123.5,48.3,-123.2,48.6"))
+    # Site 2 is about 6.4 km from site 1
+    within_5km = repo.get_detections(area=GeoArea.around("48.4284,-123.3656", 5))
+    within_10km = repo.get_detections(area=GeoArea.around("48.4284,-123.3656", 10))
+
+    assert sorted(d.lat for d in in_box) == [48.4284, 48.47]
+    assert [d.lat for d in within_5km] == [48.4284]
+    assert sorted(d.lat for d in within_10km) == [48.4284, 48.47]
+
+def test_location_filter_uses_the_geohash_index(db_session):
+    stmt = filtered_detections_query(None, None, None, GeoArea.around("48.4284,-123.3656", 5))
+    sql = str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    assert "ix_recordings_geohash" in plan
+
+def test_grid_counts_bin_detections_by_geohash_prefix(tmp_path):
+    url = f"sqlite:///{tmp_path / 'detections.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        sites = {1: (48.4284, -123.3656), 2: (48.4290, -123.3660), 3: (49.2827, -123.1207)}
+        for recording_id, (lat, lon) in sites.items():
+            db.add(Recording(
+                id=recording_id,
+                file_name="20250425_073000.wav",
+                lat=lat,
+                lon=lon,
+                recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+                status="COMPLETED"
+            ))
+        db.commit()
+        DetectionRepository(db).bulk_save_detections([
+            DetectionCreate(
+                recording_id=recording_id,
+                detection_time=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+                start_sec=0.0,
+                end_sec=3.0,
+                species=species,
+                scientific_name=species,
+                confidence=0.8,
+            )
+            for recording_id, species in [(1, "American Robin"), (2, "Blue Jay"), (2, "Blue Jay"), (3, "American Robin")]
+        ])
+
+    async def read():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                repo = AsyncDetectionRepository(db)
+                return (
+                    await repo.grid_counts(["c2"], 4),
+                    await repo.grid_counts(["c28"], 4, species="jay"),
+                    await repo.grid_counts([], 4),
+                )
+        finally:
+            await async_engine.dispose()
+
+    bins, jays, empty = asyncio.run(read())
+    sync_engine.dispose()
+
+    assert [(b.geohash, b.detection_count, b.species_count) for b in bins] == [("c287", 3, 2), ("c2b2", 1, 1)]
+    assert [(b.geohash, b.detection_count, b.species_count) for b in jays] == [("c287", 2, 1)]
+    assert empty == []
+
+def test_saving_detections_invalidates_cached_grid_tiles(db_session):
+    db_session.add(Recording(
+        id=1,
+        file_name="20250425_073000.wav",
+        lat=48.4284,
+        lon=-123.3656,
+        recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status="COMPLETED"
+    ))
+    db_session.commit()
+    grid_cache.clear()
+    grid_cache.put(("c2", 4, None), [], grid_cache.generation())
+    grid_cache.put(("9q", 4, None), [], grid_cache.generation())
+
+    DetectionRepository(db_session).bulk_save_detections([
+        DetectionCreate(
+            recording_id=1,
+            detection_time=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+            start_sec=0.0,
+            end_sec=3.0,
+            species="American Robin",
+            scientific_name="Turdus migratorius",
+            confidence=0.8,
+        )
+    ])
+
+    assert grid_cache.get(("c2", 4, None)) is None
+    assert grid_cache.get(("9q", 4, None)) == []
+    grid_cache.clear()
+
+def test_change_feed_reports_inserts_and_deletes_since_cursor(tmp_path):
+    url = f"sqlite:///{tmp_path / 'detections.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+
+    def changes(since, limit=1000):
+        async def read():
+            async with async_sessionmaker(async_engine)() as db:
+                return await AsyncDetectionRepository(db).get_changes(since, limit)
+        return asyncio.run(read())
+
+    def detection(recording_id, start_sec):
+        return DetectionCreate(
+            recording_id=recording_id,
+            detection_time=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+            start_sec=start_sec,
+            end_sec=start_sec + 3.0,
+            species="American Robin",
+            scientific_name="Turdus migratorius",
+            confidence=0.8,
+        )
+
+    with sessionmaker(bind=sync_engine)() as db:
+        for recording_id in (1, 2):
+            db.add(Recording(
+                id=recording_id,
+                file_name="20250425_073000.wav",
+                lat=48.4284,
+                lon=-123.3656,
+                recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+                status="COMPLETED"
+            ))
+        db.commit()
+        repo = DetectionRepository(db)
+        repo.bulk_save_detections([detection(1, 0.0), detection(1, 3.0), detection(2, 0.0)])
+
+        first = changes(0)
+        assert [d.id for d in first.detections] == [1, 2, 3]
+        assert [r.id for r in first.recordings] == [1, 2]
+        assert first.deleted == [] and not first.has_more
+        assert changes(first.cursor).detections == []
+
+        repo.delete_detection(1)
+        repo.bulk_save_detections([detection(2, 3.0)])
+        db.delete(db.get(Recording, 1))
+        db.commit()
+
+        later = changes(first.cursor)
+        assert [d.id for d in later.detections] == [4]
+        assert [(t.table_name, t.row_id) for t in later.deleted] == [
+            ("detections", 1), ("recordings", 1), ("detections", 2),
+        ]
+        assert later.cursor > first.cursor
+
+        # The second change (recording 2 being the first) is the first insert's transaction; the page ends there
+        page = changes(0, limit=2)
+        assert [r.id for r in page.recordings] == [2]
+        assert [d.id for d in page.detections] == [3]
+        assert page.has_more
+        rest = changes(page.cursor, limit=2)
+        assert rest.cursor > page.cursor
+
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+def test_change_feed_waits_for_running_writers_on_postgres(postgres_engines, monkeypatch):
+    # One connection per writer: taking a change_seq must not check out a second one
+    SPECIES = {1: ("American Robin", "Turdus migratorius"), 2: ("Song Sparrow", "Melospiza melodia")}
+    slow_engine = postgres_engines(pool_size=1, max_overflow=0, pool_timeout=2)
+    fast_engine = postgres_engines(pool_size=1, max_overflow=0, pool_timeout=2)
+    async_engine = postgres_engines(asyncio=True)
+    Base.metadata.create_all(bind=slow_engine)
+
+    def changes(since):
+        async def read():
+            async with async_sessionmaker(async_engine)() as db:
+                return await AsyncDetectionRepository(db).get_changes(since)
+        return asyncio.run(read())
+
+    # Each writer has its own recording and species, so neither waits on the other's row locks
+    def detection(recording_id, start_sec):
+        species, scientific_name = SPECIES[recording_id]
+        return DetectionCreate(
+            recording_id=recording_id,
+            detection_time=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+            start_sec=start_sec,
+            end_sec=start_sec + 3.0,
+            species=species,
+            scientific_name=scientific_name,
+            confidence=0.8,
+        )
+
+    with sessionmaker(bind=slow_engine)() as slow, sessionmaker(bind=fast_engine)() as fast:
+        for recording_id in SPECIES:
+            slow.add(Recording(
+                id=recording_id,
+                file_name="20250425_073000.wav",
+                lat=48.4284,
+                lon=-123.3656,
+                recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+                status="COMPLETED"
+            ))
+        slow.commit()
+        first = changes(0)
+        assert [r.id for r in first.recordings] == [1, 2]
+
+        # A slow writer takes its seq, then a later writer commits a higher one first
+        DetectionRepository(slow).bulk_save_detections([detection(1, 0.0)], commit=False)
+        DetectionRepository(fast).bulk_save_detections([detection(2, 3.0)])
+        waiting = changes(first.cursor)
+        assert waiting.detections == [] and waiting.cursor == first.cursor
+
+        slow.commit()
+        caught_up = changes(first.cursor)
+        assert [d.start_sec for d in caught_up.detections] == [0.0, 3.0]
+
+        # A rolled back writer releases its seq with the transaction
+        change_seq(slow)
+        slow.rollback()
+        DetectionRepository(fast).bulk_save_detections([detection(2, 6.0)])
+        assert [d.start_sec for d in changes(caught_up.cursor).detections] == [6.0]
+
+        # A writer seen between drawing its seq and locking it holds the whole feed back
+        monkeypatch.setattr(changes_module, "ALLOCATION_WAIT", 0.05)
+        slow.execute(
+            text("SELECT pg_advisory_xact_lock_shared(:space, :allocating)"),
+            {"space": changes_module.CHANGE_SEQ_LOCK_SPACE, "allocating": changes_module.ALLOCATING},
+        )
+        assert changes(0).cursor == 0
+        slow.rollback()
+        assert changes(0).cursor > caught_up.cursor
+
+def test_change_seq_bumps_the_data_version_only_at_commit(db_session):
+    versions = DataVersionRepository(db_session)
+    before = versions.get(DETECTIONS)
+
+    first = change_seq(db_session)
+    assert change_seq(db_session) == first
+    assert versions.get(DETECTIONS) == before
+    db_session.commit()
+    assert versions.get(DETECTIONS) == before + 1
+
+    assert change_seq(db_session) == first + 1
+    db_session.rollback()
+    assert versions.get(DETECTIONS) == before + 1
+
+def test_delete_detections_before_leaves_tombstones(db_session):
+    db_session.add(Recording(
+        id=1,
+        file_name="20250425_073000.wav",
+        lat=48.4284,
+        lon=-123.3656,
+        recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status="COMPLETED"
+    ))
+    db_session.commit()
+    repo = DetectionRepository(db_session)
+    ids = repo.bulk_save_detections([
+        DetectionCreate(
+            recording_id=1,
+            detection_time=datetime(year, 4, 25, 7, 30, tzinfo=timezone.utc),
+            start_sec=0.0,
+            end_sec=3.0,
+            species="American Robin",
+            scientific_name="Turdus migratorius",
+            confidence=0.8,
+        )
+        for year in (2024, 2025)
+    ])
+
+    assert repo.delete_detections_before(datetime(2025, 1, 1, tzinfo=timezone.utc)) == 1
+    tombstones = db_session.query(Tombstone).all()
+    assert [(t.table_name, t.row_id) for t in tombstones] == [("detections", ids[0])]
+    assert tombstones[0].change_seq > db_session.get(Detection, ids[1]).change_seq
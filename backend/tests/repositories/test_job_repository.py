@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.job import Base, JobStatus
+from backend.app.models.recording import Recording, RecordingStatus
+from backend.app.repositories.job import JobRepository
+from backend.app.repositories.recording import RecordingRepository
+from datetime import datetime, timedelta, timezone
+
+# Create in-memory test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def create_queued_recording(db_session, job_id, file_name="20250425_073000.wav"):
+    return RecordingRepository(db_session).create(
+        file_name,
+        48.5,
+        -123.4,
+        datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        job_id=job_id,
+        file_path=f"/tmp/{file_name}",
+    )
+
+def test_claim_next_pending_claims_oldest_job_recording(db_session):
+    job = JobRepository(db_session).create("upload.zip")
+    first = create_queued_recording(db_session, job.id)
+    create_queued_recording(db_session, job.id, "20250425_080000.wav")
+
+    claimed = RecordingRepository(db_session).claim_next_pending()
+
+    assert claimed is not None
+    assert claimed.id == first.id
+    assert claimed.status == RecordingStatus.PROCESSING
+
+def test_claim_next_pending_ignores_synchronous_recordings(db_session):
+    repo = RecordingRepository(db_session)
+    repo.create("20250425_073000.wav", 48.5, -123.4, datetime.now(timezone.utc))
+
+    assert repo.claim_next_pending() is None
+
+def test_requeue_interrupted_returns_expired_claims_to_pending(db_session):
+    job = JobRepository(db_session).create("upload.zip")
+    recording = create_queued_recording(db_session, job.id)
+    repo = RecordingRepository(db_session)
+    repo.claim_next_pending()
+    db_session.query(Recording).filter(Recording.id == recording.id).update(
+        {"claimed_at": datetime.now(timezone.utc) - timedelta(minutes=10)}
+    )
+    db_session.commit()
+
+    assert repo.requeue_interrupted(lease_timeout=300) == 1
+    db_session.expire_all()
+    assert repo.get(recording.id).status == RecordingStatus.PENDING
+    assert repo.get(recording.id).claimed_at is None
+
+def test_requeue_interrupted_leaves_live_claims_alone(db_session):
+    job = JobRepository(db_session).create("upload.zip")
+    stale = create_queued_recording(db_session, job.id)
+    live = create_queued_recording(db_session, job.id, "20250425_080000.wav")
+    repo = RecordingRepository(db_session)
+    repo.claim_next_pending()
+    repo.claim_next_pending()
+    db_session.query(Recording).filter(Recording.id == stale.id).update(
+        {"claimed_at": datetime.now(timezone.utc) - timedelta(minutes=10)}
+    )
+    db_session.commit()
+
+    # Another worker still analyzing `live` renews its claim
+    assert repo.renew_claims([live.id]) == 1
+    assert repo.requeue_interrupted(lease_timeout=300) == 1
+    db_session.expire_all()
+    assert repo.get(stale.id).status == RecordingStatus.PENDING
+    assert repo.get(live.id).status == RecordingStatus.PROCESSING
+
+def test_claim_next_pending_skips_recordings_claimed_meanwhile(db_session):
+    job = JobRepository(db_session).create("upload.zip")
+    first = create_queued_recording(db_session, job.id)
+    second = create_queued_recording(db_session, job.id, "20250425_080000.wav")
+    other_worker = TestingSessionLocal()
+    try:
+        # The other worker claims `first` between this worker's SELECT and UPDATE
+        real_scalar = db_session.scalar
+        def scalar_then_race(statement, *args, **kwargs):
+            candidate = real_scalar(statement, *args, **kwargs)
+            if candidate == first.id and other_worker.get(Recording, first.id).status == RecordingStatus.PENDING:
+                RecordingRepository(other_worker).claim_next_pending()
+            return candidate
+        db_session.scalar = scalar_then_race
+
+        claimed = RecordingRepository(db_session).claim_next_pending()
+    finally:
+        other_worker.close()
+
+    assert claimed.id == second.id
+
+def test_job_status_follows_recordings(db_session):
+    job_repo = JobRepository(db_session)
+    recording_repo = RecordingRepository(db_session)
+    job = job_repo.create("upload.zip")
+    first = create_queued_recording(db_session, job.id)
+    second = create_queued_recording(db_session, job.id, "20250425_080000.wav")
+
+    assert job_repo.derive_status(job_repo.get_status_counts(job.id)) == JobStatus.PENDING
+
+    recording_repo.update_status(first.id, RecordingStatus.COMPLETED)
+    assert job_repo.derive_status(job_repo.get_status_counts(job.id)) == JobStatus.PROCESSING
+
+    recording_repo.update_status(second.id, RecordingStatus.FAILED, error_message="boom")
+    counts = job_repo.get_status_counts(job.id)
+    assert counts[RecordingStatus.COMPLETED] == 1
+    assert counts[RecordingStatus.FAILED] == 1
+    assert job_repo.derive_status(counts) == JobStatus.COMPLETED
+    assert job_repo.get_recording_ids(job.id) == [first.id, second.id]
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.recording import Base, RecordingStatus
+from backend.app.repositories.recording import RecordingRepository
+from backend.services.query_cache import query_cache
+from datetime import datetime, timezone
+
+# Create in-memory test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+CONTENT_HASH = "a" * 64
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def create_analyzed_recording(db_session, status=RecordingStatus.COMPLETED):
+    repo = RecordingRepository(db_session)
+    recording = repo.create(
+        "20250425_073000.wav", 48.5, -123.4, datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc)
+    )
+    repo.set_analysis_params(recording.id, CONTENT_HASH, 0.5, 16)
+    repo.update_status(recording.id, status)
+    return recording
+
+def test_find_analyzed_matches_hash_and_parameters(db_session):
+    recording = create_analyzed_recording(db_session)
+
+    match = RecordingRepository(db_session).find_analyzed(CONTENT_HASH, 0.5, 48.5, -123.4, 16)
+
+    assert match is not None
+    assert match.id == recording.id
+
+def test_find_analyzed_requires_same_parameters(db_session):
+    create_analyzed_recording(db_session)
+    repo = RecordingRepository(db_session)
+
+    assert repo.find_analyzed(CONTENT_HASH, 0.3, 48.5, -123.4, 16) is None
+    assert repo.find_analyzed(CONTENT_HASH, 0.5, 49.0, -123.4, 16) is None
+    assert repo.find_analyzed(CONTENT_HASH, 0.5, 48.5, -123.4, 17) is None
+    assert repo.find_analyzed("b" * 64, 0.5, 48.5, -123.4, 16) is None
+
+def test_find_analyzed_ignores_unfinished_and_excluded_recordings(db_session):
+    failed = create_analyzed_recording(db_session, status=RecordingStatus.FAILED)
+    completed = create_analyzed_recording(db_session)
+    repo = RecordingRepository(db_session)
+
+    assert repo.find_analyzed(CONTENT_HASH, 0.5, 48.5, -123.4, 16, exclude_id=completed.id) is None
+    assert repo.find_analyzed(CONTENT_HASH, 0.5, 48.5, -123.4, 16).id != failed.id
+
+def test_update_status_sets_completed_at_only_when_completed(db_session):
+    repo = RecordingRepository(db_session)
+    recording = repo.create(
+        "20250425_073000.wav", 48.5, -123.4, datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status=RecordingStatus.PROCESSING,
+    )
+    assert recording.completed_at is None
+
+    repo.update_status(recording.id, RecordingStatus.COMPLETED)
+    db_session.refresh(recording)
+    assert recording.completed_at is not None
+
+    repo.update_status(recording.id, RecordingStatus.FAILED, error_message="boom")
+    db_session.refresh(recording)
+    assert recording.completed_at is None
+
+def test_deferred_writes_are_committed_together(db_session):
+    repo = RecordingRepository(db_session)
+    recording = repo.create(
+        "20250425_073000.wav", 48.5, -123.4, datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status=RecordingStatus.PROCESSING,
+    )
+    recording_id = recording.id
+
+    repo.set_analysis_params(recording_id, CONTENT_HASH, 0.5, 16, commit=False)
+    repo.update_status(recording_id, RecordingStatus.COMPLETED, commit=False)
+    db_session.rollback()
+
+    recording = repo.get(recording_id)
+    assert recording.status == RecordingStatus.PROCESSING
+    assert recording.content_hash is None
+
+def test_status_changes_invalidate_cached_queries(db_session):
+    repo = RecordingRepository(db_session)
+    recording = repo.create(
+        "20250425_073000.wav", 48.5, -123.4, datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status=RecordingStatus.PROCESSING,
+    )
+    generation = query_cache.generation()
+
+    repo.update_status(recording.id, RecordingStatus.COMPLETED, commit=False)
+    assert query_cache.generation() == generation
+    db_session.commit()
+    assert query_cache.generation() == generation + 1
+
+    repo.update_status(999, RecordingStatus.FAILED)
+    assert query_cache.generation() == generation + 1
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.species import Base, Species
+from backend.app.repositories.species import SpeciesRepository
+
+# Create in-memory test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_get_or_create_ids_reuses_existing_species(db_session):
+    repo = SpeciesRepository(db_session)
+
+    first = repo.get_or_create_ids([("Turdus migratorius", "American Robin"), ("Turdus migratorius", "American Robin")])
+    second = repo.get_or_create_ids([("Turdus migratorius", "American Robin"), ("Cyanocitta cristata", "Blue Jay")])
+
+    assert second[("Turdus migratorius", "American Robin")] == first[("Turdus migratorius", "American Robin")]
+    assert len(set(second.values())) == 2
+    assert db_session.query(Species).count() == 2
+
+def test_search_matches_common_or_scientific_name(db_session):
+    repo = SpeciesRepository(db_session)
+    repo.get_or_create_ids([
+        ("Turdus migratorius", "American Robin"),
+        ("Erithacus rubecula", "European Robin"),
+        ("Cyanocitta cristata", "Blue Jay"),
+    ])
+
+    assert [s.common_name for s in repo.search("robin")] == ["American Robin", "European Robin"]
+    assert [s.common_name for s in repo.search("CYANO")] == ["Blue Jay"]
+    assert len(repo.search(limit=2)) == 2
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.species_daily import Base, SpeciesDaily
+from backend.app.models.recording import Recording
+from backend.app.repositories.detection import DetectionRepository
+from backend.app.repositories.stats import StatsRepository
+from backend.app.schemas.detection import DetectionCreate
+from datetime import date, datetime
+
+# Create in-memory test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add_all([
+        Recording(id=1, file_name="20250425_060000.wav", lat=48.5, lon=-123.4,
+                  recording_datetime=datetime(2025, 4, 25, 6), status="COMPLETED"),
+        Recording(id=2, file_name="20250425_061000.wav", lat=48.5, lon=-123.4,
+                  recording_datetime=datetime(2025, 4, 25, 6, 10), status="COMPLETED"),
+        Recording(id=3, file_name="20250425_060000.wav", lat=49.0, lon=-123.0,
+                  recording_datetime=datetime(2025, 4, 25, 6), status="COMPLETED"),
+    ])
+    session.commit()
+    yield session
+    session.rollback()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def detection(recording_id, minute, confidence, species="American Robin", scientific_name="Turdus migratorius", day=25):
+    return DetectionCreate(
+        recording_id=recording_id,
+        detection_time=datetime(2025, 4, day, 6, minute),
+        start_sec=0.0,
+        end_sec=3.0,
+        species=species,
+        scientific_name=scientific_name,
+        confidence=confidence,
+    )
+
+def test_rollup_accumulates_across_inserts(db_session):
+    repo = DetectionRepository(db_session)
+    repo.bulk_save_detections([detection(1, 1, 0.5), detection(1, 2, 0.7), detection(1, 3, 0.9, "Blue Jay", "Cyanocitta cristata")])
+    repo.save_detections([detection(2, 12, 0.6), detection(2, 14, 0.8, day=26)])
+
+    rows = StatsRepository(db_session).daily_counts(species="robin", lat=48.5, lon=-123.4)
+
+    assert [(r["day"], r["detection_count"]) for r in rows] == [(date(2025, 4, 25), 3), (date(2025, 4, 26), 1)]
+    first_day = rows[0]
+    assert first_day["max_confidence"] == 0.7
+    assert first_day["mean_confidence"] == pytest.approx(0.6)
+    assert first_day["first_detection"] == datetime(2025, 4, 25, 6, 1)
+    assert first_day["last_detection"] == datetime(2025, 4, 25, 6, 12)
+
+def test_rollup_follows_deletes(db_session):
+    repo = DetectionRepository(db_session)
+    ids = repo.bulk_save_detections([detection(1, 1, 0.5), detection(1, 2, 0.9), detection(3, 5, 0.4)])
+
+    repo.delete_detection(ids[1])
+    row = db_session.query(SpeciesDaily).filter(SpeciesDaily.lat == 48.5).one()
+    assert (row.detection_count, row.max_confidence, row.last_detection) == (1, 0.5, datetime(2025, 4, 25, 6, 1))
+
+    repo.delete_recording_detections(1)
+    assert db_session.query(SpeciesDaily).filter(SpeciesDaily.lat == 48.5).count() == 0
+    assert db_session.query(SpeciesDaily).count() == 1
+
+def test_species_and_site_totals(db_session):
+    DetectionRepository(db_session).bulk_save_detections([
+        detection(1, 1, 0.5),
+        detection(1, 2, 0.7, day=26),
+        detection(3, 3, 0.9),
+        detection(3, 4, 0.6, "Blue Jay", "Cyanocitta cristata"),
+    ])
+    stats = StatsRepository(db_session)
+
+    totals = stats.species_totals()
+    assert [(t["species"], t["detection_count"], t["days_detected"]) for t in totals] == [
+        ("American Robin", 3, 2),
+        ("Blue Jay", 1, 1),
+    ]
+    assert [t["species"] for t in stats.species_totals(end_date=date(2025, 4, 25), lat=49.0, lon=-123.0)] == [
+        "American Robin",
+        "Blue Jay",
+    ]
+
+    sites = stats.site_totals()
+    assert [(s["lat"], s["detection_count"], s["species_count"]) for s in sites] == [(48.5, 2, 1), (49.0, 2, 2)]
+
+def test_rollup_follows_retention_deletes(db_session):
+    repo = DetectionRepository(db_session)
+    repo.bulk_save_detections([detection(1, 1, 0.5, day=24), detection(1, 2, 0.9, day=25), detection(1, 3, 0.7, day=25)])
+
+    deleted = repo.delete_detections_before(datetime(2025, 4, 25, 6, 2, 30))
+
+    assert deleted == 2
+    rows = StatsRepository(db_session).daily_counts()
+    assert [(r["day"], r["detection_count"], r["max_confidence"]) for r in rows] == [(date(2025, 4, 25), 1, 0.7)]
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from backend.services.analysis_executor import AnalysisExecutor
+
+
+def test_analysis_executor_refuses_work_beyond_concurrency_and_queue():
+    executor = AnalysisExecutor(max_concurrency=1, max_queued=1)
+
+    assert executor.try_admit()
+    assert executor.try_admit()
+    assert not executor.try_admit()
+
+    # A finished analysis frees its slot for the next request
+    executor.release()
+    assert executor.try_admit()
+
+    executor.release()
+    executor.release()
+    executor.shutdown()
+
+def test_analysis_executor_runs_blocking_work_off_the_event_loop():
+    executor = AnalysisExecutor(max_concurrency=2, max_queued=0)
+    loop_thread = threading.get_ident()
+
+    def blocking_work(value):
+        return value * 2, threading.current_thread().name, threading.get_ident()
+
+    async def main():
+        return await executor.run(blocking_work, 21)
+
+    result, thread_name, thread_id = asyncio.run(main())
+    executor.shutdown()
+
+    assert result == 42
+    assert thread_name.startswith("analysis")
+    assert thread_id != loop_thread
+
+class ExclusiveAnalyzer:
+    """
+    Stands in for a BirdNET Analyzer and fails if two threads use it at once.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def predict(self, started: threading.Barrier):
+        assert self.lock.acquire(blocking=False), "analyzer used by two threads at once"
+        try:
+            self.calls += 1
+            # Hold the model until the other analysis is running too
+            started.wait(timeout=5)
+        finally:
+            self.lock.release()
+        return self
+
+def test_concurrent_analyses_each_use_their_own_analyzer():
+    created = []
+
+    def analyzer_factory():
+        created.append(ExclusiveAnalyzer())
+        return created[-1]
+
+    executor = AnalysisExecutor(max_concurrency=2, max_queued=0, analyzer_factory=analyzer_factory)
+    started = threading.Barrier(2)
+
+    def analyze(started, analyzer):
+        return analyzer.predict(started)
+
+    async def main():
+        first = await asyncio.gather(
+            executor.run_with_analyzer(analyze, started),
+            executor.run_with_analyzer(analyze, started),
+        )
+        # Threads keep their analyzer for later work instead of loading another
+        second = await asyncio.gather(
+            executor.run_with_analyzer(analyze, started),
+            executor.run_with_analyzer(analyze, started),
+        )
+        return first, second
+
+    first, second = asyncio.run(main())
+    executor.shutdown()
+
+    assert first[0] is not first[1]
+    assert set(map(id, second)) == set(map(id, first))
+    assert len(created) == 2
+    assert sum(analyzer.calls for analyzer in created) == 4
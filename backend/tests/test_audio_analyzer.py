@@ -1,15 +1,51 @@
 # backend/tests/test_audio_analyzer.py
 
+import importlib
 import pytest
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 from typing import List, Dict, Any
+from types import SimpleNamespace
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from backend.app import config
+from backend.app.models.detection import Base, Detection
+from backend.app.models.recording import Recording, RecordingStatus
+from backend.app.repositories.recording import RecordingRepository
+from backend.app.repositories.stats import StatsRepository
+from backend.app.routes.analyze import analyze_wav_upload
+from backend.services import audio_analyzer
 from backend.services.audio_analyzer import (
     calculate_detection_time,
     analyze_audio_file,
+    analyze_or_reuse,
+    detections_from_scores,
+    find_active_windows,
+    iter_audio_windows,
+    rethreshold_recording,
+    save_birdnet_detections,
 )
+from backend.services.score_store import ScoreWriter, load_scores
 from birdnetlib.analyzer import Analyzer
+import numpy as np
+import soundfile as sf
+
+# Create in-memory test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+LABELS = ["Corvus corax_Common Raven", "Turdus migratorius_American Robin"]
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
 
 def test_calculate_detection_time_valid():
     filename = "20231001_123456.WAV"
@@ -55,3 +91,135 @@ def test_analyze_audio_file_mocked(mock_recording_class):
     assert results[0]["species"] == "Raven"
     assert results[0]["confidence"] == 0.85
     assert results[0]["detection_time"] == "2023-10-01T12:35:08.300000"
+
+def test_iter_audio_windows_matches_birdnet_splitting(tmp_path):
+    # 10.7 s of stereo audio: three full windows plus a 1.7 s tail that gets padded
+    wav_path = tmp_path / "20231001_123456.wav"
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, (int(48000 * 10.7), 2))
+    sf.write(wav_path, samples, 48000, subtype="FLOAT")
+
+    windows = list(iter_audio_windows(wav_path, overlap=0.0, block_frames=48000))
+
+    assert [start for start, _ in windows] == [0.0, 3.0, 6.0, 9.0]
+    assert all(len(window) == 144000 for _, window in windows)
+    mono = samples.mean(axis=1).astype(np.float32)
+    assert np.allclose(windows[1][1], mono[144000:288000], atol=1e-6)
+    assert not windows[-1][1][int(48000 * 1.7):].any()
+
+def test_iter_audio_windows_applies_overlap_and_drops_short_tail(tmp_path):
+    wav_path = tmp_path / "20231001_123456.wav"
+    sf.write(wav_path, np.zeros(int(48000 * 7.2), dtype=np.float32), 48000)
+
+    windows = list(iter_audio_windows(wav_path, overlap=1.0))
+
+    # Windows start every 2 s; the one at 6 s would only hold 1.2 s of audio
+    assert [start for start, _ in windows] == [0.0, 2.0, 4.0]
+
+@pytest.mark.parametrize("overlap", [3.0, 4.5, -0.5])
+def test_iter_audio_windows_rejects_overlaps_outside_a_window(tmp_path, overlap):
+    wav_path = tmp_path / "20231001_123456.wav"
+    sf.write(wav_path, np.zeros(48000 * 6, dtype=np.float32), 48000)
+
+    with pytest.raises(ValueError, match="overlap"):
+        next(iter_audio_windows(wav_path, overlap=overlap))
+
+@pytest.mark.parametrize("overlap", ["3", "-1"])
+def test_config_rejects_overlaps_outside_a_window(monkeypatch, overlap):
+    monkeypatch.setenv("SOUNDBIRD_ANALYSIS_OVERLAP", overlap)
+    try:
+        with pytest.raises(ValueError, match="SOUNDBIRD_ANALYSIS_OVERLAP"):
+            importlib.reload(config)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+def test_find_active_windows_keeps_only_windows_above_noise_floor(tmp_path):
+    # 30 s of faint noise with a 4 kHz call in the window starting at 12 s
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 0.001, 48000 * 30).astype(np.float32)
+    t = np.arange(int(48000 * 0.5)) / 48000
+    samples[48000 * 13:48000 * 13 + len(t)] += 0.1 * np.sin(2 * np.pi * 4000 * t)
+    wav_path = tmp_path / "20231001_123456.wav"
+    sf.write(wav_path, samples, 48000)
+
+    active = find_active_windows(wav_path, overlap=0.0, margin_db=8.0)
+
+    assert active.tolist() == [False] * 4 + [True] + [False] * 5
+
+def test_find_active_windows_skips_digital_silence(tmp_path):
+    wav_path = tmp_path / "20231001_123456.wav"
+    sf.write(wav_path, np.zeros(48000 * 9, dtype=np.float32), 48000)
+
+    assert not find_active_windows(wav_path, overlap=0.0).any()
+
+def test_detections_from_scores_applies_threshold_and_allow_list():
+    labels = ["Corvus corax_Common Raven", "Turdus migratorius_American Robin", "Picoides pubescens_Downy Woodpecker"]
+    scores = np.array([[0.9, 0.2, 0.6], [0.1, 0.7, 0.3]], dtype=np.float16)
+
+    detections = list(detections_from_scores(labels, [0.0, 3.0], scores, 0.5, {labels[0], labels[1]}))
+
+    assert [(d["start_time"], d["common_name"]) for d in detections] == [
+        (0.0, "Common Raven"),
+        (3.0, "American Robin"),
+    ]
+    assert detections[1]["end_time"] == 6.0
+
+
+def create_recording(db_session, file_name="20250425_073000.wav"):
+    return RecordingRepository(db_session).create(
+        file_name, 48.5, -123.4, datetime(2025, 4, 25, 7, 30), status=RecordingStatus.PROCESSING
+    )
+
+def create_analyzed_recording(db_session, scores_dir):
+    # Analyzed by BirdNET, with its window scores stored
+    recording = create_recording(db_session)
+    scores = np.array([[0.9, 0.2], [0.1, 0.7]])
+    with ScoreWriter(recording.id, len(LABELS), scores_dir) as writer:
+        writer.write([0.0, 3.0], scores)
+    raw_detections = list(detections_from_scores(LABELS, [0.0, 3.0], scores))
+    save_birdnet_detections(Path(recording.file_name), recording, raw_detections, db_session, "c" * 64, commit=False)
+    RecordingRepository(db_session).update_status(recording.id, RecordingStatus.COMPLETED)
+    return recording
+
+def test_reuse_chain_links_to_the_analyzed_recording(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_analyzer, "load_scores", lambda recording_id: load_scores(recording_id, tmp_path))
+    wav_path = Path("20250425_073000.wav")
+    recording_repo = RecordingRepository(db_session)
+    first = create_analyzed_recording(db_session, tmp_path)
+
+    # B reuses A, then C finds B as the most recent identical upload
+    second = create_recording(db_session)
+    assert analyze_or_reuse(wav_path, None, second.id, db_session, "c" * 64)[1]
+    third = create_recording(db_session)
+    assert analyze_or_reuse(wav_path, None, third.id, db_session, "c" * 64)[1]
+
+    db_session.expire_all()
+    assert recording_repo.get(second.id).reused_from_id == first.id
+    assert recording_repo.get(third.id).reused_from_id == first.id
+
+    results = rethreshold_recording(third.id, SimpleNamespace(labels=LABELS), db_session, 0.15, location_filter=False)
+
+    assert [(r.start_sec, r.species) for r in results] == [
+        (0.0, "Common Raven"),
+        (0.0, "American Robin"),
+        (3.0, "American Robin"),
+    ]
+
+def test_failed_detection_insert_leaves_recording_failed(db_session, tmp_path, monkeypatch):
+    create_analyzed_recording(db_session, tmp_path)
+
+    def fail_insert(self, detection_ids):
+        raise RuntimeError("insert failed")
+
+    # Fails after the detection rows were inserted, inside the same transaction
+    monkeypatch.setattr(StatsRepository, "add_detections", fail_insert)
+    detections, recording_ids, _ = analyze_wav_upload(
+        Path("20250425_073000.wav"), "c" * 64, analyzer=None, lat=48.5, lon=-123.4, force=False, db=db_session
+    )
+
+    assert detections == [] and recording_ids == []
+    db_session.expire_all()
+    recording = db_session.scalars(select(Recording).order_by(Recording.id.desc())).first()
+    assert recording.status == RecordingStatus.FAILED
+    assert recording.content_hash is None
+    assert db_session.scalar(select(func.count()).where(Detection.recording_id == recording.id)) == 0
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from backend.app.schemas.detection import DetectionColumnarResponse
+from backend.app.utils.columnar import to_columnar
+
+
+def result_row(second, species, scientific_name, file_name, lat):
+    # A row of the detections page query, as cached
+    return {
+        "id": second,
+        "detection_time": datetime(2025, 4, 25, 6, 0, second),
+        "species": species,
+        "scientific_name": scientific_name,
+        "confidence": 0.5 + second / 100,
+        "start_sec": float(second),
+        "end_sec": float(second) + 3.0,
+        "file_name": file_name,
+        "recording_datetime": datetime(2025, 4, 25, 6, 0),
+        "lat": lat,
+        "lon": -123.3656,
+    }
+
+
+def test_to_columnar_dictionary_encodes_species_and_recordings():
+    rows = [
+        result_row(1, "American Robin", "Turdus migratorius", "20250425_060000.wav", 48.4),
+        result_row(2, "Blue Jay", "Cyanocitta cristata", "20250425_060000.wav", 48.4),
+        result_row(3, "American Robin", "Turdus migratorius", "20250425_060000.wav", 49.0),
+    ]
+
+    columns = to_columnar(rows)
+
+    assert columns["confidence"] == [0.51, 0.52, 0.53]
+    assert columns["species_index"] == [0, 1, 0]
+    assert columns["species"] == [
+        {"species": "American Robin", "scientific_name": "Turdus migratorius"},
+        {"species": "Blue Jay", "scientific_name": "Cyanocitta cristata"},
+    ]
+    # Same file name at another site is another recording
+    assert columns["recording_index"] == [0, 0, 1]
+    assert [r["lat"] for r in columns["recordings"]] == [48.4, 49.0]
+    DetectionColumnarResponse(**columns)
+
+
+def test_to_columnar_of_an_empty_page():
+    columns = to_columnar([])
+
+    assert columns["detection_time"] == []
+    assert columns["species"] == [] and columns["recordings"] == []
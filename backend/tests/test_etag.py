@@ -0,0 +1,19 @@
+from backend.app.utils.etag import etag_matches, weak_etag
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = weak_etag("detections", 7)
+
+    assert etag == 'W/"detections-7"'
+    assert etag_matches('W/"detections-7"', etag)
+    assert etag_matches('"detections-7"', etag)
+    assert etag_matches('W/"other-1", W/"detections-7"', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_does_not_match_other_versions_or_missing_header():
+    etag = weak_etag("detections", 7)
+
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches('W/"detections-6"', etag)
@@ -0,0 +1,70 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import msgpack
+
+from backend.app.utils.export import EXPORT_COLUMNS, csv_chunks, msgpack_chunks, ndjson_chunks
+
+
+def row(i):
+    return (
+        i,
+        datetime(2025, 4, 25, 6, 0, i),
+        "American Robin",
+        "Turdus migratorius",
+        0.5 + i / 100,
+        float(i),
+        float(i) + 3.0,
+        "20250425_060000.wav",
+        datetime(2025, 4, 25, 6, 0),
+        48.4284,
+        -123.3656,
+    )
+
+
+def encode(encoder, batches):
+    async def source():
+        for batch in batches:
+            yield batch
+
+    async def collect():
+        return [chunk async for chunk in encoder(source())]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_writes_one_object_per_detection():
+    chunks = encode(ndjson_chunks, [[row(1), row(2)], [row(3)]])
+
+    assert len(chunks) == 2
+    objects = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [o["id"] for o in objects] == [1, 2, 3]
+    assert objects[0]["detection_time"] == "2025-04-25T06:00:01"
+    assert list(objects[0]) == EXPORT_COLUMNS
+
+
+def test_csv_writes_header_once():
+    data = b"".join(encode(csv_chunks, [[row(1)], [row(2)]])).decode()
+
+    rows = list(csv.reader(io.StringIO(data)))
+    assert rows[0] == EXPORT_COLUMNS
+    assert [r[0] for r in rows[1:]] == ["1", "2"]
+
+
+def test_csv_without_matches_is_just_the_header():
+    data = b"".join(encode(csv_chunks, [])).decode()
+
+    assert list(csv.reader(io.StringIO(data))) == [EXPORT_COLUMNS]
+
+
+def test_msgpack_writes_one_columnar_map_per_batch():
+    data = b"".join(encode(msgpack_chunks, [[row(1), row(2)], [row(3)]]))
+
+    maps = list(msgpack.Unpacker(io.BytesIO(data), timestamp=3))
+    assert len(maps) == 2
+    assert maps[0]["id"] == [1, 2]
+    assert maps[1]["species"] == ["American Robin"]
+    assert maps[0]["detection_time"][0] == datetime(2025, 4, 25, 6, 0, 1, tzinfo=timezone.utc)
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from backend.app.schemas.detection import DetectionResponse
+from backend.app.utils import fast_json
+
+FIELDS = list(DetectionResponse.model_fields)
+
+
+def result_row(tzinfo):
+    # A row of the detections page query, as cached
+    return {
+        "id": 7,
+        "detection_time": datetime(2025, 4, 25, 6, 0, 1, 250000, tzinfo=tzinfo),
+        "species": "American Robin",
+        "scientific_name": "Turdus migratorius",
+        "confidence": 0.5,
+        "start_sec": 1.0,
+        "end_sec": 4.0,
+        "file_name": "20250425_060000.wav",
+        "recording_datetime": datetime(2025, 4, 25, 6, 0, tzinfo=tzinfo),
+        "lat": 48.4284,
+        "lon": -123.3656,
+    }
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(fast_json, "orjson", None)
+    elif fast_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("tzinfo", [timezone.utc, None])
+def test_rows_serialize_like_the_response_model(encoder, tzinfo):
+    row = result_row(tzinfo)
+
+    fast = fast_json.dumps(fast_json.rows_to_dicts([row], FIELDS))
+    expected = TypeAdapter(List[DetectionResponse]).dump_json([DetectionResponse(**row)])
+
+    assert fast == expected
+    assert "id" not in json.loads(fast)[0]
+
+@pytest.mark.parametrize("tzinfo", [timezone.utc, None])
+def test_rows_read_back_from_json_serialize_the_same(encoder, tzinfo):
+    rows = fast_json.rows_to_dicts([result_row(tzinfo)], FIELDS)
+
+    # Shared query caches store pages as JSON, so datetimes come back as strings
+    cached = fast_json.loads(fast_json.dumps(rows))
+
+    assert fast_json.dumps(cached) == fast_json.dumps(rows)
+    assert TypeAdapter(List[DetectionResponse]).dump_json([DetectionResponse(**cached[0])]) == fast_json.dumps(rows)
@@ -0,0 +1,29 @@
+# backend/tests/test_file_utils.py
+
+import asyncio
+import hashlib
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from backend.app.utils.file_utils import save_upload
+
+def test_save_upload_streams_file_and_returns_checksum(tmp_path):
+    data = b"RIFF" + bytes(range(256)) * 100
+    upload = UploadFile(file=io.BytesIO(data), filename="20250425_073000.wav")
+    dest = tmp_path / "20250425_073000.wav"
+
+    size, checksum = asyncio.run(save_upload(upload, dest, max_bytes=1024 * 1024, chunk_size=1000))
+
+    assert size == len(data)
+    assert checksum == hashlib.sha256(data).hexdigest()
+    assert dest.read_bytes() == data
+
+def test_save_upload_rejects_oversized_file(tmp_path):
+    upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="archive.zip")
+    dest = tmp_path / "archive.zip"
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(save_upload(upload, dest, max_bytes=4096, chunk_size=1024))
+
+    assert exc_info.value.status_code == 413
+    assert not dest.exists()
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from backend.app.utils.geo import GeoArea, decode_bounds, encode_geohash, zoom_precision
+
+
+def test_encode_geohash_known_points():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode_geohash(48.4284, -123.3656, 5) == "c2878"
+
+
+def test_covering_cells_contain_every_point_of_the_area():
+    area = GeoArea.from_bbox("-123.5,48.3,-123.2,48.6")
+    cells = area.covering_cells()
+
+    assert 1 < len(cells) <= 32
+    rng = random.Random(0)
+    for _ in range(500):
+        lat = rng.uniform(area.min_lat, area.max_lat)
+        lon = rng.uniform(area.min_lon, area.max_lon)
+        assert any(encode_geohash(lat, lon).startswith(cell) for cell in cells)
+
+
+def test_around_builds_a_box_around_the_circle():
+    area = GeoArea.around("48.4284,-123.3656", 10)
+
+    assert area.center == (48.4284, -123.3656)
+    assert area.max_lat - area.min_lat == pytest.approx(2 * 10 / 110.574)
+    # A degree of longitude is shorter than a degree of latitude at 48°N
+    assert area.max_lon - area.min_lon > area.max_lat - area.min_lat
+
+
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "10,0,5,1", "0,-91,1,0"])
+def test_from_bbox_rejects_bad_boxes(bbox):
+    with pytest.raises(ValueError):
+        GeoArea.from_bbox(bbox)
+
+
+def test_around_rejects_bad_input():
+    with pytest.raises(ValueError):
+        GeoArea.around("48.4", 5)
+    with pytest.raises(ValueError):
+        GeoArea.around("48.4,-123.3", 0)
+
+
+def test_decode_bounds_contains_the_encoded_point():
+    min_lat, min_lon, max_lat, max_lon = decode_bounds(encode_geohash(48.4284, -123.3656, 6))
+
+    assert min_lat <= 48.4284 < max_lat
+    assert min_lon <= -123.3656 < max_lon
+    assert decode_bounds("") == (-90.0, -180.0, 90.0, 180.0)
+
+
+def test_cells_at_cover_the_box_and_match_their_count():
+    area = GeoArea.from_bbox("-124,48,-123,49.5")
+
+    for precision in range(5):
+        cells = area.cells_at(precision)
+        assert len(cells) == area.count_cells_at(precision)
+        assert all(area.intersects(*decode_bounds(cell)) for cell in cells)
+
+
+def test_zoom_precision_grows_with_zoom():
+    precisions = [zoom_precision(z) for z in range(23)]
+
+    assert precisions == sorted(precisions)
+    assert precisions[0] == 1
+    assert precisions[-1] <= 12
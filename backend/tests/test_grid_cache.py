@@ -0,0 +1,74 @@
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.services.grid_cache import GridTileCache, grid_cache, mark_dirty
+
+
+def test_grid_cache_invalidates_tiles_containing_the_location():
+    cache = GridTileCache(maxsize=8)
+    generation = cache.generation()
+    cache.put(("c2", 4, None), [{"geohash": "c287"}], generation)
+    cache.put(("c28", 5, None), [{"geohash": "c2878"}], generation)
+    cache.put(("c2b", 5, None), [{"geohash": "c2b2q"}], generation)
+    cache.put(("9q", 4, None), [{"geohash": "9q8y"}], generation)
+
+    cache.invalidate(["c2878qrt5y1z"])
+
+    assert cache.get(("c2", 4, None)) is None
+    assert cache.get(("c28", 5, None)) is None
+    assert cache.get(("c2b", 5, None)) == [{"geohash": "c2b2q"}]
+    assert cache.get(("9q", 4, None)) == [{"geohash": "9q8y"}]
+    assert cache.stats() == {"hits": 2, "misses": 2, "invalidations": 1, "size": 2, "maxsize": 8, "ttl": cache.ttl}
+
+def test_grid_cache_skips_results_read_before_an_invalidation():
+    cache = GridTileCache(maxsize=8)
+    generation = cache.generation()
+    cache.invalidate(["c2878qrt5y1z"])
+
+    cache.put(("c2", 4, None), [], generation)
+    assert cache.get(("c2", 4, None)) is None
+
+    cache.put(("c2", 4, None), [], cache.generation())
+    assert cache.get(("c2", 4, None)) == []
+
+def test_grid_cache_expires_tiles_after_ttl(monkeypatch):
+    cache = GridTileCache(maxsize=8, ttl=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.put(("c2", 4, None), [{"geohash": "c287"}], cache.generation())
+    assert cache.get(("c2", 4, None)) == [{"geohash": "c287"}]
+
+    # Counts changed by another process are picked up once the tile expires
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert cache.get(("c2", 4, None)) is None
+    assert cache.stats()["size"] == 0
+
+def test_grid_cache_evicts_least_recently_used_and_clears_on_empty_geohash():
+    cache = GridTileCache(maxsize=2)
+    cache.put(("a", 3, None), [], 0)
+    cache.put(("b", 3, None), [], 0)
+    cache.get(("a", 3, None))
+    cache.put(("c", 3, None), [], 0)
+
+    assert cache.get(("b", 3, None)) is None
+    assert cache.get(("a", 3, None)) == []
+
+    cache.invalidate([""])
+    assert cache.stats()["size"] == 0
+
+def test_mark_dirty_invalidates_on_commit_only():
+    session = sessionmaker(bind=create_engine("sqlite:///:memory:"))()
+    grid_cache.clear()
+    grid_cache.put(("c2", 4, None), [], grid_cache.generation())
+
+    mark_dirty(session, ["c2878qrt5y1z"])
+    session.rollback()
+    assert grid_cache.get(("c2", 4, None)) == []
+
+    mark_dirty(session, ["c2878qrt5y1z"])
+    session.commit()
+    assert grid_cache.get(("c2", 4, None)) is None
+    session.close()
+    grid_cache.clear()
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from pathlib import Path
+
+from backend.services.inference_pool import InferencePool
+
+
+class FakeExecutor:
+    def __init__(self, broken: bool):
+        self.broken = broken
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if self.broken:
+            raise BrokenProcessPool("worker died")
+        future = Future()
+        future.set_result(args)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class FakeInferencePool(InferencePool):
+    """
+    InferencePool whose first executor is broken and whose replacements work.
+    """
+
+    def __init__(self):
+        self.created = []
+        super().__init__(num_workers=2, threads_per_worker=1)
+
+    def _create_executor(self):
+        # Widen the window in which concurrent submitters see the broken executor
+        threading.Event().wait(0.01)
+        executor = FakeExecutor(broken=not self.created)
+        self.created.append(executor)
+        return executor
+
+
+def test_concurrent_submitters_restart_broken_pool_once():
+    pool = FakeInferencePool()
+    broken = pool.created[0]
+    barrier = threading.Barrier(8)
+    results = []
+
+    def submit():
+        barrier.wait()
+        results.append(pool.submit(Path("a.wav"), 48.5, -123.4, date(2025, 4, 25)).result())
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert len(pool.created) == 2
+    assert broken.shut_down
+    assert not pool.created[1].shut_down
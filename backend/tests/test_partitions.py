@@ -0,0 +1,184 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.detection import Base
+from backend.app.models.recording import Recording
+from backend.app.models.tombstone import Tombstone
+from backend.app.repositories.detection import DetectionRepository, filtered_detections_query
+from backend.app.repositories.stats import StatsRepository
+from backend.app.schemas.detection import DetectionCreate
+from backend.services.partitions import (
+    PartitionMaintainer,
+    add_months,
+    apply_retention,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_name,
+)
+
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(bind=engine)
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert add_months(date(2025, 4, 1), 0) == date(2025, 4, 1)
+
+
+def test_partition_name():
+    assert partition_name(date(2025, 4, 1)) == "detections_p2025_04"
+
+
+def test_maintenance_is_a_noop_without_partitioning():
+    db = TestingSessionLocal()
+    try:
+        assert not is_partitioned(db)
+        assert ensure_partitions(db, months_ahead=3) == []
+        assert apply_retention(db, retention_months=1) == []
+    finally:
+        db.close()
+
+    # Must not raise on a database without a detections table at all
+    PartitionMaintainer(TestingSessionLocal).run_once()
+
+
+@pytest.fixture
+def partitioned_db(postgres_engines):
+    """
+    Yield a session on a PostgreSQL schema whose detections table is partitioned
+    like migration 3f7b9e1a2c58 leaves it, without any monthly partition yet.
+    """
+    engine = postgres_engines()
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER SEQUENCE detections_id_seq OWNED BY NONE"))
+        conn.execute(text("ALTER TABLE detections RENAME TO detections_plain"))
+        conn.execute(text(
+            "CREATE TABLE detections (LIKE detections_plain INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (detection_time)"
+        ))
+        conn.execute(text("DROP TABLE detections_plain"))
+        conn.execute(text("ALTER TABLE detections ADD CONSTRAINT detections_pkey PRIMARY KEY (id, detection_time)"))
+        conn.execute(text("ALTER SEQUENCE detections_id_seq OWNED BY detections.id"))
+        conn.execute(text("CREATE INDEX ix_detections_detection_time ON detections (detection_time)"))
+        conn.execute(text("CREATE INDEX ix_detections_change_seq ON detections (change_seq)"))
+        conn.execute(text("CREATE TABLE detections_default PARTITION OF detections DEFAULT"))
+    db = sessionmaker(bind=engine)()
+    db.add(Recording(
+        id=1,
+        file_name="20250425_073000.wav",
+        lat=48.4284,
+        lon=-123.3656,
+        recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        status="COMPLETED",
+    ))
+    db.commit()
+    yield db
+    db.close()
+
+
+def detection(detection_time: datetime) -> DetectionCreate:
+    return DetectionCreate(
+        recording_id=1,
+        detection_time=detection_time,
+        start_sec=0.0,
+        end_sec=3.0,
+        species="American Robin",
+        scientific_name="Turdus migratorius",
+        confidence=0.8,
+    )
+
+
+def test_retention_leaves_tombstones_for_dropped_partitions(partitioned_db):
+    db = partitioned_db
+    ensure_partitions(db, months_ahead=3, today=date(2025, 1, 15))
+    repo = DetectionRepository(db)
+    expired = repo.bulk_save_detections([
+        detection(datetime(2025, 1, 10, tzinfo=timezone.utc)),
+        detection(datetime(2025, 1, 20, tzinfo=timezone.utc)),
+        # Before every monthly partition: lands in the default partition
+        detection(datetime(2024, 6, 1, tzinfo=timezone.utc)),
+    ])
+    kept = repo.bulk_save_detections([detection(datetime(2025, 4, 1, tzinfo=timezone.utc))])
+
+    dropped = apply_retention(db, retention_months=1, today=date(2025, 4, 15))
+
+    assert dropped == ["detections_p2025_01", "detections_p2025_02", "detections_p2025_03"]
+    tombstones = db.scalars(select(Tombstone).order_by(Tombstone.row_id)).all()
+    assert [(t.table_name, t.row_id) for t in tombstones] == [("detections", i) for i in sorted(expired)]
+    assert db.scalar(text("SELECT array_agg(id) FROM detections")) == kept
+
+
+def test_new_partition_takes_over_rows_from_the_default_partition(partitioned_db):
+    db = partitioned_db
+    ensure_partitions(db, months_ahead=0, today=date(2025, 1, 15))
+    # February has no partition yet, as when maintenance was down at the start of the month
+    ids = DetectionRepository(db).bulk_save_detections([detection(datetime(2025, 2, 3, tzinfo=timezone.utc))])
+    assert db.scalar(text("SELECT tableoid::regclass::text FROM detections")) == "detections_default"
+
+    assert ensure_partitions(db, months_ahead=0, today=date(2025, 2, 15)) == ["detections_p2025_02"]
+
+    assert db.execute(text("SELECT id, tableoid::regclass::text FROM detections")).all() == [
+        (ids[0], "detections_p2025_02"),
+    ]
+    assert is_partitioned(db) and db.scalar(text("SELECT count(*) FROM detections_default")) == 0
+    assert db.scalar(text(
+        "SELECT partdefid::regclass::text FROM pg_partitioned_table WHERE partrelid = 'detections'::regclass"
+    )) == "detections_default"
+
+
+def test_ensure_partitions_creates_one_partition_per_utc_month(partitioned_db):
+    db = partitioned_db
+    assert is_partitioned(db)
+
+    created = ensure_partitions(db, months_ahead=2, today=date(2025, 11, 20))
+
+    assert created == ["detections_p2025_11", "detections_p2025_12", "detections_p2026_01"]
+    assert list_partitions(db) == [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)]
+    assert db.scalar(text(
+        "SELECT pg_get_expr(relpartbound, oid) FROM pg_class WHERE relname = 'detections_p2025_12'"
+    )) == "FOR VALUES FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')"
+    # Running again only adds what is missing
+    assert ensure_partitions(db, months_ahead=3, today=date(2025, 11, 20)) == ["detections_p2026_02"]
+
+
+def test_retention_keeps_stats_consistent_with_detections(partitioned_db):
+    db = partitioned_db
+    ensure_partitions(db, months_ahead=3, today=date(2025, 1, 15))
+    kept_time = datetime(2025, 4, 2, 6, tzinfo=timezone.utc)
+    DetectionRepository(db).bulk_save_detections([
+        detection(datetime(2024, 12, 30, tzinfo=timezone.utc)),
+        detection(datetime(2025, 1, 10, tzinfo=timezone.utc)),
+        detection(datetime(2025, 3, 31, 23, tzinfo=timezone.utc)),
+        detection(kept_time),
+    ])
+
+    apply_retention(db, retention_months=1, today=date(2025, 4, 15))
+
+    stats = StatsRepository(db)
+    [totals] = stats.species_totals()
+    assert totals["detection_count"] == db.scalar(text("SELECT count(*) FROM detections")) == 1
+    assert totals["first_detection"] == kept_time
+    assert [row["day"] for row in stats.daily_counts()] == [date(2025, 4, 2)]
+
+
+def test_time_bounded_queries_only_read_matching_partitions(partitioned_db):
+    db = partitioned_db
+    ensure_partitions(db, months_ahead=3, today=date(2025, 1, 15))
+    stmt = filtered_detections_query(
+        None,
+        datetime(2025, 2, 10, tzinfo=timezone.utc),
+        datetime(2025, 2, 20, tzinfo=timezone.utc),
+    )
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+
+    plan = "\n".join(db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars())
+
+    assert "detections_p2025_02" in plan
+    for pruned in ("detections_p2025_01", "detections_p2025_03", "detections_p2025_04", "detections_default"):
+        assert pruned not in plan
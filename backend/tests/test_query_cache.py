@@ -0,0 +1,241 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.data_version import Base, DataVersion
+from backend.app.models.detection import Detection
+from backend.app.models.recording import Recording
+from backend.app.repositories.data_version import DETECTIONS, AsyncDataVersionRepository, DataVersionRepository
+from backend.app.repositories.detection import DetectionRepository
+from backend.app.routes.detections import cached_detections_page, get_detection
+from backend.app.schemas.detection import DetectionCreate
+from backend.services import query_cache as query_cache_module
+from backend.services.query_cache import QueryCache, cache_key, mark_stale, query_cache
+
+
+class DictRedis:
+    """Stands in for an asyncio Redis client with the few commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+        self.expiry[key] = px
+
+
+def detection(second):
+    return DetectionCreate(
+        recording_id=1,
+        detection_time=datetime(2025, 4, 25, 7, 30, second, tzinfo=timezone.utc),
+        start_sec=float(second),
+        end_sec=float(second) + 3.0,
+        species="American Robin",
+        scientific_name="Turdus migratorius",
+        confidence=0.8,
+    )
+
+def test_cache_key_normalizes_parameter_order_and_time_zones():
+    utc = datetime(2025, 4, 25, 7, tzinfo=timezone.utc)
+    pacific = utc.astimezone(timezone(timedelta(hours=-7)))
+
+    assert cache_key("detections", limit=10, start_date=utc) == cache_key("detections", start_date=pacific, limit=10)
+    assert cache_key("detections", limit=10) != cache_key("detections", limit=20)
+
+def test_query_cache_serves_entries_of_the_current_generation_only():
+    cache = QueryCache(maxsize=4, ttl=30)
+    generation = cache.generation()
+
+    async def main():
+        await cache.put("a", [1, 2], generation)
+        assert await cache.get("a", cache.generation()) == [1, 2]
+        cache.bump()
+        assert await cache.get("a", cache.generation()) is None
+        # A result read before the bump lands under the old generation and is never served
+        await cache.put("a", [1], generation)
+        assert await cache.get("a", cache.generation()) is None
+
+    asyncio.run(main())
+    assert cache.stats()["hit_rate"] == 0.333
+
+def test_query_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache_module.time, "monotonic", lambda: now[0])
+    cache = QueryCache(maxsize=2, ttl=5)
+
+    async def main():
+        await cache.put("a", "A", 0)
+        await cache.put("b", "B", 0)
+        await cache.get("a", 0)
+        await cache.put("c", "C", 0)
+
+        assert await cache.get("b", 0) is None
+        assert await cache.get("a", 0) == "A"
+        now[0] += 5
+        assert await cache.get("a", 0) is None
+
+    asyncio.run(main())
+    assert cache.stats()["size"] == 1
+
+def test_query_cache_with_zero_ttl_is_disabled():
+    cache = QueryCache(ttl=0)
+
+    async def main():
+        await cache.put("a", "A", 0)
+        return await cache.get("a", 0)
+
+    assert asyncio.run(main()) is None
+
+def test_query_cache_shares_entries_through_redis_as_json():
+    client = DictRedis()
+    first = QueryCache(ttl=2.5, client=client)
+    second = QueryCache(ttl=2.5, client=client)
+    page = ([{"species": "American Robin", "detection_time": datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc)}], None)
+
+    async def main():
+        await first.put("a", page, 3)
+        shared = await second.get("a", 3)
+        # A newer data version, whichever worker committed it, misses the old entry
+        newer = await second.get("a", 4)
+        return shared, newer
+
+    shared, newer = asyncio.run(main())
+
+    assert shared == [[{"species": "American Robin", "detection_time": "2025-04-25T07:30:00Z"}], None]
+    assert client.data["soundbird:query:3:a"].startswith(b"[[{")
+    assert client.expiry["soundbird:query:3:a"] == 2500
+    assert newer is None
+    assert second.stats()["backend"] == "redis"
+
+def test_query_cache_ignores_entries_that_are_not_json():
+    client = DictRedis()
+    client.data["soundbird:query:3:a"] = b"\x80\x04K\x01."
+    cache = QueryCache(ttl=30, client=client)
+
+    assert asyncio.run(cache.get("a", 3)) is None
+
+def test_detection_pages_follow_data_versions_committed_elsewhere(tmp_path):
+    url = f"sqlite:///{tmp_path / 'detections.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        db.add(Recording(
+            id=1,
+            file_name="20250425_073000.wav",
+            lat=48.4284,
+            lon=-123.3656,
+            recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        ))
+        db.commit()
+        DetectionRepository(db).bulk_save_detections([detection(0)])
+
+    def commit_elsewhere():
+        # Another API process writes: the data version moves, but this process's commit hooks never run
+        with sync_engine.begin() as conn:
+            conn.execute(insert(Detection), [{**detection(1).model_dump(), "species_id": 1, "change_seq": 99}])
+            conn.execute(update(DataVersion).where(DataVersion.name == DETECTIONS).values(version=DataVersion.version + 1))
+
+    async def read_page(db):
+        version = await AsyncDataVersionRepository(db).get(DETECTIONS)
+        rows, _ = await cached_detections_page(
+            db, version, limit=10, species=None, start_date=None, end_date=None,
+            sort_by=None, sort_order="desc", cursor=None, skip=0, area=None,
+        )
+        return version, len(rows)
+
+    async def read():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+            async with sessions() as db:
+                before = await read_page(db)
+            generation = query_cache.generation()
+            commit_elsewhere()
+            async with sessions() as db:
+                after = await read_page(db)
+            return before, after, generation
+        finally:
+            await async_engine.dispose()
+
+    query_cache.clear()
+    (old_version, old_count), (new_version, new_count), generation = asyncio.run(read())
+    sync_engine.dispose()
+
+    assert query_cache.generation() == generation
+    assert new_version == old_version + 1
+    assert (old_count, new_count) == (1, 2)
+    query_cache.clear()
+
+def test_detection_etag_only_validates_that_detection(tmp_path):
+    url = f"sqlite:///{tmp_path / 'detections.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        db.add(Recording(
+            id=1,
+            file_name="20250425_073000.wav",
+            lat=48.4284,
+            lon=-123.3656,
+            recording_datetime=datetime(2025, 4, 25, 7, 30, tzinfo=timezone.utc),
+        ))
+        db.commit()
+        detection_id = DetectionRepository(db).bulk_save_detections([detection(0)])[0]
+        version = DataVersionRepository(db).get(DETECTIONS)
+    sync_engine.dispose()
+
+    async def get(db, id, if_none_match):
+        response = Response()
+        try:
+            result = await get_detection(id, response, db=db, if_none_match=if_none_match)
+        except HTTPException as exc:
+            return exc.status_code, None
+        if isinstance(result, Response):
+            return result.status_code, result.headers["ETag"]
+        return 200, response.headers["ETag"]
+
+    async def main():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                _, etag = await get(db, detection_id, None)
+                return etag, [
+                    await get(db, detection_id, etag),
+                    await get(db, detection_id, f'W/"detections-{version}"'),
+                    await get(db, detection_id + 1, etag),
+                    await get(db, detection_id + 1, f'W/"detections-{version}"'),
+                    await get(db, detection_id + 1, "*"),
+                ]
+        finally:
+            await async_engine.dispose()
+
+    etag, statuses = asyncio.run(main())
+
+    assert etag == f'W/"detection-{detection_id}-{version}"'
+    assert [status for status, _ in statuses] == [304, 200, 404, 404, 404]
+
+def test_mark_stale_bumps_generation_and_data_version_on_commit_only():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    generation = query_cache.generation()
+
+    mark_stale(session)
+    session.rollback()
+    assert query_cache.generation() == generation
+    assert DataVersionRepository(session).get(DETECTIONS) == 0
+
+    mark_stale(session)
+    session.commit()
+    assert query_cache.generation() == generation + 1
+    mark_stale(session)
+    session.commit()
+    assert DataVersionRepository(session).get(DETECTIONS) == 2
+    session.close()
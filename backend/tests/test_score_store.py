@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from backend.services.score_store import ScoreWriter, load_scores
+
+
+def test_score_writer_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    batches = [rng.random((8, 5)), rng.random((3, 5))]
+
+    with ScoreWriter(42, num_labels=5, scores_dir=tmp_path) as writer:
+        writer.write([0.0, 3.0, 6.0, 9.0, 12.0, 15.0, 18.0, 21.0], batches[0])
+        writer.write([24.0, 27.0, 30.0], batches[1])
+
+    starts, scores = load_scores(42, scores_dir=tmp_path)
+
+    assert scores.dtype == np.float16
+    assert scores.shape == (11, 5)
+    assert starts.tolist() == [3.0 * i for i in range(11)]
+    assert np.allclose(scores, np.concatenate(batches), atol=1e-3)
+
+def test_score_writer_discards_partial_file_on_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with ScoreWriter(7, num_labels=5, scores_dir=tmp_path) as writer:
+            writer.write([0.0], np.zeros((1, 5)))
+            raise RuntimeError("inference failed")
+
+    assert load_scores(7, scores_dir=tmp_path) is None
+    assert list(tmp_path.iterdir()) == []
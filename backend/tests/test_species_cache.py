@@ -0,0 +1,38 @@
+from backend.services.species_cache import SpeciesListCache
+
+
+class CountingAnalyzer:
+    """Stands in for the BirdNET Analyzer and counts species-range model runs."""
+
+    def __init__(self):
+        self.calls = []
+
+    def return_predicted_species_list(self, lon=None, lat=None, week_48=None):
+        self.calls.append((lat, lon, week_48))
+        return [f"Species {lat} {lon} {week_48}_Bird"]
+
+
+def test_species_cache_shares_lists_for_rounded_location_and_week():
+    analyzer = CountingAnalyzer()
+    cache = SpeciesListCache(maxsize=4, precision=2)
+
+    first = cache.get(analyzer, 48.4312, -123.3651, 16)
+    second = cache.get(analyzer, 48.4298, -123.3702, 16)
+
+    assert first is second
+    assert analyzer.calls == [(48.43, -123.37, 16)]
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 4}
+
+def test_species_cache_separates_weeks_and_evicts_least_recently_used():
+    analyzer = CountingAnalyzer()
+    cache = SpeciesListCache(maxsize=2, precision=2)
+
+    cache.get(analyzer, 48.43, -123.37, 16)
+    cache.get(analyzer, 48.43, -123.37, 17)
+    cache.get(analyzer, 48.43, -123.37, 16)
+    cache.get(analyzer, 49.0, -123.0, 16)
+    cache.get(analyzer, 48.43, -123.37, 17)
+
+    # Week 17 was the least recently used when the third list arrived, so it was recomputed
+    assert len(analyzer.calls) == 4
+    assert cache.stats()["size"] == 2
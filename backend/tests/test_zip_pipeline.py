@@ -0,0 +1,95 @@
+# backend/tests/test_zip_pipeline.py
+
+import io
+import zipfile
+import pytest
+from backend.services.zip_pipeline import (
+    UnsafeArchiveError,
+    iter_extracted_wavs,
+    list_wav_members,
+)
+
+def build_zip(members, compression=zipfile.ZIP_STORED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=compression) as zip_out:
+        for name, data in members.items():
+            zip_out.writestr(name, data)
+    buffer.seek(0)
+    return zipfile.ZipFile(buffer)
+
+def test_list_wav_members_skips_hidden_and_non_wav_files():
+    zip_ref = build_zip({
+        "site/20250425_073000.WAV": b"a",
+        "__MACOSX/site/._20250425_073000.WAV": b"b",
+        "notes.txt": b"c",
+        "20250425_080000.wav": b"d",
+    })
+
+    members, duplicates = list_wav_members(zip_ref)
+
+    assert [member.filename for member in members] == ["site/20250425_073000.WAV", "20250425_080000.wav"]
+    assert duplicates == []
+
+def test_list_wav_members_reports_duplicate_file_names():
+    zip_ref = build_zip({
+        "site_a/20250425_073000.wav": b"a",
+        "site_b/20250425_073000.wav": b"b",
+        "20250425_080000.wav": b"c",
+    })
+
+    members, duplicates = list_wav_members(zip_ref)
+
+    assert [member.filename for member in members] == ["site_a/20250425_073000.wav", "20250425_080000.wav"]
+    assert duplicates == ["site_b/20250425_073000.wav"]
+
+def test_list_wav_members_rejects_oversized_member():
+    zip_ref = build_zip({"20250425_073000.wav": b"x" * 2048})
+
+    with pytest.raises(UnsafeArchiveError):
+        list_wav_members(zip_ref, max_member_bytes=1024)
+
+def test_list_wav_members_rejects_archive_over_total_size():
+    zip_ref = build_zip({f"20250425_07{i}000.wav": b"x" * 1024 for i in range(3)})
+
+    with pytest.raises(UnsafeArchiveError):
+        list_wav_members(zip_ref, max_total_bytes=2048)
+
+def test_list_wav_members_rejects_too_many_members():
+    zip_ref = build_zip({f"20250425_07{i}000.wav": b"x" for i in range(3)})
+
+    with pytest.raises(UnsafeArchiveError):
+        list_wav_members(zip_ref, max_members=2)
+
+def test_list_wav_members_rejects_suspicious_compression_ratio():
+    zip_ref = build_zip({"20250425_073000.wav": b"\0" * 100_000}, compression=zipfile.ZIP_DEFLATED)
+
+    with pytest.raises(UnsafeArchiveError):
+        list_wav_members(zip_ref, max_ratio=50, ratio_min_bytes=0)
+
+def test_list_wav_members_accepts_small_silent_member():
+    zip_ref = build_zip({"20250425_073000.wav": b"\0" * 100_000}, compression=zipfile.ZIP_DEFLATED)
+
+    members, _ = list_wav_members(zip_ref, max_ratio=50, ratio_min_bytes=1024 * 1024)
+
+    assert len(members) == 1
+
+def test_iter_extracted_wavs_yields_files_in_archive_order(tmp_path):
+    zip_ref = build_zip({f"20250425_07{i}000.wav": bytes([i]) * 10 for i in range(5)})
+    members, _ = list_wav_members(zip_ref)
+
+    seen = []
+    for wav_file in iter_extracted_wavs(zip_ref, members, tmp_path, depth=1):
+        seen.append((wav_file.name, wav_file.read_bytes()))
+        wav_file.unlink()
+
+    assert seen == [(f"20250425_07{i}000.wav", bytes([i]) * 10) for i in range(5)]
+
+def test_iter_extracted_wavs_cleans_up_when_closed_early(tmp_path):
+    zip_ref = build_zip({f"20250425_07{i}000.wav": b"x" for i in range(5)})
+    wav_files = iter_extracted_wavs(zip_ref, list_wav_members(zip_ref)[0], tmp_path, depth=2)
+
+    first = next(wav_files)
+    first.unlink()
+    wav_files.close()
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,108 @@
+"""partition detections by month
+
+Revision ID: 3f7b9e1a2c58
+Revises: 5d8f2a6c9b41
+Create Date: 2026-10-17 10:42:05.118392
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7b9e1a2c58'
+down_revision: Union[str, None] = '5d8f2a6c9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Upcoming months created up front; the app's partition maintainer keeps extending them
+MONTHS_AHEAD = 3
+
+# Secondary indexes of detections, recreated on the partitioned table (and so on every partition)
+INDEXES = [
+    ('ix_detections_id', ['id']),
+    ('ix_detections_recording_id', ['recording_id']),
+    ('ix_detections_species_id', ['species_id']),
+    ('ix_detections_detection_time', ['detection_time']),
+    ('ix_detections_species', ['species']),
+    ('ix_detections_scientific_name', ['scientific_name']),
+    ('ix_detections_detection_time_id', ['detection_time', 'id']),
+    ('ix_detections_confidence_id', ['confidence', 'id']),
+]
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rebuild_detections(partitioned: bool) -> None:
+    """
+    Copy detections into a new table with the same columns, partitioned or not.
+
+    The id sequence is kept, so IDs carry on where they stopped.
+    """
+    bind = op.get_bind()
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE detections RENAME TO detections_old')
+    op.execute('ALTER TABLE detections_old RENAME CONSTRAINT detections_pkey TO detections_old_pkey')
+    op.execute('ALTER SEQUENCE detections_id_seq OWNED BY NONE')
+
+    if partitioned:
+        op.execute(
+            'CREATE TABLE detections (LIKE detections_old INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (detection_time)'
+        )
+        # A partitioned table's primary key must include the partition key
+        op.execute('ALTER TABLE detections ADD CONSTRAINT detections_pkey PRIMARY KEY (id, detection_time)')
+
+        # One partition per month from the oldest detection to a few months ahead
+        oldest = bind.execute(sa.text(
+            "SELECT min(detection_time) AT TIME ZONE 'UTC' FROM detections_old"
+        )).scalar()
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = min(oldest.date().replace(day=1), current) if oldest else current
+        while month <= add_months(current, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE detections_p{month.year:04d}_{month.month:02d} PARTITION OF detections "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+            month = add_months(month, 1)
+        # Catches rows outside every monthly range (e.g. recordings from years ago)
+        op.execute('CREATE TABLE detections_default PARTITION OF detections DEFAULT')
+    else:
+        op.execute('CREATE TABLE detections (LIKE detections_old INCLUDING DEFAULTS)')
+        op.execute('ALTER TABLE detections ADD CONSTRAINT detections_pkey PRIMARY KEY (id)')
+
+    op.execute('INSERT INTO detections SELECT * FROM detections_old')
+    op.execute('DROP TABLE detections_old')
+    op.execute('ALTER SEQUENCE detections_id_seq OWNED BY detections.id')
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'detections', columns, unique=False)
+    op.create_foreign_key('fk_detections_recording_id', 'detections', 'recordings', ['recording_id'], ['id'])
+    op.create_foreign_key('fk_detections_species_id', 'detections', 'species', ['species_id'], ['id'])
+    op.execute('ANALYZE detections')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite (tests, local development) keeps a plain table
+        op.create_index('ix_detections_recording_id', 'detections', ['recording_id'], unique=False)
+        return
+    rebuild_detections(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index('ix_detections_recording_id', table_name='detections')
+        return
+    rebuild_detections(partitioned=False)
+    op.drop_index('ix_detections_recording_id', table_name='detections')
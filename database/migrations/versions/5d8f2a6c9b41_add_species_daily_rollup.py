@@ -0,0 +1,52 @@
+"""add species daily rollup
+
+Revision ID: 5d8f2a6c9b41
+Revises: e4a9c3b7d210
+Create Date: 2026-10-16 23:58:12.340871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8f2a6c9b41'
+down_revision: Union[str, None] = 'e4a9c3b7d210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('species_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('species_id', sa.Integer(), nullable=False),
+    sa.Column('lat', sa.Float(), nullable=False),
+    sa.Column('lon', sa.Float(), nullable=False),
+    sa.Column('detection_count', sa.Integer(), nullable=False),
+    sa.Column('confidence_sum', sa.Float(), nullable=False),
+    sa.Column('max_confidence', sa.Float(), nullable=False),
+    sa.Column('first_detection', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_detection', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['species_id'], ['species.id'], ),
+    sa.PrimaryKeyConstraint('day', 'species_id', 'lat', 'lon')
+    )
+    op.create_index('ix_species_daily_species_id_day', 'species_daily', ['species_id', 'day'], unique=False)
+
+    # Backfill from every existing detection
+    op.execute(
+        "INSERT INTO species_daily (day, species_id, lat, lon, detection_count, confidence_sum, "
+        "max_confidence, first_detection, last_detection) "
+        "SELECT date(d.detection_time), d.species_id, r.lat, r.lon, count(d.id), sum(d.confidence), "
+        "max(d.confidence), min(d.detection_time), max(d.detection_time) "
+        "FROM detections d JOIN recordings r ON d.recording_id = r.id "
+        "GROUP BY date(d.detection_time), d.species_id, r.lat, r.lon"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_species_daily_species_id_day', table_name='species_daily')
+    op.drop_table('species_daily')
@@ -0,0 +1,61 @@
+"""add change_seq leases
+
+Revision ID: a4c7e2d9f516
+Revises: f3a6c8d1b274
+Create Date: 2026-10-19 14:05:31.284719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2d9f516'
+down_revision: Union[str, None] = 'f3a6c8d1b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'change_seq_leases',
+        sa.Column('seq', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+
+    # change_seqs were the detections data version so far; the new counter
+    # continues after every seq already stored
+    bind = op.get_bind()
+    data_versions = sa.table('data_versions', sa.column('name'), sa.column('version'))
+    current = max(
+        bind.execute(
+            sa.select(data_versions.c.version).where(data_versions.c.name == 'detections')
+        ).scalar() or 0,
+        *(
+            bind.execute(sa.text(f'SELECT max(change_seq) FROM {table}')).scalar() or 0
+            for table in ('detections', 'recordings', 'tombstones')
+        ),
+    )
+    if current:
+        op.bulk_insert(data_versions, [{'name': 'change_seq', 'version': current}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The detections data version must not fall behind the seqs handed out since
+    bind = op.get_bind()
+    data_versions = sa.table('data_versions', sa.column('name'), sa.column('version'))
+    allocated = bind.execute(
+        sa.select(data_versions.c.version).where(data_versions.c.name == 'change_seq')
+    ).scalar() or 0
+    bind.execute(
+        data_versions.update()
+        .where(data_versions.c.name == 'detections', data_versions.c.version < allocated)
+        .values(version=allocated)
+    )
+    bind.execute(data_versions.delete().where(data_versions.c.name == 'change_seq'))
+    op.drop_table('change_seq_leases')
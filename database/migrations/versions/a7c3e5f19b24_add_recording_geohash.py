@@ -0,0 +1,48 @@
+"""add recording geohash
+
+Revision ID: a7c3e5f19b24
+Revises: 3f7b9e1a2c58
+Create Date: 2026-10-17 14:03:51.602114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.app.utils.geo import encode_geohash
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f19b24'
+down_revision: Union[str, None] = '3f7b9e1a2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('recordings', sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    # Backfill from the existing coordinates
+    bind = op.get_bind()
+    recordings = sa.table('recordings', sa.column('id'), sa.column('lat'), sa.column('lon'), sa.column('geohash'))
+    rows = bind.execute(sa.select(recordings.c.id, recordings.c.lat, recordings.c.lon)).all()
+    if rows:
+        bind.execute(
+            recordings.update()
+            .where(recordings.c.id == sa.bindparam('row_id'))
+            .values(geohash=sa.bindparam('row_geohash')),
+            [{'row_id': row.id, 'row_geohash': encode_geohash(row.lat, row.lon)} for row in rows],
+        )
+
+    with op.batch_alter_table('recordings') as batch_op:
+        batch_op.alter_column('geohash', existing_type=sa.String(length=12), nullable=False)
+        batch_op.create_index(batch_op.f('ix_recordings_geohash'), ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('recordings') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recordings_geohash'))
+        batch_op.drop_column('geohash')
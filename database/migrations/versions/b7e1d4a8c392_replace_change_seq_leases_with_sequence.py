@@ -0,0 +1,53 @@
+"""replace change_seq leases with a sequence
+
+Revision ID: b7e1d4a8c392
+Revises: a4c7e2d9f516
+Create Date: 2026-10-20 11:26:48.603915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d4a8c392'
+down_revision: Union[str, None] = 'a4c7e2d9f516'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Running writers now hold advisory locks on their change_seq instead of lease rows
+    op.drop_table('change_seq_leases')
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite keeps counting change_seqs in data_versions
+        return
+
+    data_versions = sa.table('data_versions', sa.column('name'), sa.column('version'))
+    allocated = bind.execute(
+        sa.select(data_versions.c.version).where(data_versions.c.name == 'change_seq')
+    ).scalar() or 0
+    op.execute(sa.schema.CreateSequence(sa.Sequence('change_seq', start=allocated + 1)))
+    bind.execute(data_versions.delete().where(data_versions.c.name == 'change_seq'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        allocated = bind.execute(sa.text("SELECT pg_sequence_last_value('change_seq')")).scalar()
+        if allocated:
+            data_versions = sa.table('data_versions', sa.column('name'), sa.column('version'))
+            op.bulk_insert(data_versions, [{'name': 'change_seq', 'version': allocated}])
+        op.execute(sa.schema.DropSequence(sa.Sequence('change_seq')))
+
+    op.create_table(
+        'change_seq_leases',
+        sa.Column('seq', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+    )
@@ -0,0 +1,35 @@
+"""add data versions
+
+Revision ID: c19d4b7e8a52
+Revises: a7c3e5f19b24
+Create Date: 2026-10-18 10:12:37.480213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c19d4b7e8a52'
+down_revision: Union[str, None] = 'a7c3e5f19b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    data_versions = op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=32), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Seed the counter so the first write only has to update it
+    op.bulk_insert(data_versions, [{'name': 'detections', 'version': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_versions')
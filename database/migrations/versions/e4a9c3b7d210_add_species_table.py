@@ -0,0 +1,74 @@
+"""add species table
+
+Revision ID: e4a9c3b7d210
+Revises: b52e0c9d17a3
+Create Date: 2026-10-16 23:31:08.664912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c3b7d210'
+down_revision: Union[str, None] = 'b52e0c9d17a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+
+    op.create_table('species',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('common_name', sa.String(), nullable=False),
+    sa.Column('scientific_name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scientific_name', 'common_name', name='uq_species_scientific_common')
+    )
+    op.create_index(op.f('ix_species_id'), 'species', ['id'], unique=False)
+    if is_postgres:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_species_common_name_trgm', 'species', ['common_name'], unique=False,
+            postgresql_using='gin', postgresql_ops={'common_name': 'gin_trgm_ops'},
+        )
+    else:
+        op.create_index('ix_species_common_name_trgm', 'species', ['common_name'], unique=False)
+
+    op.add_column('detections', sa.Column('species_id', sa.Integer(), nullable=True))
+
+    # Backfill: one species row per distinct name pair, then point every detection at it
+    op.execute(
+        "INSERT INTO species (scientific_name, common_name) "
+        "SELECT DISTINCT scientific_name, species FROM detections"
+    )
+    if is_postgres:
+        op.execute(
+            "UPDATE detections SET species_id = s.id FROM species s "
+            "WHERE s.scientific_name = detections.scientific_name AND s.common_name = detections.species"
+        )
+    else:
+        op.execute(
+            "UPDATE detections SET species_id = (SELECT s.id FROM species s "
+            "WHERE s.scientific_name = detections.scientific_name AND s.common_name = detections.species)"
+        )
+
+    with op.batch_alter_table('detections') as batch_op:
+        batch_op.alter_column('species_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_detections_species_id', 'species', ['species_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_detections_species_id'), ['species_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('detections') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_detections_species_id'))
+        batch_op.drop_constraint('fk_detections_species_id', type_='foreignkey')
+        batch_op.drop_column('species_id')
+    op.drop_index('ix_species_common_name_trgm', table_name='species')
+    op.drop_index(op.f('ix_species_id'), table_name='species')
+    op.drop_table('species')
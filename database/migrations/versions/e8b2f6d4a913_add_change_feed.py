@@ -0,0 +1,61 @@
+"""add change feed
+
+Revision ID: e8b2f6d4a913
+Revises: c19d4b7e8a52
+Create Date: 2026-10-18 16:40:22.915370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2f6d4a913'
+down_revision: Union[str, None] = 'c19d4b7e8a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows form one change after every version handed out so far,
+    # so a feed read from 0 returns them and newer writes sort after them
+    bind = op.get_bind()
+    data_versions = sa.table('data_versions', sa.column('name'), sa.column('version'))
+    current = bind.execute(
+        sa.select(data_versions.c.version).where(data_versions.c.name == 'detections')
+    ).scalar() or 0
+    backfill = current + 1
+    bind.execute(
+        data_versions.update().where(data_versions.c.name == 'detections').values(version=backfill)
+    )
+
+    for table in ('detections', 'recordings'):
+        # A constant default fills existing rows without rewriting the table on PostgreSQL
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default=str(backfill)))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('change_seq', existing_type=sa.BigInteger(), server_default=None)
+            batch_op.create_index(batch_op.f(f'ix_{table}_change_seq'), ['change_seq'], unique=False)
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=32), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_tombstones_change_seq'), 'tombstones', ['change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tombstones_change_seq'), table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in ('recordings', 'detections'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_change_seq'))
+            batch_op.drop_column('change_seq')
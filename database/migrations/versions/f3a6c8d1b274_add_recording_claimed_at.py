@@ -0,0 +1,30 @@
+"""add recording claimed_at
+
+Revision ID: f3a6c8d1b274
+Revises: e8b2f6d4a913
+Create Date: 2026-10-19 09:12:47.530162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6c8d1b274'
+down_revision: Union[str, None] = 'e8b2f6d4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Recordings already PROCESSING keep a NULL claim and are requeued on the next start
+    op.add_column('recordings', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('recordings') as batch_op:
+        batch_op.drop_column('claimed_at')